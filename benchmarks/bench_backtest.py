@@ -0,0 +1,55 @@
+"""Time a backtest over a synthetic multi-year history.
+
+    python benchmarks/bench_backtest.py [hours ...]
+
+Fills a temporary store with N hours of forecasts and observations, then
+times the join (load_history) and the scoring (evaluate) separately.
+"""
+import random
+import sys
+import tempfile
+import time
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from mbwind.backtest import evaluate, load_history
+from mbwind.fetch import grid_cell
+from mbwind.sources.forecast import Forecast
+from mbwind.spots import get_spot
+from mbwind.store import HistoryStore, FORECAST_FIELDS
+
+
+def fill(store: HistoryStore, spot: dict, n: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    times = [datetime(2022, 1, 1) + timedelta(hours=h) for h in range(n)]
+    for point, temp in ((spot["coastal"], 65), (spot["inland"], 80)):
+        columns = {
+            "temp_f": array("d", (rng.gauss(temp, 8) for _ in times)),
+            "wind_kts": array("d", (rng.uniform(0, 25) for _ in times)),
+            "wind_dir": array("d", (rng.uniform(0, 360) for _ in times)),
+            "gusts_kts": array("d", (rng.uniform(0, 35) for _ in times)),
+            "dewpoint_f": array("d", (rng.gauss(55, 5) for _ in times)),
+        }
+        store.put_forecast(grid_cell(point), Forecast(times, {f: columns[f] for f in FORECAST_FIELDS}))
+    store.put_observations(spot["tide_station"], [
+        {"time": t.isoformat(timespec="minutes"), "wind_kts": rng.uniform(0, 25), "wind_dir": None, "gust_kts": None}
+        for t in times
+    ])
+
+
+def main(sizes: list[int]) -> None:
+    spot = get_spot("mission_bay")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp, HistoryStore(Path(tmp) / "history.sqlite3") as store:
+            fill(store, spot, n)
+            start = time.perf_counter()
+            history = load_history(store, spot, hours=range(24))
+            loaded = time.perf_counter()
+            evaluate(history, direction_sectors=spot["directions"])
+            done = time.perf_counter()
+        print(f"{n:>9} hours  load {(loaded - start) * 1e3:8.1f} ms  evaluate {(done - loaded) * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [50_000, 200_000])
@@ -0,0 +1,67 @@
+"""Compare decoding an Open-Meteo response with json.loads and decode_payloads.
+
+    python benchmarks/bench_decode.py [locations [days [variables]]]
+
+Builds a response like a 16-day, 15-minute request for several locations
+and extra variables, then times turning its text into Forecasts both ways
+and measures each path's peak allocation with tracemalloc.
+"""
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from mbwind.sources.forecast import VARIABLES, Forecast, decode_payloads
+
+EXTRA = ["cloud_cover", "pressure_msl", "boundary_layer_height", "relative_humidity_2m"]
+
+
+def response(locations: int, days: int, variables: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    start = datetime(2025, 6, 1)
+    times = [(start + timedelta(minutes=15 * i)).strftime("%Y-%m-%dT%H:%M") for i in range(days * 96)]
+    names = (list(VARIABLES) + EXTRA)[:variables]
+    payloads = [
+        {
+            "latitude": 32.77 + i / 100,
+            "longitude": -117.23,
+            "hourly_units": {name: "" for name in names},
+            "hourly": {"time": times, **{
+                name: [round(rng.uniform(0, 100), 1) if rng.random() > 0.01 else None for _ in times]
+                for name in names
+            }},
+        }
+        for i in range(locations)
+    ]
+    return json.dumps(payloads)
+
+
+def measure(decode, text: str) -> tuple[float, int]:
+    start = time.perf_counter()
+    decode(text)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    decode(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main(locations: int, days: int, variables: int) -> None:
+    text = response(locations, days, variables)
+    print(f"{locations} locations x {days * 96} steps x {variables} variables: {len(text) / 2**20:.1f} MiB of JSON")
+    paths = {
+        "json.loads": lambda t: [Forecast.from_payload(p) for p in json.loads(t)],
+        "decode_payloads": lambda t: [Forecast.from_payload(p) for p in decode_payloads(t)],
+    }
+    results = {name: measure(decode, text) for name, decode in paths.items()}
+    base = results["json.loads"][1]
+    for name, (seconds, peak) in results.items():
+        print(f"  {name:<16} {seconds * 1e3:8.1f} ms  peak {peak / 2**20:7.1f} MiB ({peak / base:4.0%})")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*(args + [10, 16, 9][len(args):]))
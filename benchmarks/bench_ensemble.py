@@ -0,0 +1,55 @@
+"""Time ensemble scoring over synthetic members.
+
+    python benchmarks/bench_ensemble.py [members ...]
+
+Builds N members of a 24-hour day and times score_ensemble (one batch call
+over members x hours, then per-hour summaries) on each backend.
+"""
+import random
+import sys
+import time
+from array import array
+from datetime import date, datetime, timedelta
+
+from mbwind.ensemble import score_ensemble
+from mbwind.sources.forecast import Forecast
+from mbwind.spots import get_spot
+
+DAY = date(2025, 6, 1)
+
+
+def members(n: int, temp: float, seed: int = 0) -> dict[str, Forecast]:
+    rng = random.Random(seed)
+    times = [datetime(2025, 6, 1) + timedelta(hours=h) for h in range(24)]
+    return {
+        f"member{m:03d}": Forecast(times, {
+            "temp_f": array("d", (rng.gauss(temp, 5) for _ in times)),
+            "wind_kts": array("d", (rng.uniform(0, 25) for _ in times)),
+            "wind_dir": array("d", (rng.uniform(0, 360) for _ in times)),
+            "gusts_kts": array("d", (rng.uniform(0, 35) for _ in times)),
+            "dewpoint_f": array("d", (rng.gauss(55, 5) for _ in times)),
+        })
+        for m in range(n)
+    }
+
+
+def main(sizes: list[int]) -> None:
+    spot = get_spot("mission_bay")
+    backends = ["python"]
+    try:
+        import numpy  # noqa: F401
+        backends.append("numpy")
+    except ImportError:
+        pass
+    for n in sizes:
+        coastal, inland = members(n, 65), members(n, 80, seed=1)
+        timings = []
+        for backend in backends:
+            start = time.perf_counter()
+            score_ensemble(coastal, inland, DAY, direction_sectors=spot["directions"], backend=backend)
+            timings.append(f"{backend} {(time.perf_counter() - start) * 1e3:8.1f} ms")
+        print(f"{n:>6} members  " + "  ".join(timings))
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [120, 2000])
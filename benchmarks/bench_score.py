@@ -0,0 +1,51 @@
+"""Compare scalar compute_confidence against batch scoring.
+
+    python benchmarks/bench_score.py [hours ...]
+"""
+import random
+import sys
+import time
+
+from mbwind.batch import _numpy, score_batch
+from mbwind.score import compute_confidence
+
+
+def make_hours(n: int, seed: int = 0) -> list[list]:
+    rng = random.Random(seed)
+    wind = [rng.uniform(0, 35) for _ in range(n)]
+    return [
+        wind,
+        [rng.uniform(0, 360) for _ in range(n)],
+        [w * rng.uniform(1.0, 2.6) for w in wind],
+        [rng.uniform(-5, 35) for _ in range(n)],
+        [rng.choice((0.0, 0.1, 0.3, 0.7)) for _ in range(n)],
+        [i % 24 for i in range(n)],
+    ]
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(sizes: list[int]) -> None:
+    for n in sizes:
+        cols = make_hours(n)
+        rows = list(zip(*cols))
+        scalar = best_of(lambda: [compute_confidence(*row) for row in rows])
+        python = best_of(lambda: score_batch(*cols, backend="python"))
+        print(f"{n:>9} hours  scalar {scalar * 1e3:8.1f} ms  batch/python {python * 1e3:8.1f} ms ({scalar / python:4.1f}x)", end="")
+        np = _numpy()
+        if np is not None:
+            arrays = [np.asarray(c) for c in cols]
+            vector = best_of(lambda: score_batch(*arrays, backend="numpy"))
+            print(f"  batch/numpy {vector * 1e3:8.2f} ms ({scalar / vector:5.1f}x)", end="")
+        print()
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000])
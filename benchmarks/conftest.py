@@ -0,0 +1,164 @@
+"""Benchmark suite setup.
+
+    python -m pytest benchmarks [--bench-compare PATH] [--bench-fail]
+
+Benchmarks take a `benchmark` fixture. With pytest-benchmark installed it is
+that plugin's (use its --benchmark-autosave / --benchmark-compare). Without
+it, a minimal one with the same call style stands in: each run's timings
+are saved to benchmarks/.results/<timestamp>.json and medians compared with
+the previous run (or --bench-compare), slowdowns past --bench-threshold
+percent reported, and failing the run with --bench-fail. Nothing touches
+the network: upstream requests go to mbwind.fake_upstream.
+"""
+import json
+import os
+import statistics
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from mbwind import fake_upstream
+
+RESULTS = Path(__file__).parent / ".results"
+# The fallback fixture repeats a call for this long (and at least MIN_ROUNDS times)
+MAX_TIME = 0.5
+MIN_ROUNDS = 5
+
+try:
+    import pytest_benchmark  # noqa: F401
+    PLUGIN = True
+except ImportError:
+    PLUGIN = False
+
+_results: dict[str, dict] = {}
+_regressions: list[str] = []
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("mbwind benchmarks")
+    group.addoption("--bench-compare", default=None, help="Results file to compare with (default: the latest saved).")
+    group.addoption("--bench-threshold", type=float, default=25.0, help="Percent slowdown of a median reported as a regression.")
+    group.addoption("--bench-fail", action="store_true", help="Fail the run when a benchmark regressed.")
+    group.addoption("--bench-no-save", action="store_true", help="Don't save this run's results.")
+
+
+class Benchmark:
+    """Stand-in for pytest-benchmark's fixture: benchmark(fn, *args) and
+    benchmark.pedantic(fn, args=..., rounds=...) time fn and return its result."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stats: dict | None = None
+
+    def __call__(self, fn, *args, **kwargs):
+        times = []
+        deadline = time.perf_counter() + MAX_TIME
+        while len(times) < MIN_ROUNDS or time.perf_counter() < deadline:
+            start = time.perf_counter()
+            result = fn(*args, **kwargs)
+            times.append(time.perf_counter() - start)
+        self._record(times)
+        return result
+
+    def pedantic(self, target, args=(), kwargs=None, rounds=1, iterations=1, warmup_rounds=0):
+        kwargs = kwargs or {}
+        for _ in range(warmup_rounds):
+            target(*args, **kwargs)
+        times = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                result = target(*args, **kwargs)
+            times.append((time.perf_counter() - start) / iterations)
+        self._record(times)
+        return result
+
+    def _record(self, times: list[float]) -> None:
+        self.stats = {
+            "rounds": len(times),
+            "min": min(times),
+            "max": max(times),
+            "mean": statistics.fmean(times),
+            "median": statistics.median(times),
+            "stddev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        }
+        _results[self.name] = self.stats
+
+
+if not PLUGIN:
+    @pytest.fixture
+    def benchmark(request):
+        return Benchmark(request.node.nodeid)
+
+
+@pytest.fixture(scope="session")
+def stub_upstream():
+    """The fake upstream server, with the MBWIND_*_URL variables pointing at it."""
+    server = fake_upstream.serve()
+    saved = {var: os.environ.get(var) for var in fake_upstream.ENV}
+    os.environ.update(fake_upstream.environ(server))
+    yield server
+    for var, value in saved.items():
+        if value is None:
+            os.environ.pop(var, None)
+        else:
+            os.environ[var] = value
+    server.shutdown()
+    server.server_close()
+
+
+def _previous(config) -> tuple[Path | None, dict]:
+    path = config.getoption("--bench-compare")
+    if path is None:
+        saved = sorted(RESULTS.glob("*.json"))
+        path = saved[-1] if saved else None
+    if path is None:
+        return None, {}
+    return Path(path), json.loads(Path(path).read_text())["benchmarks"]
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if PLUGIN or not _results:
+        return
+    config = session.config
+    config._bench_previous = _previous(config)
+    threshold = config.getoption("--bench-threshold") / 100
+    for name, stats in _results.items():
+        old = config._bench_previous[1].get(name)
+        if old and stats["median"] > old["median"] * (1 + threshold):
+            _regressions.append(name)
+    if not config.getoption("--bench-no-save"):
+        RESULTS.mkdir(exist_ok=True)
+        path = RESULTS / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+        path.write_text(json.dumps({"saved": datetime.now().isoformat(), "benchmarks": _results}, indent=2))
+        config._bench_saved = path
+    if _regressions and config.getoption("--bench-fail") and session.exitstatus == 0:
+        session.exitstatus = 1
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if PLUGIN or not _results:
+        return
+    path, previous = getattr(config, "_bench_previous", (None, {}))
+    tr = terminalreporter
+    tr.section("benchmarks (median)")
+    width = max(len(name) for name in _results)
+    for name, stats in _results.items():
+        line = f"{name:<{width}}  {_ms(stats['median']):>10}  ({stats['rounds']} rounds)"
+        old = previous.get(name)
+        if old:
+            change = stats["median"] / old["median"] - 1
+            line += f"  {change:+7.1%} vs {_ms(old['median'])}"
+            if name in _regressions:
+                line += "  REGRESSION"
+        tr.write_line(line, red=name in _regressions)
+    if path is not None:
+        tr.write_line(f"compared with {path}")
+    if getattr(config, "_bench_saved", None):
+        tr.write_line(f"saved {config._bench_saved}")
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1e3:.3f} ms" if seconds < 1 else f"{seconds:.2f} s"
@@ -0,0 +1,87 @@
+"""Benchmarks over the recorded fixtures, from single lookups to a full run."""
+import json
+from datetime import datetime
+
+import pytest
+from click.testing import CliRunner
+
+from bench_decode import response
+from bench_score import make_hours
+from mbwind import cli, fake_upstream
+from mbwind.batch import _numpy, score_batch
+from mbwind.outlook import score_outlook
+from mbwind.score import SPORTS, compute_confidence
+from mbwind.sources.forecast import Forecast, decode_payloads
+from mbwind.sources.noaa import classify_tide
+from mbwind.sources.open_meteo import find_best_window, get_hourly_at
+
+DAY = datetime.combine(fake_upstream.RECORDED, datetime.min.time())
+BACKENDS = ["python"] + (["numpy"] if _numpy() is not None else [])
+
+
+@pytest.fixture(scope="module")
+def coastal():
+    return Forecast.from_payload(fake_upstream.load("open_meteo_forecast")["coastal"])
+
+
+@pytest.fixture(scope="module")
+def predictions():
+    return [
+        {"time": row["t"], "height_ft": float(row["v"]), "type": "High" if row["type"] == "H" else "Low"}
+        for row in fake_upstream.load("coops_predictions")["predictions"]
+    ]
+
+
+def test_get_hourly_at(benchmark, coastal):
+    hour = benchmark(get_hourly_at, coastal, 13, DAY)
+    assert hour["wind_kts"] > 0
+
+
+def test_find_best_window(benchmark, coastal):
+    window = benchmark(find_best_window, coastal, DAY)
+    assert window
+
+
+def test_compute_confidence(benchmark):
+    result = benchmark(compute_confidence, 12.0, 285.0, 15.5, 14.0, 0.1, 13)
+    assert 0 <= result["score"] <= 100
+
+
+def test_classify_tide(benchmark, predictions):
+    assert benchmark(classify_tide, 2.4, predictions, -0.6).startswith("Mid, outgoing")
+
+
+def test_score_outlook(benchmark):
+    payloads = fake_upstream.Recorded(0).open_meteo({"latitude": "32.77,32.79", "longitude": "-117.23,-116.96", "forecast_days": "16"})
+    coastal, inland = (Forecast.from_payload(p) for p in payloads)
+    result = benchmark(score_outlook, coastal, inland, coastal.days(), SPORTS)
+    assert len(result[SPORTS[0]]) == 16
+
+
+def test_decode_payloads(benchmark):
+    text = response(10, 16, 9)
+    forecasts = benchmark(lambda: [Forecast.from_payload(p) for p in decode_payloads(text)])
+    assert len(forecasts) == 10
+
+
+@pytest.mark.parametrize(
+    "args", [[], ["--spots"], ["--timeline"], ["--days", "16"]], ids=["spot", "spots", "timeline", "days16"],
+)
+def test_cli_end_to_end(benchmark, stub_upstream, args):
+    runner = CliRunner()
+    run = lambda: runner.invoke(cli.main, ["--json", "--no-cache", "--no-store", "--hour", "13", *args])
+    result = benchmark.pedantic(run, rounds=5, warmup_rounds=1)
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("n", [1, 100, 10_000, 1_000_000])
+def test_score_batch(benchmark, backend, n):
+    cols = make_hours(n)
+    if backend == "numpy":
+        np = _numpy()
+        cols = [np.asarray(c) for c in cols]
+    rounds = 1 if n >= 1_000_000 else 5
+    result = benchmark.pedantic(score_batch, args=cols, kwargs={"backend": backend}, rounds=rounds)
+    assert len(result["score"]) == n
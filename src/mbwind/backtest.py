@@ -0,0 +1,247 @@
+"""Backtest the confidence model against what the wind actually did.
+
+Past forecasts come from Open-Meteo's historical forecast archive and the
+truth from the spot's NOAA CO-OPS station (hourly wind). Both are
+downloaded once into a HistoryStore, joined by hour, and scored in one
+batch per sport. Each forecast hour's recommendation is then compared with
+the class of the wind that was observed.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
+
+from . import timing
+from .batch import score_batch_sports, to_list
+from .fetch import grid_cell, REQUEST_TIMEOUT
+from .profiles import PROFILES
+from .score import SPORTS
+from .sources.noaa import fetch_wind_history
+from .sources.open_meteo import fetch_archive
+from .sources.thermal import marine_layer_suppression
+from .store import HistoryStore
+from .timeline import SESSION_START, SESSION_END
+
+if TYPE_CHECKING:
+    from .sources.http import HttpClient
+
+# Downloads are split into calendar half-years: under CO-OPS's one-year limit
+# for hourly data, and aligned so completed chunks keep the same key
+CHUNK_MONTHS = (1, 7)
+# Recent days may still be filled in upstream, so they are not marked done
+SETTLE_DAYS = 3
+
+RECOMMENDATIONS = ("GO", "MAYBE", "NO-GO")
+
+# Observed mean wind (knots, lo <= kts < hi) that made a session worth it,
+# or at least sailable, from each sport's scoring profile
+OBSERVED_GO = {sport: profile["observed_go"] for sport, profile in PROFILES["sports"].items()}
+OBSERVED_MAYBE = {sport: profile["observed_maybe"] for sport, profile in PROFILES["sports"].items()}
+
+CALIBRATION_BIN = 10
+
+
+def observed_class(kts: float, sport: str = "laser") -> str:
+    """What the observed wind turned out to be, as a recommendation."""
+    lo, hi = OBSERVED_GO[sport]
+    if lo <= kts < hi:
+        return "GO"
+    lo, hi = OBSERVED_MAYBE[sport]
+    if lo <= kts < hi:
+        return "MAYBE"
+    return "NO-GO"
+
+
+def chunks(start: date, end: date) -> list[tuple[date, date]]:
+    """Split start..end (inclusive) at calendar half-year boundaries."""
+    out = []
+    while start <= end:
+        boundary = next(
+            (date(start.year, m, 1) for m in CHUNK_MONTHS if date(start.year, m, 1) > start),
+            date(start.year + 1, CHUNK_MONTHS[0], 1),
+        )
+        last = min(boundary - timedelta(days=1), end)
+        out.append((start, last))
+        start = last + timedelta(days=1)
+    return out
+
+
+async def ingest(client: HttpClient, store: HistoryStore, spot: dict, start: date, end: date) -> dict:
+    """Download the spot's archive forecasts and observations into the store.
+
+    Ranges already recorded as complete are skipped. Chunks are fetched
+    concurrently; a failed chunk is reported rather than raised, so one bad
+    year does not discard the rest. Returns counts of downloaded and skipped
+    chunks and the failures as (source, start, end, error). A spot without
+    a NOAA station gets its forecasts only."""
+    import asyncio
+
+    points = {grid_cell(spot["coastal"]): spot["coastal"], grid_cell(spot["inland"]): spot["inland"]}
+    station = spot["tide_station"]
+    settled = date.today() - timedelta(days=SETTLE_DAYS)
+
+    async def forecasts(first, last):
+        for cell, forecast in (await fetch_archive(client, points, first, last)).items():
+            store.put_forecast(cell, forecast)
+        if last <= settled:
+            for cell in points:
+                store.mark_ingested("open-meteo", cell, first.isoformat(), last.isoformat())
+
+    async def observations(first, last):
+        store.put_observations(station, await fetch_wind_history(client, station, first, last))
+        if last <= settled:
+            store.mark_ingested("co-ops", station, first.isoformat(), last.isoformat())
+
+    jobs = {}
+    skipped = 0
+    for first, last in chunks(start, end):
+        span = (first.isoformat(), last.isoformat())
+        if all(store.is_ingested("open-meteo", cell, *span) for cell in points):
+            skipped += 1
+        else:
+            jobs[("open-meteo", *span)] = forecasts(first, last)
+        if not station:
+            continue
+        if store.is_ingested("co-ops", station, *span):
+            skipped += 1
+        else:
+            jobs[("co-ops", *span)] = observations(first, last)
+
+    results = await asyncio.gather(*jobs.values(), return_exceptions=True)
+    failed = [(*key, str(r)) for key, r in zip(jobs, results) if isinstance(r, BaseException)]
+    return {"downloaded": len(jobs) - len(failed), "skipped": skipped, "failed": failed}
+
+
+def load_history(
+    store: HistoryStore,
+    spot: dict,
+    start: date | None = None,
+    end: date | None = None,
+    hours: range = range(SESSION_START, SESSION_END),
+) -> dict[str, list]:
+    """Joined forecast/observation hours for a spot, as scorer-ready columns.
+
+    Only hours in `hours` with an observed wind speed are kept. The thermal
+    gradient and marine layer are derived per hour as in score_timeline."""
+    rows = store.joined(
+        grid_cell(spot["coastal"]),
+        grid_cell(spot["inland"]),
+        spot["tide_station"] or "",
+        start.isoformat() if start else "",
+        (end + timedelta(days=1)).isoformat() if end else "~",
+    )
+    cols = {k: [] for k in ("time", "hour", "wind_kts", "wind_dir", "gusts_kts", "thermal_delta_f", "marine_layer", "observed_kts")}
+    for time, temp, wind, direction, gust, dewpoint, inland_temp, observed in rows:
+        hour = int(time[11:13])
+        if observed is None or hour not in hours:
+            continue
+        cols["time"].append(time)
+        cols["hour"].append(hour)
+        cols["wind_kts"].append(wind)
+        cols["wind_dir"].append(direction)
+        cols["gusts_kts"].append(gust)
+        cols["thermal_delta_f"].append(round(inland_temp - temp, 1) if temp is not None and inland_temp is not None else None)
+        cols["marine_layer"].append(marine_layer_suppression(temp, dewpoint) if temp is not None and dewpoint is not None else 0.0)
+        cols["observed_kts"].append(observed)
+    return cols
+
+
+def metrics(scores: list[int], predicted: list[str], observed: list[str]) -> dict:
+    """Hit rate, GO precision/recall, confusion matrix and calibration table.
+
+    Calibration bins hours by score (0-9, 10-19, ...) and compares the mean
+    score with how often the wind was actually GO; calibration_error is the
+    hour-weighted mean gap between the two (as fractions)."""
+    n = len(scores)
+    pairs = Counter(zip(predicted, observed))
+    confusion = {p: {o: pairs[(p, o)] for o in RECOMMENDATIONS} for p in RECOMMENDATIONS}
+    hits = sum(confusion[r][r] for r in RECOMMENDATIONS)
+    predicted_go = sum(confusion["GO"].values())
+    observed_go = sum(confusion[p]["GO"] for p in RECOMMENDATIONS)
+
+    bins = {}
+    for score, obs in zip(scores, observed):
+        b = bins.setdefault(min(score // CALIBRATION_BIN, 100 // CALIBRATION_BIN - 1), [0, 0, 0])
+        b[0] += 1
+        b[1] += score
+        b[2] += obs == "GO"
+    calibration = []
+    gap = 0.0
+    for b, (count, total, go) in sorted(bins.items()):
+        mean_score = total / count
+        go_rate = go / count
+        gap += count * abs(mean_score / 100 - go_rate)
+        lo = b * CALIBRATION_BIN
+        hi = 100 if lo + CALIBRATION_BIN >= 100 else lo + CALIBRATION_BIN - 1
+        calibration.append({
+            "bin": f"{lo}-{hi}",
+            "hours": count,
+            "mean_score": round(mean_score, 1),
+            "observed_go_rate": round(go_rate, 3),
+        })
+
+    return {
+        "hours": n,
+        "hit_rate": round(hits / n, 3) if n else None,
+        "go_precision": round(confusion["GO"]["GO"] / predicted_go, 3) if predicted_go else None,
+        "go_recall": round(confusion["GO"]["GO"] / observed_go, 3) if observed_go else None,
+        "confusion": confusion,
+        "calibration": calibration,
+        "calibration_error": round(gap / n, 3) if n else None,
+    }
+
+
+def evaluate(history: dict[str, list], sports=SPORTS, direction_sectors=None, backend: str = "auto") -> dict:
+    """Score every hour of history and compare with observations, per sport."""
+    scored = score_batch_sports(
+        history["wind_kts"], history["wind_dir"], history["gusts_kts"],
+        history["thermal_delta_f"], history["marine_layer"], history["hour"],
+        sports=sports, backend=backend, direction_sectors=direction_sectors,
+    )
+    results = {}
+    for sport in sports:
+        observed = [observed_class(kts, sport) for kts in history["observed_kts"]]
+        results[sport] = metrics(to_list(scored[sport]["score"]), to_list(scored[sport]["recommendation"]), observed)
+    return results
+
+
+def run_backtest(
+    spot: dict,
+    start: date,
+    end: date,
+    sports=SPORTS,
+    store: HistoryStore | None = None,
+    offline: bool = False,
+    **client_options,
+) -> dict:
+    """Download what is missing (unless offline), then score start..end.
+
+    Extra keyword arguments configure the HttpClient."""
+    import asyncio
+
+    from .sources.http import HttpClient
+
+    if not spot["tide_station"]:
+        raise ValueError(f"spot {spot['id']} has no NOAA station to backtest against")
+    store = store if store is not None else HistoryStore()
+    ingested = None
+    if not offline:
+        async def download():
+            async with HttpClient(timeout=REQUEST_TIMEOUT * 6, **client_options) as client:
+                return await ingest(client, store, spot, start, end)
+        with timing.span("fetch"):
+            ingested = asyncio.run(download())
+    with timing.span("history"):
+        history = load_history(store, spot, start, end)
+    with timing.span("score"):
+        results = evaluate(history, sports, spot["directions"])
+    return {
+        "spot": spot["id"],
+        "spot_name": spot["name"],
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "hours": len(history["time"]),
+        "ingest": ingested,
+        "sports": results,
+    }
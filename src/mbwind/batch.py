@@ -0,0 +1,256 @@
+"""Batch scoring over whole forecast horizons.
+
+Mirrors compute_confidence in score.py over whole columns, using the same
+compiled profile tables (see profiles.py) and direction step tables. With NumPy
+installed (the ``fast`` extra) every factor is scored for all hours at once
+with searchsorted; otherwise each value is a bisect into the same tables.
+NumPy is imported on first use, and only for inputs large enough to repay
+its import cost, so a single-day report never loads it.
+Results match the scalar functions exactly; missing values (None or NaN)
+score as the scalar functions score None.
+"""
+import math
+from bisect import bisect_right
+from functools import lru_cache
+
+from .profiles import PROFILES
+from .score import SPORTS, DIRECTION_SECTORS, advisory_penalty, score_direction
+
+# Set to the numpy module by _numpy() once loaded
+np = None
+_numpy_missing = False
+
+# Below this many hours, auto backend stays in pure Python
+NUMPY_MIN_HOURS = 256
+
+
+def _numpy():
+    """Import NumPy on first use; None when it is not installed."""
+    global np, _numpy_missing
+    if np is None and not _numpy_missing:
+        try:
+            import numpy
+        except ImportError:  # optional dependency
+            _numpy_missing = True
+        else:
+            np = numpy
+    return np
+
+
+def compile_steps(fn, bounds):
+    """Build a step table reproducing fn, a piecewise-constant function whose
+    value can only change at the given bounds (where it may take either
+    neighbour's value, or one of its own)."""
+    bounds = sorted(set(bounds))
+    edges, points = [], [fn(bounds[0] - 1)]
+    for b in bounds:
+        for edge in (b, math.nextafter(b, math.inf)):
+            value = fn(edge)
+            if value != points[-1]:
+                edges.append(edge)
+                points.append(value)
+    return tuple(edges), tuple(points)
+
+
+@lru_cache(maxsize=None)
+def direction_table(sectors=DIRECTION_SECTORS):
+    """Step table for score_direction with the given (from, to, points) sectors."""
+    bounds = [b for lo, hi, _ in sectors for b in (lo, hi)]
+    return compile_steps(lambda d: score_direction(d, sectors), bounds)
+
+
+THERMAL = PROFILES["thermal"]
+TIME_OF_DAY = PROFILES["time_of_day"]
+OTHER_HOUR_POINTS = PROFILES["time_of_day_default"]
+
+# Scores for missing inputs, as the scalar functions treat None
+MISSING_DIRECTION = 5
+MISSING_THERMAL = THERMAL[1][0]
+
+GO, MAYBE = 65, 40
+
+
+def _missing(x) -> bool:
+    return x is None or x != x  # NaN is the only value unequal to itself
+
+
+def _lookup(table, x, missing):
+    edges, points = table
+    return missing if _missing(x) else points[bisect_right(edges, x)]
+
+
+def _python_factors(wind, direction, gust, thermal, hour, sport, direction_steps):
+    wind_table = PROFILES["sports"][sport]["wind_speed"]
+    gust_edges, gust_points = PROFILES["sports"][sport]["gust_factor"]
+    s_wind = [_lookup(wind_table, w, 0) for w in wind]
+    s_gust = []
+    for w, g in zip(wind, gust):
+        if _missing(w) or w < 1:
+            s_gust.append(0)
+        else:
+            ratio = 1.0 if _missing(g) else g / w
+            s_gust.append(gust_points[bisect_right(gust_edges, ratio)])
+    s_dir = [_lookup(direction_steps, d, MISSING_DIRECTION) for d in direction]
+    s_thermal = [_lookup(THERMAL, t, MISSING_THERMAL) for t in thermal]
+    s_time = [TIME_OF_DAY[h] if 0 <= h <= 23 else OTHER_HOUR_POINTS for h in hour]
+    return s_wind, s_dir, s_thermal, s_gust, s_time
+
+
+def _python_batch(wind, direction, gust, thermal, marine, hour, advisory, sports, direction_steps):
+    wind, direction, gust, thermal, marine, hour = (
+        list(x) for x in (wind, direction, gust, thermal, marine, hour)
+    )
+    s_advisory = [advisory_penalty(a) for a in advisory] if advisory is not None else [0] * len(wind)
+    results = {}
+    for sport in sports:
+        s_wind, s_dir, s_thermal, s_gust, s_time = _python_factors(
+            wind, direction, gust, thermal, hour, sport, direction_steps
+        )
+        penalties = [m * 15 for m in marine]
+        scores = [
+            max(0, min(100, round(a + b + c + d + e - p - q)))
+            for a, b, c, d, e, p, q in zip(s_wind, s_dir, s_thermal, s_gust, s_time, penalties, s_advisory)
+        ]
+        results[sport] = {
+            "score": scores,
+            "recommendation": [recommendation(s) for s in scores],
+            "breakdown": {
+                "wind_speed": s_wind,
+                "direction": s_dir,
+                "thermal": s_thermal,
+                "gust_factor": s_gust,
+                "time_of_day": s_time,
+                "marine_layer_penalty": [round(p, 1) for p in penalties],
+                "advisory_penalty": s_advisory,
+            },
+        }
+    return results
+
+
+def _as_float_array(values):
+    if isinstance(values, np.ndarray):
+        return values.astype(float, copy=False)
+    return np.fromiter((math.nan if v is None else v for v in values), dtype=float)
+
+
+def _np_lookup(table, x, missing):
+    edges, points = table
+    out = np.asarray(points)[np.searchsorted(edges, x, side="right")]
+    return np.where(np.isnan(x), missing, out)
+
+
+def _numpy_batch(wind, direction, gust, thermal, marine, hour, advisory, sports, direction_steps):
+    wind, direction, gust, thermal, marine = (
+        _as_float_array(x) for x in (wind, direction, gust, thermal, marine)
+    )
+    hour = np.asarray(hour, dtype=int)
+    if advisory is None:
+        s_advisory = np.zeros(len(wind))
+    else:
+        s_advisory = np.fromiter((advisory_penalty(a) for a in advisory), dtype=float, count=len(wind))
+
+    # Sport-independent factors are scored once
+    s_dir = _np_lookup(direction_steps, direction, MISSING_DIRECTION)
+    s_thermal = _np_lookup(THERMAL, thermal, MISSING_THERMAL)
+    valid_hour = (hour >= 0) & (hour <= 23)
+    s_time = np.where(valid_hour, np.asarray(TIME_OF_DAY)[np.clip(hour, 0, 23)], OTHER_HOUR_POINTS)
+    penalties = marine * 15
+    # Python's round(x, 1) rounds the decimal value exactly; apply it per distinct penalty
+    unique, inverse = np.unique(penalties, return_inverse=True)
+    rounded_penalties = np.array([round(p, 1) for p in unique.tolist()])[inverse.reshape(-1)]
+
+    no_wind = np.isnan(wind) | (wind < 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(np.isnan(gust), 1.0, gust / wind)
+
+    results = {}
+    for sport in sports:
+        profile = PROFILES["sports"][sport]
+        s_wind = _np_lookup(profile["wind_speed"], wind, 0)
+        s_gust = np.where(no_wind, 0, _np_lookup(profile["gust_factor"], ratio, 0))
+        raw = s_wind + s_dir + s_thermal + s_gust + s_time
+        scores = np.clip(np.round(raw - penalties - s_advisory), 0, 100).astype(int)
+        results[sport] = {
+            "score": scores,
+            "recommendation": np.where(scores >= GO, "GO", np.where(scores >= MAYBE, "MAYBE", "NO-GO")),
+            "breakdown": {
+                "wind_speed": s_wind,
+                "direction": s_dir,
+                "thermal": s_thermal,
+                "gust_factor": s_gust,
+                "time_of_day": s_time,
+                "marine_layer_penalty": rounded_penalties,
+                "advisory_penalty": s_advisory,
+            },
+        }
+    return results
+
+
+def to_list(values) -> list:
+    """A batch result column (list or ndarray) as a plain list."""
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+def recommendation(score: int) -> str:
+    if score >= GO:
+        return "GO"
+    elif score >= MAYBE:
+        return "MAYBE"
+    return "NO-GO"
+
+
+def score_batch_sports(
+    wind_kts,
+    wind_dir,
+    gust_kts,
+    thermal_delta_f,
+    marine_layer_suppression,
+    hour,
+    sports=SPORTS,
+    backend: str = "auto",
+    direction_sectors=None,
+    advisory=None,
+) -> dict:
+    """Score every hour for several sports in one pass; returns {sport: result}.
+
+    Inputs are equal-length sequences (or NumPy arrays), one value per hour.
+    Each result has "score", "recommendation" and a "breakdown" of per-factor
+    arrays, keyed like compute_confidence. direction_sectors overrides the
+    Mission Bay sectors as in score_direction; advisory, if given, is the
+    NWS marine advisory (or None) in effect for each hour. backend is "numpy", "python",
+    or "auto" (NumPy for array inputs or long horizons, when installed); the
+    numpy backend returns ndarrays."""
+    if backend == "auto":
+        is_array = type(wind_kts).__module__ == "numpy"
+        large = len(wind_kts) >= NUMPY_MIN_HOURS
+        backend = "numpy" if (is_array or large) and _numpy() is not None else "python"
+    if backend == "numpy" and _numpy() is None:
+        raise RuntimeError("NumPy is not installed; install mbwind[fast] or use backend='python'")
+    for sport in sports:
+        if sport not in PROFILES["sports"]:
+            raise ValueError(f"unknown sport: {sport}")
+    sectors = tuple(tuple(s) for s in direction_sectors) if direction_sectors else DIRECTION_SECTORS
+    impl = _numpy_batch if backend == "numpy" else _python_batch
+    return impl(
+        wind_kts, wind_dir, gust_kts, thermal_delta_f, marine_layer_suppression, hour, advisory,
+        tuple(sports), direction_table(sectors),
+    )
+
+
+def score_batch(
+    wind_kts,
+    wind_dir,
+    gust_kts,
+    thermal_delta_f,
+    marine_layer_suppression,
+    hour,
+    sport: str = "laser",
+    backend: str = "auto",
+    direction_sectors=None,
+    advisory=None,
+) -> dict:
+    """Score every hour for one sport; see score_batch_sports."""
+    return score_batch_sports(
+        wind_kts, wind_dir, gust_kts, thermal_delta_f, marine_layer_suppression, hour,
+        sports=(sport,), backend=backend, direction_sectors=direction_sectors, advisory=advisory,
+    )[sport]
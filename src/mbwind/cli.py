@@ -1,102 +1,568 @@
 import click
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
-from .sources.open_meteo import fetch_coastal_forecast, fetch_inland_forecast, get_hourly_at, find_best_window
-from .sources.noaa import fetch_tide_data, fetch_tide_predictions, fetch_wind_observation, fetch_marine_forecast, classify_tide
-from .sources.thermal import compute_thermal_gradient, marine_layer_suppression
-from .score import compute_confidence, sport_tip, SPORTS
-from .display import render_report
+# Only light modules are imported here: httpx is loaded when fetching starts,
+# and rich (display) and the HTTP server only on the paths that use them
+from .fetch import fetch_all_sync, FetchError, DEADLINE, REFRESH_INTERVAL
+from .sources.cache import ResponseCache
+from .score import SPORTS
+from .spots import load_spots, get_spot, DEFAULT_SPOT
+from .report import build_reports, rank_spots
+from .sources.open_meteo import ENSEMBLE_MODELS, MAX_FORECAST_DAYS
+from .timeline import DAYLIGHT, WINDOW_HOURS, best_window
+from .output import (
+    print_json, print_plain, print_plain_sports, print_plain_spots, print_plain_ensemble, print_plain_outlook, print_profile,
+    print_records, print_rows, fmt_hour,
+)
+from . import timing
 
+FORMATS = ("rich", "plain", "json", "ndjson", "csv")
 
-@click.command()
+
+@click.group(invoke_without_command=True)
 @click.option("--hour", type=int, default=None, help="Hour (0-23) to check. Defaults to current hour, or 13 for tomorrow.")
 @click.option("--tomorrow", is_flag=True, help="Check tomorrow's forecast instead of today.")
-@click.option("--sport", type=click.Choice(SPORTS), default="laser", help="Sport to score for.")
-def main(hour: int | None, tomorrow: bool, sport: str):
+@click.option("--sport", "sport_names", type=click.Choice((*SPORTS, "all")), multiple=True, default=("laser",), show_default=True, help="Sport to score for (repeatable, or all): several are compared side by side from one fetch.")
+@click.option("--deadline", type=float, default=DEADLINE, show_default=True, help="Overall time budget (seconds) for fetching data.")
+@click.option("--no-cache", is_flag=True, help="Bypass the on-disk response cache entirely.")
+@click.option("--refresh", is_flag=True, help="Revalidate cached responses with upstream instead of trusting them.")
+@click.option("--offline", is_flag=True, help="Make no requests: report from saved responses, however old, or else the history store's forecasts from the last 2 days.")
+@click.option("--timeline", "show_timeline", is_flag=True, help="Show the hour-by-hour score for the whole day.")
+@click.option("--window", type=click.IntRange(1, 9), default=WINDOW_HOURS, show_default=True, help="Length (hours) of the best-window search.")
+@click.option("--spot", "spot_id", default=DEFAULT_SPOT, show_default=True, help="Spot id from the registry.")
+@click.option("--spots", "spots_mode", is_flag=True, help="Score every spot in the registry and rank them.")
+@click.option("--spots-file", type=click.Path(exists=True, dir_okay=False), default=None, help="Spot registry (JSON or TOML) to use instead of the bundled one.")
+@click.option("--ensemble", is_flag=True, help="Score every ensemble member: P(GO), median and spread per hour.")
+@click.option("--models", default=",".join(ENSEMBLE_MODELS), show_default=True, help="Comma-separated Open-Meteo ensemble models for --ensemble.")
+@click.option("--days", type=click.IntRange(1, MAX_FORECAST_DAYS), default=None, help=f"Outlook: score every daylight hour of the next N days (up to {MAX_FORECAST_DAYS}) as a per-day heatmap.")
+@click.option("--watch", "watch_mode", is_flag=True, help="Keep running: poll each source at its own cadence and redraw when scores change.")
+@click.option("--no-store", is_flag=True, help="Don't record this run in the local history store.")
+@click.option("--no-nowcast", is_flag=True, help="Score the raw forecast, without the correction from observed wind.")
+@click.option("--format", "output", type=click.Choice(FORMATS), default=None, help="Output format. json, ndjson and csv never load rich; csv with --timeline has a row per hour.")
+@click.option("--json", "output", flag_value="json", help="Print the report as JSON (no rich rendering).")
+@click.option("--plain", "output", flag_value="plain", help="Print the report as plain text (no rich rendering).")
+@click.option("--profile", "show_profile", is_flag=True, help="Print where the run spent its time (per source and phase) to stderr.")
+@click.option("--profile-out", type=click.Path(dir_okay=False, writable=True), default=None, help="Also write the profile to a file: JSON for .json, else OpenMetrics text.")
+@click.pass_context
+def main(
+    ctx: click.Context,
+    hour: int | None,
+    tomorrow: bool,
+    sport_names: tuple[str, ...],
+    deadline: float,
+    no_cache: bool,
+    refresh: bool,
+    offline: bool,
+    show_timeline: bool,
+    window: int,
+    spot_id: str,
+    spots_mode: bool,
+    spots_file: str | None,
+    ensemble: bool,
+    models: str,
+    days: int | None,
+    watch_mode: bool,
+    no_store: bool,
+    no_nowcast: bool,
+    output: str | None,
+    show_profile: bool,
+    profile_out: str | None,
+):
     """Mission Bay wind confidence for laser sailing."""
+    # Profiling covers subcommands too: the context closes after they run
+    if show_profile or profile_out:
+        timing.start()
+        ctx.call_on_close(lambda: _finish_profile(show_profile, profile_out))
+    if ctx.invoked_subcommand is not None:
+        return
+    if output == "rich":
+        output = None
+    sports = SPORTS if "all" in sport_names else tuple(dict.fromkeys(sport_names))
+    sport = sports[0]
     target_date = datetime.now().astimezone()
     if tomorrow:
         target_date = target_date + timedelta(days=1)
+    # Watch mode follows the clock unless an hour was given
+    fixed_hour = hour
     if hour is None:
         hour = 13 if tomorrow else datetime.now().hour
 
-    # Fetch all data
     try:
-        coastal = fetch_coastal_forecast()
-    except Exception as e:
-        click.echo(f"Error fetching coastal forecast: {e}", err=True)
-        raise SystemExit(1)
+        spots = load_spots(spots_file)
+        selected = get_spot(spot_id, spots)
+    except (OSError, ValueError, KeyError) as e:
+        click.echo(f"Error loading spots: {e}", err=True)
+        raise SystemExit(1) from None
+
+    if ensemble:
+        if spots_mode or len(sports) > 1:
+            raise click.UsageError("--ensemble scores one spot for one sport; drop --spots or the extra --sport")
+        _ensemble(selected, target_date, sport, window, models, output, no_cache, refresh, offline)
+        return
+    if days is not None:
+        if spots_mode or watch_mode:
+            raise click.UsageError("--days scores one spot's outlook; drop --spots and --watch")
+        _outlook(selected, days, sports, window, output, no_cache, refresh, offline)
+        return
 
+    # Fetch all data concurrently; only the Open-Meteo forecasts are required
+    fetched = list(spots.values()) if spots_mode else [selected]
+    if watch_mode:
+        if len(sports) > 1:
+            raise click.UsageError("--watch scores one sport; drop the extra --sport")
+        if offline:
+            raise click.UsageError("--watch polls upstream; drop --offline")
+        _watch(
+            fetched, spots_mode, show_timeline, output,
+            history=not no_store, nowcast=not no_nowcast,
+            sport=sport, hour=fixed_hour, tomorrow=tomorrow, window=window,
+            cache=None if no_cache else ResponseCache(), refresh=refresh,
+        )
+        return
+
+    history = None if no_store else _open_history()
+    if history is not None:
+        # Closed with the context, however the command exits
+        ctx.call_on_close(history.close)
     try:
-        inland = fetch_inland_forecast()
-    except Exception as e:
-        click.echo(f"Error fetching inland forecast: {e}", err=True)
+        with timing.span("fetch"):
+            data = _fetch(fetched, deadline, history, None if no_cache else ResponseCache(), refresh, offline)
+    except FetchError as e:
+        click.echo(str(e), err=True)
+        raise SystemExit(1) from None
+    # Saved data can be old enough not to cover the hour asked for at all
+    uncovered = [
+        spot["name"] for spot in fetched
+        if data[spot["id"]].get("stale") and data[spot["id"]]["forecasts"]["coastal"].index(target_date.date(), hour) is None
+    ]
+    if uncovered:
+        click.echo(f"No saved forecast reaches {target_date:%b} {target_date.day} {fmt_hour(hour)} for {', '.join(uncovered)}", err=True)
         raise SystemExit(1)
+    if history is not None:
+        with timing.span("history"):
+            _record(history, fetched, data, nowcast=not no_nowcast)
 
-    coastal_now = get_hourly_at(coastal, hour, target_date)
-    inland_now = get_hourly_at(inland, hour, target_date)
-
-    # Thermal gradient
-    thermal = compute_thermal_gradient(coastal_now["temp_f"], inland_now["temp_f"])
-    ml_suppression = marine_layer_suppression(coastal_now["temp_f"], coastal_now["dewpoint_f"])
-
-    # Confidence score
-    result = compute_confidence(
-        wind_kts=coastal_now["wind_kts"],
-        wind_dir=coastal_now["wind_dir"],
-        gust_kts=coastal_now["gusts_kts"],
-        thermal_delta_f=thermal["delta_f"],
-        marine_layer_suppression=ml_suppression,
-        hour=hour,
-        sport=sport,
-    )
+    if spots_mode:
+        with timing.span("score"):
+            by_spot = [build_reports(data[spot["id"]], spot, hour, target_date, sports, window) for spot in spots.values()]
+            ranked = {sport: rank_spots([reports[n] for reports in by_spot]) for n, sport in enumerate(sports)}
+        with timing.span("render"):
+            _show_spots(ranked, output, show_timeline, hour)
+        return
+
+    with timing.span("score"):
+        reports = build_reports(data[selected["id"]], selected, hour, target_date, sports, window)
+    with timing.span("render"):
+        if len(reports) > 1:
+            _show_sports(reports, output, show_timeline, target_date)
+        else:
+            _show_report(reports[0], output, show_timeline, target_date)
+
+
+def _fetch(spots: list[dict], deadline: float, history, cache: ResponseCache | None, refresh: bool, offline: bool) -> dict:
+    """fetch_all_sync for spots, falling back to saved data when upstream
+    can't be reached: expired cached responses first (however old), then
+    the history store's latest forecasts, if issued within STALE_MAX_AGE
+    (2 days). offline goes straight to the fallback."""
+    since = _series_since(history, spots)
+    error = None
+    if not offline:
+        try:
+            return fetch_all_sync(deadline=deadline, spots=spots, since=since, cache=cache, refresh=refresh)
+        except FetchError as e:
+            click.echo(f"{e}; falling back to saved data", err=True)
+            error = e
+    if cache is not None:
+        try:
+            return fetch_all_sync(deadline=deadline, spots=spots, since=since, cache=cache, offline=True)
+        except FetchError as e:
+            error = error or e
+    if history is not None:
+        import sqlite3
+
+        from .store import STALE_MAX_AGE, load_snapshot
+
+        try:
+            data = load_snapshot(history, spots, STALE_MAX_AGE, stale=True)
+        except sqlite3.Error:
+            data = None
+        if data is not None:
+            return data
+    raise error or FetchError("forecasts", ConnectionError("offline, and nothing saved to fall back on"))
+
+
+def _show_spots(ranked: dict[str, list[dict]], output: str | None, show_timeline: bool, hour: int) -> None:
+    """Ranked spots per sport; machine-readable output lists every sport's
+    ranking in turn, each report tagged with its sport."""
+    reports = [r for sport_reports in ranked.values() for r in sport_reports]
+    if output == "json":
+        print_json(reports, show_timeline)
+    elif output == "plain":
+        for sport, sport_reports in ranked.items():
+            if len(ranked) > 1:
+                click.echo(f"{sport.capitalize()}:")
+            print_plain_spots(sport_reports)
+    elif output in ("ndjson", "csv"):
+        print_records(reports, output, show_timeline)
+    else:
+        from .display import render_spots
+
+        for sport, sport_reports in ranked.items():
+            render_spots(sport_reports, sport, hour)
+
+
+def _show_sports(reports: list[dict], output: str | None, show_timeline: bool, target_date: datetime) -> None:
+    """One spot scored for several sports, side by side."""
+    if output == "json":
+        print_json(reports, show_timeline)
+    elif output == "plain":
+        print_plain_sports(reports, show_timeline)
+    elif output in ("ndjson", "csv"):
+        print_records(reports, output, show_timeline)
+    else:
+        from .display import render_sports
+
+        render_sports(reports, show_timeline, f"{target_date:%a %b} {target_date.day}")
+
+
+def _show_report(report: dict, output: str | None, show_timeline: bool, target_date: datetime) -> None:
+    if output == "json":
+        print_json(report, show_timeline)
+        return
+    if output == "plain":
+        print_plain(report, show_timeline)
+        return
+    if output in ("ndjson", "csv"):
+        print_records([report], output, show_timeline)
+        return
+
+    from .display import render_report, render_timeline, report_fields
+
+    render_report(**report_fields(report))
 
-    # NOAA data (non-critical)
-    tide_data = None
-    tide_predictions = []
-    observed_wind = None
-    marine_text = None
+    if show_timeline:
+        daylight = [row for row in report["timeline"] if row["hour"] in DAYLIGHT]
+        render_timeline(daylight, report["best_window"], report["sport"], f"{target_date:%a %b} {target_date.day}", report["spot_name"])
+
+
+def _finish_profile(show: bool, path: str | None) -> None:
+    profile = timing.stop()
+    if profile is None:
+        return
+    if show:
+        print_profile(profile)
+    if path:
+        try:
+            timing.dump(profile, path)
+        except OSError as e:
+            click.echo(f"Error writing profile: {e}", err=True)
+
+
+def _ensemble(
+    spot: dict, target_date: datetime, sport: str, window: int, models: str,
+    output: str | None, no_cache: bool, refresh: bool, offline: bool,
+) -> None:
+    from httpx import HTTPError
+
+    from .ensemble import run_ensemble
 
     try:
-        tide_data = fetch_tide_data()
-    except Exception:
-        pass
+        result = run_ensemble(
+            spot, target_date.date(), sport,
+            models=tuple(m.strip() for m in models.split(",") if m.strip()),
+            cache=None if no_cache else ResponseCache(),
+            refresh=refresh,
+            offline=offline,
+        )
+    except (HTTPError, ValueError) as e:
+        click.echo(f"Error fetching Open-Meteo ensemble: {e}", err=True)
+        raise SystemExit(1) from None
+    result["best_window"] = best_window(result["hours"], window)
+
+    with timing.span("render"):
+        if output == "json":
+            print_json(result)
+        elif output == "plain":
+            print_plain_ensemble(result)
+        elif output in ("ndjson", "csv"):
+            print_rows(result, [{"sport": sport, "date": result["date"], **row} for row in result["hours"]], output)
+        else:
+            from .display import render_ensemble
+
+            daylight = [row for row in result["hours"] if row["hour"] in DAYLIGHT]
+            render_ensemble({**result, "hours": daylight}, f"{target_date:%a %b} {target_date.day}")
+
+
+def _outlook(
+    spot: dict, days: int, sports: tuple[str, ...], window: int,
+    output: str | None, no_cache: bool, refresh: bool, offline: bool,
+) -> None:
+    from httpx import HTTPError
+
+    from .outlook import run_outlook
 
     try:
-        tide_predictions = fetch_tide_predictions()
-    except Exception:
-        pass
+        result = run_outlook(spot, days, sports, window, cache=None if no_cache else ResponseCache(), refresh=refresh, offline=offline)
+    except (HTTPError, ValueError) as e:
+        click.echo(f"Error fetching Open-Meteo forecast: {e}", err=True)
+        raise SystemExit(1) from None
+
+    with timing.span("render"):
+        if output == "json":
+            print_json(result)
+        elif output == "plain":
+            print_plain_outlook(result)
+        elif output in ("ndjson", "csv"):
+            rows = [
+                {"sport": sport, "date": day["date"], **hour}
+                for sport, days in result["sports"].items() for day in days for hour in day["hours"]
+            ]
+            print_rows(result, rows, output)
+        else:
+            from .display import render_outlook
+
+            render_outlook(result)
+
+
+def _watch(spots: list[dict], spots_mode: bool, show_timeline: bool, output: str | None, **options) -> None:
+    """Run watch mode: JSON, NDJSON, CSV and plain output append a report per
+    change (CSV with one header), the rich view is redrawn in place."""
+    from .watch import watch
+
+    def ordered(reports: dict[str, dict]) -> list[dict]:
+        return rank_spots(list(reports.values())) if spots_mode else list(reports.values())
+
+    if output == "json":
+        def on_update(reports, watcher):
+            if reports:
+                print_json(ordered(reports) if spots_mode else ordered(reports)[0], show_timeline)
+        watch(spots, on_update, **options)
+        return
+    if output in ("ndjson", "csv"):
+        header = True
+
+        def on_update(reports, watcher):
+            nonlocal header
+            if reports:
+                print_records(ordered(reports), output, show_timeline, header)
+                header = False
+        watch(spots, on_update, **options)
+        return
+    if output == "plain":
+        def on_update(reports, watcher):
+            if not reports:
+                return
+            if spots_mode:
+                print_plain_spots(ordered(reports))
+            else:
+                print_plain(ordered(reports)[0], show_timeline)
+            click.echo()
+        watch(spots, on_update, **options)
+        return
+
+    from rich.live import Live
+
+    from .display import get_console, watch_view
+
+    # No auto refresh: the screen is only redrawn when something changed
+    with Live(console=get_console(), auto_refresh=False) as live:
+        def on_update(reports, watcher):
+            view = watch_view(ordered(reports), spots_mode, show_timeline, watcher.polled, watcher.errors)
+            live.update(view, refresh=True)
+        watch(spots, on_update, **options)
+
+
+# The history store is a nice-to-have: a report never fails over it
+
+def _open_history():
+    import sqlite3
+
+    from .store import HistoryStore
 
     try:
-        observed_wind = fetch_wind_observation()
-    except Exception:
-        pass
+        return HistoryStore()
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def _series_since(history, spots: list[dict]) -> dict | None:
+    """Last stored readings, so NOAA series are fetched incrementally; None
+    (latest readings only) without a store."""
+    import sqlite3
+
+    from .store import series_since
 
+    if history is None:
+        return None
     try:
-        marine_text = fetch_marine_forecast()
-    except Exception:
+        return series_since(history, spots)
+    except sqlite3.Error:
+        return None
+
+
+def _record(history, spots: list[dict], data: dict[str, dict], nowcast: bool = True) -> None:
+    """Keep this run in the history store and fill in observations, trends
+    and the tide rate from it; with nowcast, correct the forecasts by the
+    observed bias."""
+    import sqlite3
+
+    from .nowcast import nowcast_spots
+    from .store import record_run, attach_observations
+
+    try:
+        # A run built from saved data has nothing new to record
+        if not any(spot_data.get("stale") for spot_data in data.values()):
+            record_run(history, spots, data)
+        attach_observations(history, spots, data)
+        if nowcast:
+            nowcast_spots(history, spots, data)
+    except (OSError, sqlite3.Error):
         pass
 
-    tide_str = classify_tide(
-        tide_data["water_level_ft"] if tide_data else None,
-        tide_predictions,
-    )
 
-    best = find_best_window(coastal, target_date)
-    tip = sport_tip(coastal_now["wind_kts"], coastal_now["gusts_kts"], sport)
-
-    render_report(
-        score=result["score"],
-        recommendation=result["recommendation"],
-        wind_kts=coastal_now["wind_kts"],
-        wind_dir=coastal_now["wind_dir"],
-        gust_kts=coastal_now["gusts_kts"],
-        thermal=thermal,
-        tide_str=tide_str,
-        best_window_hour=best["hour"],
-        tip=tip,
-        breakdown=result["breakdown"],
-        sport=sport,
-        observed_wind=observed_wind,
-        marine_forecast=marine_text,
+@main.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Address to listen on.")
+@click.option("--port", type=int, default=8765, show_default=True, help="Port to listen on.")
+@click.option("--interval", type=float, default=REFRESH_INTERVAL, show_default=True, help="Seconds between upstream refreshes.")
+@click.option("--spot", "spot_id", default=DEFAULT_SPOT, show_default=True, help="Spot answered when a request names none.")
+@click.option("--spots-file", type=click.Path(exists=True, dir_okay=False), default=None, help="Spot registry (JSON or TOML) to use instead of the bundled one.")
+@click.option("--no-cache", is_flag=True, help="Bypass the on-disk response cache entirely.")
+@click.option("--no-store", is_flag=True, help="Don't record refreshes in, or warm-start from, the history store.")
+def serve(host: str, port: int, interval: float, spot_id: str, spots_file: str | None, no_cache: bool, no_store: bool):
+    """Serve scores over HTTP/JSON from data refreshed in the background.
+
+    Endpoints: /score and /timeline (query: spot, sport, hour, date) and /health.
+    """
+    from .server import serve as run_server
+
+    try:
+        spots = load_spots(spots_file)
+        get_spot(spot_id, spots)
+    except (OSError, ValueError, KeyError) as e:
+        click.echo(f"Error loading spots: {e}", err=True)
+        raise SystemExit(1) from None
+
+    click.echo(f"Serving on http://{host}:{port} (refreshing every {interval:.0f}s)", err=True)
+    from .store import default_store_path
+
+    run_server(
+        spots, host, port, interval, spot_id,
+        history=None if no_store else default_store_path(),
+        cache=None if no_cache else ResponseCache(),
     )
+
+
+@main.command()
+@click.option("--spot", "spot_id", default=DEFAULT_SPOT, show_default=True, help="Spot id from the registry.")
+@click.option("--spots-file", type=click.Path(exists=True, dir_okay=False), default=None, help="Spot registry (JSON or TOML) to use instead of the bundled one.")
+@click.option("--start", type=click.DateTime(["%Y-%m-%d"]), default=None, help="First day to backtest. Defaults to a year before --end.")
+@click.option("--end", type=click.DateTime(["%Y-%m-%d"]), default=None, help="Last day to backtest. Defaults to yesterday.")
+@click.option("--sport", "sports", type=click.Choice(SPORTS), multiple=True, help="Sport to evaluate (repeatable). Defaults to all.")
+@click.option("--store", "store_path", type=click.Path(dir_okay=False), default=None, help="History database. Defaults to history.sqlite3 in the cache directory.")
+@click.option("--offline", is_flag=True, help="Score only what is already stored; download nothing.")
+@click.option("--json", "as_json", is_flag=True, help="Print the results as JSON.")
+def backtest(
+    spot_id: str,
+    spots_file: str | None,
+    start: datetime | None,
+    end: datetime | None,
+    sports: tuple[str, ...],
+    store_path: str | None,
+    offline: bool,
+    as_json: bool,
+):
+    """Score past forecasts against observed wind.
+
+    Downloads Open-Meteo archive forecasts and NOAA hourly wind for the
+    spot into a local store (once), then reports hit rate, confusion
+    matrix and calibration per sport.
+    """
+    from .backtest import run_backtest
+    from .store import HistoryStore
+
+    last = end.date() if end else date.today() - timedelta(days=1)
+    first = start.date() if start else last - timedelta(days=365)
+    if first > last:
+        raise click.BadParameter("--start must not be after --end")
+
+    try:
+        spot = get_spot(spot_id, load_spots(spots_file))
+    except (OSError, ValueError, KeyError) as e:
+        click.echo(f"Error loading spots: {e}", err=True)
+        raise SystemExit(1) from None
+
+    try:
+        with HistoryStore(store_path) as store:
+            result = run_backtest(spot, first, last, sports or SPORTS, store, offline)
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        raise SystemExit(1) from None
+
+    if as_json:
+        print_json(result)
+        return
+    from .display import render_backtest
+
+    render_backtest(result)
+
+
+@main.command()
+@click.option("--spot", "spot_ids", multiple=True, help="Spot id (repeatable). Defaults to every spot in the registry.")
+@click.option("--spots-file", type=click.Path(exists=True, dir_okay=False), default=None, help="Spot registry (JSON or TOML) to use instead of the bundled one.")
+@click.option("--start", type=click.DateTime(["%Y-%m-%d"]), default=None, help="First day to export. Defaults to 30 days before --end.")
+@click.option("--end", type=click.DateTime(["%Y-%m-%d"]), default=None, help="Last day to export. Defaults to yesterday.")
+@click.option("--sport", "sports", type=click.Choice(SPORTS), multiple=True, help="Sport to score (repeatable). Defaults to all.")
+@click.option("--format", "fmt", type=click.Choice(("ndjson", "csv", "parquet")), default=None, help="Defaults from the output file's extension, else ndjson.")
+@click.option("-o", "--output", "out", type=click.Path(dir_okay=False, allow_dash=True), default="-", show_default=True, help="File to write, or - for stdout.")
+@click.option("--store", "store_path", type=click.Path(dir_okay=False), default=None, help="History database. Defaults to history.sqlite3 in the cache directory.")
+@click.option("--offline", is_flag=True, help="Export only what is already stored; download nothing.")
+def export(
+    spot_ids: tuple[str, ...],
+    spots_file: str | None,
+    start: datetime | None,
+    end: datetime | None,
+    sports: tuple[str, ...],
+    fmt: str | None,
+    out: str,
+    store_path: str | None,
+    offline: bool,
+):
+    """Stream scored hourly timelines as NDJSON, CSV or Parquet.
+
+    Every stored forecast hour of each spot over the date range is scored
+    for each sport, with the observed wind where known. The archive is
+    downloaded into the history store first, as for backtest. Rows are
+    written batch by batch, so memory use does not grow with the range.
+    """
+    from .export import run_export
+    from .store import HistoryStore
+
+    last = end.date() if end else date.today() - timedelta(days=1)
+    first = start.date() if start else last - timedelta(days=30)
+    if first > last:
+        raise click.BadParameter("--start must not be after --end")
+    fmt = fmt or next((f for f in ("csv", "parquet") if out.endswith("." + f)), "ndjson")
+    if fmt == "parquet" and out == "-":
+        raise click.UsageError("Parquet needs a file: pass --output PATH")
+
+    try:
+        registry = load_spots(spots_file)
+        spots = [get_spot(s, registry) for s in spot_ids] if spot_ids else list(registry.values())
+    except (OSError, ValueError, KeyError) as e:
+        click.echo(f"Error loading spots: {e}", err=True)
+        raise SystemExit(1) from None
+
+    try:
+        with HistoryStore(store_path) as store:
+            if fmt == "parquet":
+                result = run_export(spots, first, last, fmt, out, sports or SPORTS, store, offline)
+            else:
+                with click.open_file(out, "w", encoding="utf-8", lazy=False) as stream:
+                    result = run_export(spots, first, last, fmt, stream, sports or SPORTS, store, offline)
+    except (OSError, RuntimeError, ValueError) as e:
+        click.echo(f"Error: {e}", err=True)
+        raise SystemExit(1) from None
+    for source, first_day, last_day, error in result["failed"]:
+        click.echo(f"Warning: {source} {first_day}..{last_day} not downloaded: {error}", err=True)
+    if out != "-":
+        click.echo(f"Wrote {result['rows']} rows to {out}", err=True)
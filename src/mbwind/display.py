@@ -1,13 +1,29 @@
-from rich.console import Console
+from datetime import date
+
+from rich.console import Console, Group
 from rich.panel import Panel
+from rich.table import Table
 from rich.text import Text
 
+from .output import fmt_hour, trend_text, nowcast_text, stale_text, marine_text
+from .timeline import DAYLIGHT
 from .score import direction_name
 
-console = Console()
+_console = None
+
+
+def get_console() -> Console:
+    """Shared Console, created on first render rather than at import."""
+    global _console
+    if _console is None:
+        _console = Console()
+    return _console
+
+
+REC_COLORS = {"GO": "green", "MAYBE": "yellow", "NO-GO": "red"}
 
 
-def render_report(
+def report_panel(
     score: int,
     recommendation: str,
     wind_kts: float,
@@ -20,13 +36,18 @@ def render_report(
     breakdown: dict,
     sport: str = "laser",
     observed_wind: dict | None = None,
-    marine_forecast: str | None = None,
-) -> None:
-    rec_colors = {"GO": "green", "MAYBE": "yellow", "NO-GO": "red"}
-    color = rec_colors.get(recommendation, "white")
+    marine_forecast: dict | None = None,
+    best_window_end: int | None = None,
+    spot_name: str = "Mission Bay",
+    observed_trend: dict | None = None,
+    nowcast: dict | None = None,
+    stale: dict | None = None,
+) -> Panel:
+    """The main report: score, conditions and tip in one panel."""
+    color = REC_COLORS.get(recommendation, "white")
 
     header = Text()
-    header.append("Mission Bay Wind Confidence: ", style="bold")
+    header.append(f"{spot_name} Wind Confidence: ", style="bold")
     header.append(f"{score}/100", style=f"bold {color}")
     header.append(f" — {recommendation}", style=f"bold {color}")
 
@@ -34,14 +55,19 @@ def render_report(
     gust_str = f" (gusts {gust_kts:.0f})" if gust_kts else ""
 
     lines = []
+    if stale:
+        lines.append(f"[bold yellow]{stale_text(stale)}[/bold yellow]")
     lines.append(f"[bold]Wind:[/bold]     {wind_kts:.0f} kts {dir_name}{gust_str}")
 
     if observed_wind:
         obs = observed_wind
+        trend = f", {trend_text(observed_trend)}" if observed_trend else ""
         lines.append(
             f"[dim]Observed: {obs['speed_kts'] or '?'} kts {obs['direction']} "
-            f"(NOAA {obs['time']})[/dim]"
+            f"(NOAA {obs['time']}){trend}[/dim]"
         )
+    if nowcast:
+        lines.append(f"[dim]Nowcast:  forecast corrected {nowcast_text(nowcast)}[/dim]")
 
     lines.append(
         f"[bold]Thermal:[/bold]  {thermal['strength']} "
@@ -51,22 +77,384 @@ def render_report(
     )
     lines.append(f"[bold]Tide:[/bold]     {tide_str}")
 
-    end_hour = min(best_window_hour + 3, 18)
-    lines.append(
-        f"[bold]Best window:[/bold] {best_window_hour % 12 or 12}{'pm' if best_window_hour >= 12 else 'am'}"
-        f" - {end_hour % 12 or 12}{'pm' if end_hour >= 12 else 'am'}"
-    )
+    end_hour = best_window_end if best_window_end is not None else min(best_window_hour + 3, 18)
+    lines.append(f"[bold]Best window:[/bold] {fmt_hour(best_window_hour)} - {fmt_hour(end_hour)}")
 
     lines.append("")
     sport_label = sport.capitalize()
     lines.append(f"[italic]{sport_label} tip: {tip}[/italic]")
 
     if marine_forecast:
-        short = marine_forecast[:200] + "..." if len(marine_forecast) > 200 else marine_forecast
         lines.append("")
-        lines.append(f"[dim]Marine forecast: {short}[/dim]")
+        if marine_forecast["advisory"]:
+            penalty = breakdown.get("advisory_penalty", 0)
+            lines.append(f"[bold red]{marine_forecast['advisory']} in effect (-{penalty:g})[/bold red]")
+        lines.append(f"[dim]Marine forecast: {marine_text(marine_forecast)}[/dim]")
 
     body = "\n".join(lines)
+    return Panel(body, title=header, border_style=color, padding=(1, 2))
+
+
+def report_fields(report: dict) -> dict:
+    """report_panel's arguments from a build_report result."""
+    return {
+        "score": report["score"],
+        "recommendation": report["recommendation"],
+        "wind_kts": report["wind_kts"],
+        "wind_dir": report["wind_dir"],
+        "gust_kts": report["gust_kts"],
+        "thermal": report["thermal"],
+        "tide_str": report["tide"],
+        "best_window_hour": report["best_window"]["start_hour"],
+        "best_window_end": report["best_window"]["end_hour"],
+        "tip": report["tip"],
+        "breakdown": report["breakdown"],
+        "sport": report["sport"],
+        "observed_wind": report["observed_wind"],
+        "marine_forecast": report["marine_forecast"],
+        "spot_name": report["spot_name"],
+        "observed_trend": report["observed_trend"],
+        "nowcast": report["nowcast"],
+        "stale": report.get("stale"),
+    }
+
+
+def render_report(**fields) -> None:
+    """Print report_panel(**fields)."""
+    console = get_console()
+    console.print()
+    console.print(report_panel(**fields))
+    console.print()
+
+
+def timeline_view(
+    timeline: list[dict],
+    best: dict | None,
+    sport: str = "laser",
+    day_label: str = "",
+    spot_name: str = "Mission Bay",
+) -> Group:
+    """Hour-by-hour score table, with the best window highlighted."""
+    title = f"{spot_name} {sport} timeline"
+    if day_label:
+        title += f" — {day_label}"
+    table = Table(title=title)
+    table.add_column("Hour", justify="right")
+    table.add_column("Wind", justify="right")
+    table.add_column("Dir")
+    table.add_column("Gust", justify="right")
+    table.add_column("Thermal Δ", justify="right")
+    table.add_column("Score", justify="right")
+    table.add_column("")
+
+    for row in timeline:
+        in_best = best is not None and best["start_hour"] <= row["hour"] < best["end_hour"]
+        color = REC_COLORS.get(row["recommendation"], "white")
+        wind = f"{row['wind_kts']:.0f}" if row["wind_kts"] is not None else "?"
+        gust = f"{row['gusts_kts']:.0f}" if row["gusts_kts"] is not None else "?"
+        delta = f"{row['thermal_delta_f']:.0f}°F" if row["thermal_delta_f"] is not None else "?"
+        table.add_row(
+            fmt_hour(row["hour"]),
+            wind,
+            direction_name(row["wind_dir"]) if row["wind_dir"] is not None else "?",
+            gust,
+            delta,
+            f"[{color}]{row['score']}[/{color}]",
+            f"[{color}]{row['recommendation']}[/{color}]",
+            style="bold" if in_best else None,
+        )
+
+    parts = [table]
+    if best is not None:
+        avg = f" (avg score {best['mean_score']})" if best.get("mean_score") is not None else ""
+        parts.append(
+            f"[bold]Best {best['end_hour'] - best['start_hour']}h window:[/bold] "
+            f"{fmt_hour(best['start_hour'])} - {fmt_hour(best['end_hour'])}{avg}"
+        )
+    return Group(*parts)
+
+
+def render_timeline(*args, **kwargs) -> None:
+    """Print timeline_view(...)."""
+    console = get_console()
+    console.print()
+    console.print(timeline_view(*args, **kwargs))
+    console.print()
+
+
+def sports_view(reports: list[dict], show_timeline: bool = False, day_label: str = "") -> Group:
+    """One spot's reports for several sports side by side, with per-sport
+    tips; the timeline has a score column per sport, each sport's best
+    window in bold."""
+    first = reports[0]
+    dir_name = direction_name(first["wind_dir"]) if first["wind_dir"] is not None else "?"
+    gust = f" g{first['gust_kts']:.0f}" if first["gust_kts"] else ""
+    wind = f"{first['wind_kts']:.0f} kts {dir_name}{gust}" if first["wind_kts"] is not None else "? kts"
+    table = Table(
+        title=f"{first['spot_name']} at {fmt_hour(first['hour'])}",
+        caption=f"Wind {wind} · thermal Δ{first['thermal']['delta_f']:.0f}°F · {first['tide']}"
+        + (f"\n[bold yellow]{stale_text(first['stale'])}[/bold yellow]" if first.get("stale") else ""),
+    )
+    table.add_column("Sport")
+    table.add_column("Score", justify="right")
+    table.add_column("")
+    table.add_column("Best window", no_wrap=True)
+    table.add_column("Tip")
+    for r in reports:
+        color = REC_COLORS.get(r["recommendation"], "white")
+        best = r["best_window"]
+        table.add_row(
+            r["sport"].capitalize(),
+            f"[bold {color}]{r['score']}[/bold {color}]",
+            f"[{color}]{r['recommendation']}[/{color}]",
+            f"{fmt_hour(best['start_hour'])} - {fmt_hour(best['end_hour'])}",
+            r["tip"],
+        )
+    if not show_timeline:
+        return Group(table)
+
+    title = f"{first['spot_name']} timeline"
+    if day_label:
+        title += f" — {day_label}"
+    hourly = Table(title=title, caption="Bold: each sport's best window")
+    hourly.add_column("Hour", justify="right")
+    hourly.add_column("Wind", justify="right")
+    hourly.add_column("Dir")
+    hourly.add_column("Thermal Δ", justify="right")
+    for r in reports:
+        hourly.add_column(r["sport"].capitalize(), justify="right")
+    for rows in zip(*(r["timeline"] for r in reports)):
+        row = rows[0]
+        if row["hour"] not in DAYLIGHT:
+            continue
+        cells = []
+        for r, scored in zip(reports, rows):
+            color = REC_COLORS.get(scored["recommendation"], "white")
+            best = r["best_window"]
+            style = f"bold {color}" if best["start_hour"] <= row["hour"] < best["end_hour"] else color
+            cells.append(f"[{style}]{scored['score']}[/{style}]")
+        hourly.add_row(
+            fmt_hour(row["hour"]),
+            f"{row['wind_kts']:.0f}" if row["wind_kts"] is not None else "?",
+            direction_name(row["wind_dir"]) if row["wind_dir"] is not None else "?",
+            f"{row['thermal_delta_f']:.0f}°F" if row["thermal_delta_f"] is not None else "?",
+            *cells,
+        )
+    return Group(table, Text(), hourly)
+
+
+def render_sports(*args, **kwargs) -> None:
+    """Print sports_view(...)."""
+    console = get_console()
     console.print()
-    console.print(Panel(body, title=header, border_style=color, padding=(1, 2)))
+    console.print(sports_view(*args, **kwargs))
+    console.print()
+
+
+def spots_table(reports: list[dict], sport: str, hour: int) -> Table:
+    """Ranked comparison of every spot at one hour."""
+    stale = reports[0].get("stale") if reports else None
+    table = Table(
+        title=f"{sport.capitalize()} spots at {fmt_hour(hour)}",
+        caption=f"[bold yellow]{stale_text(stale)}[/bold yellow]" if stale else None,
+    )
+    table.add_column("#", justify="right")
+    table.add_column("Spot")
+    table.add_column("Score", justify="right")
+    table.add_column("")
+    table.add_column("Wind")
+    table.add_column("Thermal Δ", justify="right")
+    table.add_column("Tide")
+    table.add_column("Best window")
+
+    for rank, r in enumerate(reports, 1):
+        color = REC_COLORS.get(r["recommendation"], "white")
+        dir_name = direction_name(r["wind_dir"]) if r["wind_dir"] is not None else "?"
+        gust = f" g{r['gust_kts']:.0f}" if r["gust_kts"] else ""
+        best = r["best_window"]
+        table.add_row(
+            str(rank),
+            r["spot_name"],
+            f"[bold {color}]{r['score']}[/bold {color}]",
+            f"[{color}]{r['recommendation']}[/{color}]",
+            f"{r['wind_kts']:.0f} kts {dir_name}{gust}",
+            f"{r['thermal']['delta_f']:.0f}°F",
+            r["tide"],
+            f"{fmt_hour(best['start_hour'])} - {fmt_hour(best['end_hour'])}",
+        )
+    return table
+
+
+def render_spots(reports: list[dict], sport: str, hour: int) -> None:
+    console = get_console()
+    console.print()
+    console.print(spots_table(reports, sport, hour))
+    console.print()
+
+
+def watch_view(
+    reports: list[dict],
+    spots_mode: bool,
+    show_timeline: bool,
+    polled: dict,
+    errors: dict[str, str],
+) -> Group:
+    """Everything watch mode shows: the report (or ranked spots), then when
+    each source was last polled and any failures."""
+    parts = []
+    if not reports:
+        parts.append(Text("Waiting for the forecast...", style="bold"))
+    elif spots_mode:
+        parts.append(spots_table(reports, reports[0]["sport"], reports[0]["hour"]))
+    else:
+        report = reports[0]
+        parts.append(report_panel(**report_fields(report)))
+        if show_timeline:
+            day = date.fromisoformat(report["date"])
+            daylight = [row for row in report["timeline"] if row["hour"] in DAYLIGHT]
+            parts.append(timeline_view(daylight, report["best_window"], report["sport"], f"{day:%a %b} {day.day}", report["spot_name"]))
+
+    status = ", ".join(f"{feed.replace('_', ' ')} {t:%H:%M}" for feed, t in polled.items())
+    parts.append(Text(f"Polled: {status or 'nothing yet'} · Ctrl-C to stop", style="dim"))
+    for feed, error in errors.items():
+        parts.append(Text(f"{feed.replace('_', ' ')}: {error}", style="yellow"))
+    return Group(*parts)
+
+
+def _pct(x: float | None) -> str:
+    return f"{x:.0%}" if x is not None else "—"
+
+
+def render_backtest(result: dict) -> None:
+    """Per-sport hit rate, confusion matrix and calibration of a backtest."""
+    console = get_console()
+    console.print()
+    console.print(
+        f"[bold]{result['spot_name']} backtest[/bold] {result['start']} to {result['end']}: "
+        f"{result['hours']} session hours with forecast and observation"
+    )
+    ingest = result["ingest"]
+    if ingest:
+        console.print(f"[dim]Downloaded {ingest['downloaded']} chunks, {ingest['skipped']} already stored[/dim]")
+        for source, start, end, error in ingest["failed"]:
+            console.print(f"[yellow]Failed {source} {start} to {end}: {error}[/yellow]")
+
+    for sport, m in result["sports"].items():
+        console.print()
+        console.print(
+            f"[bold]{sport.capitalize()}[/bold]  hit rate {_pct(m['hit_rate'])}, "
+            f"GO precision {_pct(m['go_precision'])}, GO recall {_pct(m['go_recall'])}, "
+            f"calibration error {_pct(m['calibration_error'])}"
+        )
+        confusion = Table(title="Forecast vs observed")
+        confusion.add_column("Forecast")
+        for rec in m["confusion"]:
+            confusion.add_column(rec, justify="right")
+        for rec, row in m["confusion"].items():
+            color = REC_COLORS[rec]
+            confusion.add_row(f"[{color}]{rec}[/{color}]", *(str(n) for n in row.values()))
+
+        calibration = Table(title="Calibration")
+        calibration.add_column("Score", justify="right")
+        calibration.add_column("Hours", justify="right")
+        calibration.add_column("Mean", justify="right")
+        calibration.add_column("Observed GO", justify="right")
+        for b in m["calibration"]:
+            calibration.add_row(b["bin"], str(b["hours"]), f"{b['mean_score']:.0f}", _pct(b["observed_go_rate"]))
+
+        console.print(confusion)
+        console.print(calibration)
+    console.print()
+
+
+def _band(p10: int, median: int, p90: int, width: int = 20) -> str:
+    """The 10-90% range as a bar on a 0-100 scale, median marked."""
+    cells = [" "] * width
+    lo, mid, hi = (min(width - 1, v * width // 100) for v in (p10, median, p90))
+    for i in range(lo, hi + 1):
+        cells[i] = "─"
+    cells[mid] = "┃"
+    return "".join(cells)
+
+
+def render_ensemble(result: dict, day_label: str = "") -> None:
+    """Per-hour P(GO), median score and spread band across ensemble members."""
+    title = f"{result['spot_name']} {result['sport']} ensemble"
+    if day_label:
+        title += f" — {day_label}"
+    caption = f"{result['members']} members: {', '.join(result['models'])}"
+    if result.get("stale"):
+        caption += f"\n[bold yellow]{stale_text(result['stale'])}[/bold yellow]"
+    table = Table(title=title, caption=caption)
+    table.add_column("Hour", justify="right")
+    table.add_column("P(GO)", justify="right")
+    table.add_column("Median", justify="right")
+    table.add_column("10-90%", justify="right")
+    table.add_column("0 ─ score ─ 100")
+    table.add_column("")
+
+    best = result.get("best_window")
+    for row in result["hours"]:
+        in_best = best is not None and best["start_hour"] <= row["hour"] < best["end_hour"]
+        color = REC_COLORS.get(row["recommendation"], "white")
+        table.add_row(
+            fmt_hour(row["hour"]),
+            f"{row['p_go']:.0%}",
+            f"[{color}]{row['median']}[/{color}]",
+            f"{row['p10']}-{row['p90']}",
+            f"[{color}]{_band(row['p10'], row['median'], row['p90'])}[/{color}]",
+            f"[{color}]{row['recommendation']}[/{color}]",
+            style="bold" if in_best else None,
+        )
+
+    console = get_console()
+    console.print()
+    console.print(table)
+    if best is not None:
+        console.print(
+            f"[bold]Best {best['end_hour'] - best['start_hour']}h window:[/bold] "
+            f"{fmt_hour(best['start_hour'])} - {fmt_hour(best['end_hour'])} (median score {best['mean_score']})"
+        )
+    console.print()
+
+
+def outlook_table(days: list[dict], sport: str, spot_name: str) -> Table:
+    """Per-day heatmap: each daylight hour's score coloured by its
+    recommendation, the best window highlighted."""
+    hours = list(DAYLIGHT)
+    table = Table(
+        title=f"{spot_name} {sport} outlook",
+        caption=f"Hours {fmt_hour(hours[0])}-{fmt_hour(hours[-1])}; highlighted: best window",
+        box=None, padding=(0, 0, 0, 1),
+    )
+    table.add_column("Day", no_wrap=True)
+    for h in hours:
+        table.add_column(str(h % 12 or 12), justify="right", min_width=2)
+    table.add_column(" Best window", no_wrap=True)
+    for day in days:
+        by_hour = {row["hour"]: row for row in day["hours"]}
+        best = day["best_window"]
+        cells = []
+        for h in hours:
+            row = by_hour.get(h)
+            if row is None:
+                cells.append("[dim]·[/dim]")
+                continue
+            color = REC_COLORS.get(row["recommendation"], "white")
+            in_best = best is not None and best["start_hour"] <= h < best["end_hour"]
+            style = f"bold reverse {color}" if in_best else color
+            cells.append(f"[{style}]{row['score']}[/{style}]")
+        window = f" {fmt_hour(best['start_hour'])}-{fmt_hour(best['end_hour'])} ({best['mean_score']})" if best else " -"
+        d = date.fromisoformat(day["date"])
+        table.add_row(f"{d:%a %b} {d.day}", *cells, window)
+    return table
+
+
+def render_outlook(result: dict) -> None:
+    console = get_console()
     console.print()
+    if result.get("stale"):
+        console.print(f"[bold yellow]{stale_text(result['stale'])}[/bold yellow]")
+    for sport, days in result["sports"].items():
+        console.print(outlook_table(days, sport, result["spot_name"]))
+        console.print()
@@ -0,0 +1,180 @@
+"""Probabilistic scores from ensemble and multi-model forecasts.
+
+Every member of every model is scored for every hour of a day in a single
+batch call (members x hours values per factor), then summarised per hour:
+the chance of a GO, the median score and a 10-90% spread band.
+"""
+from __future__ import annotations
+
+import math
+import statistics
+import warnings
+from datetime import date
+from typing import TYPE_CHECKING
+
+from . import timing
+from .batch import score_batch, GO, recommendation
+from .fetch import REQUEST_TIMEOUT
+from .sources.forecast import Forecast
+from .sources.open_meteo import fetch_ensemble, ENSEMBLE_MODELS
+from .sources.thermal import marine_layer_suppression
+
+if TYPE_CHECKING:
+    from .sources.http import HttpClient
+
+NAN = math.nan
+
+
+def _values(forecast: Forecast, name: str, indices: range) -> list[float]:
+    col = forecast.columns.get(name)
+    return [col[i] for i in indices] if col is not None else [NAN] * len(indices)
+
+
+def member_columns(
+    coastal: dict[str, Forecast],
+    inland: dict[str, Forecast],
+    day: date,
+) -> tuple[list[str], list[int], dict[str, list]]:
+    """Flatten every member's hours of a day into scorer-ready columns.
+
+    Returns the member keys, the hours of the day (one block of values per
+    member, in this order) and the columns. Each member's thermal gradient
+    uses the inland member with the same key, else the inland control run."""
+    members = sorted(coastal)
+    reference = next(iter(coastal.values()))
+    indices = reference.day_range(day)
+    hours = [reference.times[i].hour for i in indices]
+    inland_default = inland.get("control") or next(iter(inland.values()))
+
+    cols = {k: [] for k in ("wind_kts", "wind_dir", "gusts_kts", "thermal_delta_f", "marine_layer", "hour")}
+    for member in members:
+        f = coastal[member]
+        temp = _values(f, "temp_f", indices)
+        dewpoint = _values(f, "dewpoint_f", indices)
+        inland_temp = _values(inland.get(member, inland_default), "temp_f", indices)
+        cols["wind_kts"] += _values(f, "wind_kts", indices)
+        cols["wind_dir"] += _values(f, "wind_dir", indices)
+        cols["gusts_kts"] += _values(f, "gusts_kts", indices)
+        cols["thermal_delta_f"] += [round(i - c, 1) for c, i in zip(temp, inland_temp)]
+        cols["marine_layer"] += [
+            0.0 if math.isnan(t) or math.isnan(d) else marine_layer_suppression(t, d)
+            for t, d in zip(temp, dewpoint)
+        ]
+        cols["hour"] += hours
+    return members, hours, cols
+
+
+def _summarise_python(scores: list[int], valid: list[bool], n_members: int, n_hours: int) -> list[dict]:
+    rows = []
+    for h in range(n_hours):
+        values = sorted(scores[m * n_hours + h] for m in range(n_members) if valid[m * n_hours + h])
+        if not values:
+            rows.append(None)
+            continue
+        deciles = statistics.quantiles(values, n=10, method="inclusive") if len(values) > 1 else [values[0]] * 9
+        rows.append({
+            "members": len(values),
+            "p_go": sum(v >= GO for v in values) / len(values),
+            "median": statistics.median(values),
+            "p10": deciles[0],
+            "p90": deciles[-1],
+        })
+    return rows
+
+
+def _summarise_numpy(np, scores, valid, n_members: int, n_hours: int) -> list[dict]:
+    grid = np.where(np.asarray(valid).reshape(n_members, n_hours), np.asarray(scores).reshape(n_members, n_hours), np.nan)
+    counts = (~np.isnan(grid)).sum(axis=0)
+    with np.errstate(invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN hours are dropped below
+        p_go = (grid >= GO).sum(axis=0) / np.maximum(counts, 1)
+        p10, median, p90 = np.nanpercentile(grid, [10, 50, 90], axis=0)
+    return [
+        {
+            "members": int(counts[h]),
+            "p_go": float(p_go[h]),
+            "median": float(median[h]),
+            "p10": float(p10[h]),
+            "p90": float(p90[h]),
+        } if counts[h] else None
+        for h in range(n_hours)
+    ]
+
+
+def score_ensemble(
+    coastal: dict[str, Forecast],
+    inland: dict[str, Forecast],
+    day: date,
+    sport: str = "laser",
+    direction_sectors=None,
+    backend: str = "auto",
+) -> list[dict]:
+    """Score all members for every hour of day; one summary row per hour.
+
+    Rows have hour, members (those with a wind value that hour), p_go,
+    median, p10 and p90 scores, plus score and recommendation from the
+    median so best_window and the timeline renderers accept them."""
+    members, hours, cols = member_columns(coastal, inland, day)
+    if not hours:
+        return []
+    scored = score_batch(
+        cols["wind_kts"], cols["wind_dir"], cols["gusts_kts"],
+        cols["thermal_delta_f"], cols["marine_layer"], cols["hour"],
+        sport=sport, backend=backend, direction_sectors=direction_sectors,
+    )
+    # A member without wind for an hour has no opinion on it
+    valid = [not math.isnan(w) for w in cols["wind_kts"]]
+    if type(scored["score"]).__module__ == "numpy":
+        import numpy  # already loaded by the numpy backend
+
+        summaries = _summarise_numpy(numpy, scored["score"], valid, len(members), len(hours))
+    else:
+        summaries = _summarise_python(scored["score"], valid, len(members), len(hours))
+
+    rows = []
+    for hour, summary in zip(hours, summaries):
+        if summary is None:
+            continue
+        median = round(summary["median"])
+        rows.append({
+            "hour": hour,
+            "members": summary["members"],
+            "p_go": round(summary["p_go"], 2),
+            "median": median,
+            "p10": round(summary["p10"]),
+            "p90": round(summary["p90"]),
+            "score": median,
+            "recommendation": recommendation(median),
+        })
+    return rows
+
+
+async def fetch_spot_ensemble(client: HttpClient, spot: dict, models=ENSEMBLE_MODELS) -> dict[str, dict[str, Forecast]]:
+    """Coastal and inland members for a spot, in one request."""
+    return await fetch_ensemble(client, {"coastal": spot["coastal"], "inland": spot["inland"]}, tuple(models))
+
+
+def run_ensemble(spot: dict, day: date, sport: str = "laser", models=ENSEMBLE_MODELS, **client_options) -> dict:
+    """Blocking fetch-and-score for the CLI. Extra keyword arguments configure
+    the HttpClient."""
+    import asyncio
+
+    from .sources.http import HttpClient
+
+    async def fetch():
+        async with HttpClient(timeout=REQUEST_TIMEOUT, **client_options) as client:
+            return await fetch_spot_ensemble(client, spot, models), client.take_stale()
+    with timing.span("fetch"):
+        members, stale = asyncio.run(fetch())
+    with timing.span("score"):
+        rows = score_ensemble(members["coastal"], members["inland"], day, sport, spot["directions"])
+    return {
+        "spot": spot["id"],
+        "spot_name": spot["name"],
+        "sport": sport,
+        "date": day.isoformat(),
+        "models": list(models),
+        "members": len(members["coastal"]),
+        "stale": stale,
+        "hours": rows,
+    }
@@ -0,0 +1,160 @@
+"""Bulk export of scored hours from the history store.
+
+Rows are streamed: the store is read BATCH_HOURS at a time, each batch is
+scored for every sport in one call and written out before the next one is
+read, so memory stays flat however many days, spots and sports go in.
+NDJSON and CSV go to any text stream; Parquet needs pyarrow and a path.
+"""
+from __future__ import annotations
+
+import csv
+import json
+from datetime import date, timedelta
+from typing import Iterator
+
+from . import timing
+from .batch import score_batch_sports, to_list
+from .fetch import grid_cell, REQUEST_TIMEOUT
+from .score import SPORTS
+from .sources.thermal import marine_layer_suppression
+from .store import HistoryStore
+
+# Hours read, scored and written at a time
+BATCH_HOURS = 24 * 31
+BREAKDOWN = ("wind_speed", "direction", "thermal", "gust_factor", "time_of_day", "marine_layer_penalty")
+# The hour's conditions, as scored, after the score columns
+CONDITIONS = ("wind_kts", "wind_dir", "gusts_kts", "thermal_delta_f", "marine_layer", "observed_kts")
+COLUMNS = (
+    "spot", "sport", "time", "hour", "score", "recommendation",
+    *(f"breakdown_{k}" for k in BREAKDOWN),
+    *CONDITIONS,
+)
+
+
+def scored_batches(
+    store: HistoryStore,
+    spots: list[dict],
+    start: date,
+    end: date,
+    sports=SPORTS,
+    batch: int = BATCH_HOURS,
+) -> Iterator[list[dict]]:
+    """Every stored forecast hour of each spot over start..end (inclusive),
+    scored for each sport, as lists of flat records with COLUMNS.
+
+    Observed wind is filled in where the store has it, else None."""
+    for spot in spots:
+        cursor = store.hours(
+            grid_cell(spot["coastal"]), grid_cell(spot["inland"]), spot["tide_station"] or "",
+            start.isoformat(), (end + timedelta(days=1)).isoformat(),
+        )
+        while rows := cursor.fetchmany(batch):
+            yield from _score(rows, spot, sports)
+
+
+def _score(rows: list[tuple], spot: dict, sports) -> Iterator[list[dict]]:
+    cols = {k: [] for k in ("time", "hour", *CONDITIONS)}
+    for time, temp, wind, direction, gust, dewpoint, inland_temp, observed in rows:
+        cols["time"].append(time)
+        cols["hour"].append(int(time[11:13]))
+        cols["wind_kts"].append(wind)
+        cols["wind_dir"].append(direction)
+        cols["gusts_kts"].append(gust)
+        cols["thermal_delta_f"].append(round(inland_temp - temp, 1) if temp is not None and inland_temp is not None else None)
+        cols["marine_layer"].append(marine_layer_suppression(temp, dewpoint) if temp is not None and dewpoint is not None else 0.0)
+        cols["observed_kts"].append(observed)
+    with timing.span("score"):
+        scored = score_batch_sports(
+            cols["wind_kts"], cols["wind_dir"], cols["gusts_kts"],
+            cols["thermal_delta_f"], cols["marine_layer"], cols["hour"],
+            sports=tuple(sports), direction_sectors=spot["directions"],
+        )
+    for sport in sports:
+        result = scored[sport]
+        columns = {
+            "time": cols["time"],
+            "hour": cols["hour"],
+            "score": to_list(result["score"]),
+            "recommendation": to_list(result["recommendation"]),
+            **{f"breakdown_{k}": to_list(result["breakdown"][k]) for k in BREAKDOWN},
+            **{k: cols[k] for k in CONDITIONS},
+        }
+        yield [{"spot": spot["id"], "sport": sport, **dict(zip(columns, values))} for values in zip(*columns.values())]
+
+
+def write_ndjson(batches, stream) -> int:
+    rows = 0
+    for records in batches:
+        stream.writelines(json.dumps(r) + "\n" for r in records)
+        rows += len(records)
+    return rows
+
+
+def write_csv(batches, stream) -> int:
+    writer = csv.DictWriter(stream, COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    rows = 0
+    for records in batches:
+        writer.writerows(records)
+        rows += len(records)
+    return rows
+
+
+def write_parquet(batches, path: str) -> int:
+    """Write a Parquet file, one row group per batch."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow; install it, or use ndjson or csv") from None
+    schema = pa.schema([
+        ("spot", pa.string()), ("sport", pa.string()), ("time", pa.string()), ("hour", pa.int8()),
+        ("score", pa.int16()), ("recommendation", pa.string()),
+        *((f"breakdown_{k}", pa.float64() if k == "marine_layer_penalty" else pa.int16()) for k in BREAKDOWN),
+        *((k, pa.float64()) for k in CONDITIONS),
+    ])
+    rows = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for records in batches:
+            writer.write_table(pa.Table.from_pylist(records, schema=schema))
+            rows += len(records)
+    return rows
+
+
+def run_export(
+    spots: list[dict],
+    start: date,
+    end: date,
+    fmt: str,
+    out,
+    sports=SPORTS,
+    store: HistoryStore | None = None,
+    offline: bool = False,
+    **client_options,
+) -> dict:
+    """Download the archive that is missing (unless offline), then stream
+    start..end to out: a text stream for ndjson and csv, a path for
+    parquet. Extra keyword arguments configure the HttpClient.
+
+    Returns the rows written and the downloads that failed, as ingest
+    reports them; what is already stored is exported regardless."""
+    import asyncio
+
+    from .backtest import ingest
+    from .sources.http import HttpClient
+
+    store = store if store is not None else HistoryStore()
+    failed = []
+    if not offline:
+        async def download():
+            async with HttpClient(timeout=REQUEST_TIMEOUT * 6, **client_options) as client:
+                for spot in spots:
+                    failed.extend((await ingest(client, store, spot, start, end))["failed"])
+        with timing.span("fetch"):
+            asyncio.run(download())
+    batches = scored_batches(store, spots, start, end, sports)
+    if fmt == "parquet":
+        rows = write_parquet(batches, out)
+    else:
+        rows = (write_csv if fmt == "csv" else write_ndjson)(batches, out)
+    return {"rows": rows, "failed": failed}
@@ -0,0 +1,158 @@
+"""Local stand-in for the upstream APIs, replaying recorded responses.
+
+    python -m mbwind.fake_upstream [port]
+
+Serves the Open-Meteo forecast, the CO-OPS products and the NWS zone
+forecast from data/recorded, re-dated so the recorded day is today, and
+prints the MBWIND_*_URL settings that point mbwind at it. Tests and
+benchmarks start it in-process with serve() and pass upstreams(server) to
+HttpClient (or set environ(server)), so nothing touches the network. A forecast
+request gets one location per coordinate pair asked for: the recorded
+inland payload east of INLAND_LON, the coastal one otherwise, with the
+recorded days repeated to cover forecast_days.
+"""
+import json
+import sys
+import threading
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import resources
+from urllib.parse import parse_qs, urlsplit
+
+from .sources.http import UPSTREAM_ENV
+
+# Day the fixtures were recorded on
+RECORDED = date(2025, 6, 1)
+INLAND_LON = -117.0
+# Upstreams served, by origin
+ORIGINS = ("https://api.open-meteo.com", "https://api.tidesandcurrents.noaa.gov", "https://api.weather.gov")
+ENV = tuple(UPSTREAM_ENV[origin] for origin in ORIGINS)
+
+
+def load(name: str) -> dict:
+    """A recorded response, as recorded."""
+    return json.loads(resources.files("mbwind").joinpath(f"data/recorded/{name}.json").read_text())
+
+
+def redate(stamp: str, days: int) -> str:
+    """Shift a timestamp starting with YYYY-MM-DD by whole days."""
+    day = date.fromisoformat(stamp[:10]) + timedelta(days=days)
+    return day.isoformat() + stamp[10:]
+
+
+class Recorded:
+    """The fixtures, re-dated by days."""
+
+    def __init__(self, days: int):
+        self.days = days
+        forecast = load("open_meteo_forecast")
+        for payload in forecast.values():
+            payload["hourly"]["time"] = [redate(t, days) for t in payload["hourly"]["time"]]
+        self.forecast = forecast
+        self.coops = {}
+        for name in ("wind_series", "water_level_series", "predictions"):
+            data = load(f"coops_{name}")
+            key = "predictions" if name == "predictions" else "data"
+            for row in data[key]:
+                row["t"] = redate(row["t"], days)
+            self.coops[name] = data
+        zone = load("nws_zone_forecast")
+        for period in zone["properties"]["periods"]:
+            period["startTime"] = redate(period["startTime"], days)
+            period["endTime"] = redate(period["endTime"], days)
+        zone["properties"]["updated"] = redate(zone["properties"]["updated"], days)
+        self.zone = zone
+
+    def open_meteo(self, query: dict) -> dict | list:
+        hours = int(query.get("forecast_days", 2)) * 24
+        payloads = []
+        for lat, lon in zip(query["latitude"].split(","), query["longitude"].split(",")):
+            payload = self.forecast["inland" if float(lon) > INLAND_LON else "coastal"]
+            payloads.append({
+                **payload, "latitude": float(lat), "longitude": float(lon),
+                "hourly": _extend(payload["hourly"], hours),
+            })
+        return payloads[0] if len(payloads) == 1 else payloads
+
+    def coops_product(self, query: dict) -> dict:
+        product = query["product"]
+        if product == "predictions":
+            return self.coops["predictions"]
+        series = self.coops["wind_series" if product == "wind" else "water_level_series"]
+        if query.get("date") == "latest":
+            return {**series, "data": series["data"][-1:]}
+        begin, end = (_coops_time(query[k]) for k in ("begin_date", "end_date"))
+        rows = [row for row in series["data"] if begin <= row["t"] <= end]
+        if not rows:
+            return {"error": {"message": "No data was found. This product may not be offered at this station at the requested time."}}
+        return {**series, "data": rows}
+
+
+def _extend(hourly: dict, hours: int) -> dict:
+    """hourly cut or cycled to the given number of hours."""
+    start = datetime.fromisoformat(hourly["time"][0])
+    recorded = len(hourly["time"])
+    extended = {k: [v[i % recorded] for i in range(hours)] for k, v in hourly.items() if k != "time"}
+    extended["time"] = [(start + timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M") for i in range(hours)]
+    return extended
+
+
+def _coops_time(value: str) -> str:
+    # CO-OPS takes "YYYYmmdd HH:MM" and answers "YYYY-mm-dd HH:MM"
+    return datetime.strptime(value, "%Y%m%d %H:%M").strftime("%Y-%m-%d %H:%M")
+
+
+def make_handler(recorded: Recorded):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+            if parts.path == "/v1/forecast" and "latitude" in query:
+                self._json(recorded.open_meteo(query))
+            elif parts.path == "/api/prod/datagetter" and "product" in query:
+                self._json(recorded.coops_product(query))
+            elif parts.path.startswith("/zones/forecast/"):
+                self._json(recorded.zone)
+            else:
+                self.send_error(404)
+
+        def _json(self, data) -> None:
+            body = json.dumps(data).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+    return Handler
+
+
+def serve(port: int = 0, today: date | None = None) -> ThreadingHTTPServer:
+    """Start the stub on a background thread; stop it with shutdown()."""
+    recorded = Recorded(((today or date.today()) - RECORDED).days)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(recorded))
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    return server
+
+
+def upstreams(server: ThreadingHTTPServer) -> dict[str, str]:
+    """HttpClient's upstreams argument pointing every served origin at server."""
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    return {origin: url for origin in ORIGINS}
+
+
+def environ(server: ThreadingHTTPServer) -> dict[str, str]:
+    """The MBWIND_*_URL settings pointing mbwind at server."""
+    return {UPSTREAM_ENV[origin]: url for origin, url in upstreams(server).items()}
+
+
+if __name__ == "__main__":
+    server = serve(int(sys.argv[1]) if len(sys.argv) > 1 else 8000)
+    for var, url in environ(server).items():
+        print(f"export {var}={url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
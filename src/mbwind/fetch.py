@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING
+
+from .spots import get_spot
+from .sources.open_meteo import fetch_forecasts
+from .sources.noaa import (
+    fetch_tide_data, fetch_tide_predictions, fetch_wind_observation, fetch_marine_forecast,
+    fetch_wind_series, fetch_water_level_series,
+)
+
+if TYPE_CHECKING:
+    from .sources.http import HttpClient
+
+# Per-request timeout and the overall budget for a whole run
+REQUEST_TIMEOUT = 10.0
+DEADLINE = 15.0
+# How long optional sources may keep running once the critical data is in
+OPTIONAL_GRACE = 3.0
+# How often long-running modes (serve) refresh upstream data
+REFRESH_INTERVAL = 10 * 60
+
+# Optional sources, fetched once per NOAA station or NWS zone; they degrade
+# to a default value when slow or failing
+STATION_SOURCES = {
+    "tide_data": fetch_tide_data,
+    "tide_predictions": fetch_tide_predictions,
+    "observed_wind": fetch_wind_observation,
+}
+ZONE_SOURCES = {
+    "marine_forecast": fetch_marine_forecast,
+}
+# When the caller keeps history, wind and water level are polled as 6-minute
+# series from the last stored reading, replacing the single latest readings
+SERIES_SOURCES = {
+    "wind_series": fetch_wind_series,
+    "water_level_series": fetch_water_level_series,
+}
+LATEST_SOURCES = ("tide_data", "observed_wind")
+# How far back a series poll reaches when nothing (recent) is stored
+SERIES_WINDOW_HOURS = 6
+
+OPTIONAL_DEFAULTS = {
+    "tide_data": None,
+    "tide_predictions": [],
+    "observed_wind": None,
+    "marine_forecast": None,
+    "wind_series": [],
+    "water_level_series": [],
+}
+
+LABELS = {
+    "forecasts": "Open-Meteo forecast",
+}
+
+# Points closer than this (degrees) share one Open-Meteo grid cell
+GRID_DECIMALS = 2
+
+
+def grid_cell(point: tuple[float, float]) -> str:
+    """Key shared by every point that falls in the same grid cell."""
+    return f"{round(point[0], GRID_DECIMALS)},{round(point[1], GRID_DECIMALS)}"
+
+
+def series_begin(last: datetime | None, now: datetime | None = None) -> datetime:
+    """Where the next series poll starts: just after the last stored reading,
+    but no more than SERIES_WINDOW_HOURS back."""
+    earliest = (now or datetime.now()) - timedelta(hours=SERIES_WINDOW_HOURS)
+    if last is None:
+        return earliest
+    return max(earliest, last + timedelta(minutes=1))
+
+
+class FetchError(Exception):
+    """A critical source failed or missed the deadline."""
+
+    def __init__(self, source: str, error: BaseException):
+        self.source = source
+        self.error = error
+        super().__init__(f"Error fetching {LABELS.get(source, source)}: {error}")
+
+
+async def _gather(client: HttpClient, critical: dict, optional: dict, deadline: float, optional_grace: float) -> dict:
+    """Run critical and optional fetches concurrently under one deadline.
+
+    Both arguments map a key to a coroutine function taking the client.
+    Returns results for every critical key and for the optional keys that
+    succeeded in time; raises FetchError if a critical fetch fails or misses
+    the deadline. Optional fetches still running once the critical data is
+    in and the grace period (or deadline) has passed are cancelled."""
+    import asyncio  # deferred with httpx so `mbwind --help` stays fast
+
+    loop = asyncio.get_running_loop()
+    end = loop.time() + deadline
+    tasks = {key: asyncio.create_task(fn(client)) for key, fn in {**critical, **optional}.items()}
+
+    try:
+        await asyncio.wait([tasks[key] for key in critical], timeout=deadline, return_when=asyncio.FIRST_EXCEPTION)
+        results = {}
+        for key in critical:
+            task = tasks[key]
+            if not task.done():
+                raise FetchError(key, TimeoutError(f"no response within {deadline:.0f}s"))
+            if task.exception() is not None:
+                raise FetchError(key, task.exception())
+            results[key] = task.result()
+
+        remaining = min(end, loop.time() + optional_grace) - loop.time()
+        if optional and remaining > 0:
+            await asyncio.wait([tasks[key] for key in optional], timeout=remaining)
+        for key in optional:
+            task = tasks[key]
+            if task.done() and task.exception() is None:
+                results[key] = task.result()
+        return results
+    finally:
+        for task in tasks.values():
+            if not task.done():
+                task.cancel()
+        # Let cancelled tasks unwind and retrieve exceptions so none go unobserved
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+
+async def fetch_spots(
+    client: HttpClient,
+    spots: list[dict],
+    deadline: float = DEADLINE,
+    optional_grace: float = OPTIONAL_GRACE,
+    since: dict[tuple[str, str], datetime | None] | None = None,
+) -> dict[str, dict]:
+    """Fetch data for several spots, sharing upstream requests between them.
+
+    Coastal and inland points are deduplicated by grid cell and fetched in
+    one Open-Meteo request; NOAA products are fetched once per tide station
+    and marine forecasts once per zone. Returns, per spot id, the same shape
+    as fetch_all, with "stale" set to client.take_stale() when expired
+    cache entries stood in for upstreams that could not be reached.
+
+    since switches stations to incremental polling: it maps (series kind,
+    station) to the last reading already stored, and only newer readings
+    are fetched, into "wind_series" and "water_level_series". tide_data and
+    observed_wind are then left at None for the caller to fill from its
+    store."""
+    points = {}
+    for spot in spots:
+        for point in (spot["coastal"], spot["inland"]):
+            points.setdefault(grid_cell(point), point)
+
+    optional = {}
+    for spot in spots:
+        station = spot["tide_station"]
+        if station:
+            for kind, fn in STATION_SOURCES.items():
+                if since is None or kind not in LATEST_SOURCES:
+                    optional[(kind, station)] = partial(fn, station=station)
+            if since is not None:
+                for kind, fn in SERIES_SOURCES.items():
+                    begin = series_begin(since.get((kind, station)))
+                    optional[(kind, station)] = partial(fn, station=station, begin=begin)
+        if spot["marine_zone"]:
+            for kind, fn in ZONE_SOURCES.items():
+                optional[(kind, spot["marine_zone"])] = partial(fn, zone=spot["marine_zone"])
+
+    critical = {"forecasts": partial(fetch_forecasts, points=points)}
+    results = await _gather(client, critical, optional, deadline, optional_grace)
+
+    forecasts = results["forecasts"]
+    stale = client.take_stale()
+    by_spot = {}
+    for spot in spots:
+        data = {
+            "forecasts": {
+                "coastal": forecasts[grid_cell(spot["coastal"])],
+                "inland": forecasts[grid_cell(spot["inland"])],
+            },
+            "stale": stale,
+        }
+        for kind in (*STATION_SOURCES, *SERIES_SOURCES):
+            data[kind] = results.get((kind, spot["tide_station"]), OPTIONAL_DEFAULTS[kind])
+        for kind in ZONE_SOURCES:
+            data[kind] = results.get((kind, spot["marine_zone"]), OPTIONAL_DEFAULTS[kind])
+        by_spot[spot["id"]] = data
+    return by_spot
+
+
+async def fetch_all(
+    client: HttpClient | None = None,
+    deadline: float = DEADLINE,
+    optional_grace: float = OPTIONAL_GRACE,
+    spot: dict | None = None,
+) -> dict:
+    """Fetch every source for one spot (Mission Bay by default) concurrently.
+
+    Returns results keyed by source name. Raises FetchError if the forecast
+    fails or misses the deadline; NOAA sources that fail or are too slow
+    fall back to their default value. Pass a long-lived client to reuse its
+    connection pool across runs."""
+    if client is None:
+        from .sources.http import HttpClient
+
+        async with HttpClient(timeout=REQUEST_TIMEOUT) as owned:
+            return await fetch_all(owned, deadline, optional_grace, spot)
+    spot = spot or get_spot()
+    return (await fetch_spots(client, [spot], deadline, optional_grace))[spot["id"]]
+
+
+def fetch_all_sync(
+    deadline: float = DEADLINE,
+    optional_grace: float = OPTIONAL_GRACE,
+    spots: list[dict] | None = None,
+    since: dict[tuple[str, str], datetime | None] | None = None,
+    **client_options,
+) -> dict:
+    """Blocking wrapper for the CLI.
+
+    Fetches one spot's data (Mission Bay by default) or, given spots, every
+    spot's data keyed by id as fetch_spots does (since as there). Extra
+    keyword arguments configure the HttpClient (e.g. http2=True)."""
+    import asyncio
+
+    from .sources.http import HttpClient
+
+    async def run():
+        async with HttpClient(timeout=REQUEST_TIMEOUT, **client_options) as client:
+            if spots is not None:
+                return await fetch_spots(client, spots, deadline, optional_grace, since)
+            return await fetch_all(client, deadline, optional_grace)
+    return asyncio.run(run())
@@ -0,0 +1,145 @@
+"""Nowcast: correct the next few forecast hours with the observed bias.
+
+Each NOAA reading is compared with the forecast wind for the same minute
+(interpolated between forecast hours). The error feeds an exponentially
+weighted bias estimate, updated in O(1) per reading, whose state is kept
+in the history store, so every run only processes readings it has not
+seen. The bias is added to the coastal forecast's wind and gusts for the
+next NOWCAST_HOURS, fading out with lead time, before anything is scored.
+"""
+import json
+import math
+from datetime import datetime, timedelta
+
+from .fetch import grid_cell
+from .sources.forecast import Forecast
+from .store import HistoryStore
+
+# Weight of a reading in the bias estimate halves every this many hours
+HALF_LIFE_HOURS = 1.0
+# How far ahead the correction reaches, and how fast it fades
+NOWCAST_HOURS = 6
+CORRECTION_HALF_LIFE_HOURS = 2.0
+# No correction from readings older than this, or from a single reading
+MAX_AGE_HOURS = 2.0
+MIN_WEIGHT = 1.5
+# Readings considered on a first run, with no stored state
+WINDOW_HOURS = 6
+
+
+class BiasEstimate:
+    """Exponentially weighted mean of observed minus forecast wind (knots).
+
+    The weight of earlier readings decays with the time between readings,
+    so irregular polling is handled; weight is the effective number of
+    readings behind the estimate."""
+
+    def __init__(self, bias: float = 0.0, weight: float = 0.0, last_time: datetime | None = None):
+        self.bias = bias
+        self.weight = weight
+        self.last_time = last_time
+
+    def update(self, t: datetime, observed: float, forecast: float) -> None:
+        if self.last_time is not None:
+            hours = (t - self.last_time).total_seconds() / 3600
+            self.weight *= 0.5 ** (max(hours, 0.0) / HALF_LIFE_HOURS)
+        self.weight += 1.0
+        self.bias += (observed - forecast - self.bias) / self.weight
+        self.last_time = t
+
+    def correction(self, lead_hours: float) -> float:
+        """Bias to add lead_hours after the last reading."""
+        if lead_hours > NOWCAST_HOURS:
+            return 0.0
+        return self.bias * 0.5 ** (max(lead_hours, 0.0) / CORRECTION_HALF_LIFE_HOURS)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "bias": self.bias,
+            "weight": self.weight,
+            "last_time": self.last_time.isoformat(timespec="minutes") if self.last_time else None,
+        })
+
+    @classmethod
+    def from_json(cls, raw: str | None) -> "BiasEstimate":
+        if not raw:
+            return cls()
+        state = json.loads(raw)
+        last = datetime.fromisoformat(state["last_time"]) if state["last_time"] else None
+        return cls(state["bias"], state["weight"], last)
+
+
+def forecast_at(forecast: Forecast, t: datetime, name: str = "wind_kts") -> float | None:
+    """Forecast value at t, interpolated linearly between the hours around it."""
+    i = forecast.index(t.date(), t.hour)
+    if i is None:
+        return None
+    value = forecast.value(name, i)
+    frac = t.minute / 60
+    if value is None or frac == 0 or i + 1 >= len(forecast):
+        return value
+    following = forecast.value(name, i + 1)
+    if following is None:
+        return value
+    return value + (following - value) * frac
+
+
+def apply_correction(forecast: Forecast, estimate: BiasEstimate, start: datetime) -> Forecast:
+    """A copy of forecast with the estimate's fading correction added to wind
+    and gusts for hours from start (wind never below zero)."""
+    columns = dict(forecast.columns)
+    for name in ("wind_kts", "gusts_kts"):
+        if name not in columns:
+            continue
+        col = columns[name][:]
+        for i, t in enumerate(forecast.times):
+            lead = (t - estimate.last_time).total_seconds() / 3600
+            if t < start or lead > NOWCAST_HOURS or math.isnan(col[i]):
+                continue
+            col[i] = max(0.0, col[i] + estimate.correction(lead))
+        columns[name] = col
+    return Forecast(forecast.times, columns, forecast.meta)
+
+
+def nowcast_spot(store: HistoryStore, spot: dict, data: dict, now: datetime | None = None) -> dict | None:
+    """Update the spot's bias estimate with new readings and correct its
+    coastal forecast in data (one fetch_spots entry) in place.
+
+    Returns a summary (bias_kts, readings, as_of), also set as
+    data["nowcast"], or None when there is no fresh estimate to apply."""
+    station = spot["tide_station"]
+    if not station:
+        return None
+    now = now or datetime.now()
+    coastal = data["forecasts"]["coastal"]
+    key = f"nowcast:{station}:{grid_cell(spot['coastal'])}"
+    estimate = BiasEstimate.from_json(store.get_meta(key))
+
+    start = now - timedelta(hours=WINDOW_HOURS)
+    if estimate.last_time is not None and estimate.last_time > start:
+        start = estimate.last_time + timedelta(minutes=1)
+    for t, observed, _, _ in store.observations_since(station, start.isoformat(timespec="minutes")):
+        t = datetime.fromisoformat(t)
+        predicted = forecast_at(coastal, t)
+        if observed is None or predicted is None or t > now:
+            continue
+        estimate.update(t, observed, predicted)
+    store.set_meta(key, estimate.to_json())
+
+    if estimate.last_time is None or estimate.weight < MIN_WEIGHT:
+        return None
+    if (now - estimate.last_time).total_seconds() / 3600 > MAX_AGE_HOURS:
+        return None
+    data["forecasts"]["coastal"] = apply_correction(coastal, estimate, now.replace(minute=0, second=0, microsecond=0))
+    data["nowcast"] = {
+        "bias_kts": round(estimate.bias, 1),
+        "readings": round(estimate.weight, 1),
+        "as_of": estimate.last_time.isoformat(timespec="minutes"),
+    }
+    return data["nowcast"]
+
+
+def nowcast_spots(store: HistoryStore, spots: list[dict], data: dict[str, dict], now: datetime | None = None) -> None:
+    """nowcast_spot for every spot in fetch_spots' result, after record_run."""
+    for spot in spots:
+        nowcast_spot(store, spot, data[spot["id"]], now)
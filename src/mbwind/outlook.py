@@ -0,0 +1,126 @@
+"""Multi-day outlook: every daylight hour of up to 16 forecast days.
+
+The coastal and inland forecasts for the whole horizon come from one
+Open-Meteo request. Every daylight hour of every day is scored for every
+sport in a single batch call, with the thermal gradient taken per hour
+against the inland forecast for the same hour, and each day then gets its
+best window. Both steps are linear in days x hours.
+"""
+from __future__ import annotations
+
+import math
+from datetime import date
+from typing import TYPE_CHECKING
+
+from . import timing
+from .batch import score_batch_sports, to_list
+from .fetch import REQUEST_TIMEOUT
+from .sources.forecast import Forecast
+from .sources.open_meteo import fetch_forecasts
+from .sources.thermal import marine_layer_suppression
+from .timeline import DAYLIGHT, WINDOW_HOURS, best_window
+
+if TYPE_CHECKING:
+    from .sources.http import HttpClient
+
+NAN = math.nan
+
+
+def outlook_columns(
+    coastal: Forecast,
+    inland: Forecast,
+    days: list[date],
+    hours=DAYLIGHT,
+) -> tuple[list[tuple[date, int]], dict[str, list]]:
+    """Flatten the given hours of each day into scorer-ready columns.
+
+    Returns the (day, hour) of each value, in order, and the columns."""
+    keys = []
+    cols = {k: [] for k in ("wind_kts", "wind_dir", "gusts_kts", "thermal_delta_f", "marine_layer", "hour")}
+    nan_column = [NAN] * len(coastal)
+    temp = coastal.columns.get("temp_f", nan_column)
+    dewpoint = coastal.columns.get("dewpoint_f", nan_column)
+    inland_temp = inland.columns.get("temp_f", [NAN] * len(inland))
+    for day in days:
+        for i in coastal.day_range(day):
+            hour = coastal.times[i].hour
+            if hour not in hours:
+                continue
+            j = inland.index(day, hour)
+            t, d = temp[i], dewpoint[i]
+            keys.append((day, hour))
+            cols["wind_kts"].append(coastal.columns["wind_kts"][i])
+            cols["wind_dir"].append(coastal.columns["wind_dir"][i])
+            cols["gusts_kts"].append(coastal.columns["gusts_kts"][i])
+            cols["thermal_delta_f"].append(round(inland_temp[j] - t, 1) if j is not None else NAN)
+            cols["marine_layer"].append(0.0 if math.isnan(t) or math.isnan(d) else marine_layer_suppression(t, d))
+            cols["hour"].append(hour)
+    return keys, cols
+
+
+def score_outlook(
+    coastal: Forecast,
+    inland: Forecast,
+    days: list[date],
+    sports=("laser",),
+    window: int = WINDOW_HOURS,
+    direction_sectors=None,
+    backend: str = "auto",
+) -> dict[str, list[dict]]:
+    """Score the daylight hours of each day for each sport.
+
+    Returns, per sport, one entry per day with its date, hours (hour,
+    score, recommendation, wind_kts; hours without wind are left out) and
+    best window."""
+    keys, cols = outlook_columns(coastal, inland, days)
+    result = {sport: [] for sport in sports}
+    if not keys:
+        return result
+    scored = score_batch_sports(
+        cols["wind_kts"], cols["wind_dir"], cols["gusts_kts"],
+        cols["thermal_delta_f"], cols["marine_layer"], cols["hour"],
+        sports=sports, backend=backend, direction_sectors=direction_sectors,
+    )
+    by_day = {day: [] for day in days}
+    for n, (day, _) in enumerate(keys):
+        by_day[day].append(n)
+    for sport in sports:
+        scores = to_list(scored[sport]["score"])
+        recs = to_list(scored[sport]["recommendation"])
+        for day, indices in by_day.items():
+            hours = [
+                {"hour": keys[n][1], "score": scores[n], "recommendation": recs[n], "wind_kts": round(cols["wind_kts"][n], 1)}
+                for n in indices if not math.isnan(cols["wind_kts"][n])
+            ]
+            result[sport].append({"date": day.isoformat(), "hours": hours, "best_window": best_window(hours, window)})
+    return result
+
+
+async def fetch_outlook(client: HttpClient, spot: dict, days: int) -> dict[str, Forecast]:
+    """Coastal and inland forecasts for a spot over days, in one request."""
+    return await fetch_forecasts(client, {"coastal": spot["coastal"], "inland": spot["inland"]}, days=days)
+
+
+def run_outlook(spot: dict, days: int, sports=("laser",), window: int = WINDOW_HOURS, **client_options) -> dict:
+    """Blocking fetch-and-score for the CLI. Extra keyword arguments configure
+    the HttpClient."""
+    import asyncio
+
+    from .sources.http import HttpClient
+
+    async def fetch():
+        async with HttpClient(timeout=REQUEST_TIMEOUT, **client_options) as client:
+            return await fetch_outlook(client, spot, days), client.take_stale()
+    with timing.span("fetch"):
+        forecasts, stale = asyncio.run(fetch())
+    with timing.span("score"):
+        covered = forecasts["coastal"].days()[:days]
+        scored = score_outlook(forecasts["coastal"], forecasts["inland"], covered, sports, window, spot["directions"])
+    return {
+        "spot": spot["id"],
+        "spot_name": spot["name"],
+        "days": len(covered),
+        "window": window,
+        "stale": stale,
+        "sports": scored,
+    }
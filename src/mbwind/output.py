@@ -0,0 +1,268 @@
+"""Plain-text, JSON, NDJSON and CSV output, for scripts, cron and status bars.
+
+Nothing here imports rich, so these paths start fast.
+"""
+import json
+from datetime import date, datetime
+
+import click
+
+from .score import direction_name
+from .timeline import DAYLIGHT
+
+
+def fmt_hour(hour: int) -> str:
+    return f"{hour % 12 or 12}{'pm' if hour % 24 >= 12 else 'am'}"
+
+
+def _wind(report: dict) -> str:
+    if report["wind_kts"] is None:
+        return "? kts"
+    dir_name = direction_name(report["wind_dir"]) if report["wind_dir"] is not None else "?"
+    gust = f" (gusts {report['gust_kts']:.0f})" if report["gust_kts"] else ""
+    return f"{report['wind_kts']:.0f} kts {dir_name}{gust}"
+
+
+def trend_text(trend: dict | None) -> str:
+    """E.g. "building +3.0 kts over 2h"; empty without a trend."""
+    if not trend:
+        return ""
+    return f"{trend['trend']} {trend['change_kts']:+.1f} kts over {trend['hours']:g}h"
+
+
+def nowcast_text(nowcast: dict | None) -> str:
+    """E.g. "+1.8 kts from NOAA readings to 12:54"; empty without a nowcast."""
+    if not nowcast:
+        return ""
+    return f"{nowcast['bias_kts']:+.1f} kts from NOAA readings to {nowcast['as_of'][11:16]}"
+
+
+def marine_text(period: dict | None) -> str:
+    """E.g. "Tonight: W 10-15 kt (gusts 25), seas 4 ft, W swell 5 ft at 10s";
+    the period's own text when nothing in it was parsed, empty without one."""
+    if not period:
+        return ""
+    parts = []
+    if period["wind_max_kts"] is not None:
+        speed = period["wind_max_kts"]
+        if period["wind_min_kts"] != speed:
+            speed = f"{period['wind_min_kts']}-{speed}"
+        gusts = f" (gusts {period['gust_kts']})" if period["gust_kts"] else ""
+        parts.append(f"{period['wind_dir'] or 'variable'} {speed} kt{gusts}")
+    if period["seas_ft"] is not None:
+        parts.append(f"seas {period['seas_ft']} ft")
+    parts.extend(f"{s['direction']} swell {s['height_ft']} ft at {s['period_s']}s" for s in period["swell"])
+    return f"{period['name']}: {', '.join(parts) or period['text']}"
+
+
+def stale_text(stale: dict | None, now: datetime | None = None) -> str:
+    """E.g. "Offline: Open-Meteo, NWS data from Oct 16 14:05 (21h old)";
+    empty when the data is current."""
+    if not stale:
+        return ""
+    as_of = datetime.fromisoformat(stale["as_of"])
+    hours = ((now or datetime.now()) - as_of).total_seconds() / 3600
+    age = f"{hours:.0f}h" if hours >= 1 else f"{hours * 60:.0f} min"
+    return f"Offline: {', '.join(stale['sources'])} data from {as_of:%b} {as_of.day} {as_of:%H:%M} ({age} old)"
+
+
+def _strip(report: dict, timeline: bool) -> dict:
+    return report if timeline else {k: v for k, v in report.items() if k != "timeline"}
+
+
+def print_json(reports: dict | list[dict], timeline: bool = False) -> None:
+    """One JSON document: a report object, or a list of them."""
+    if isinstance(reports, list):
+        click.echo(json.dumps([_strip(r, timeline) for r in reports]))
+    else:
+        click.echo(json.dumps(_strip(reports, timeline)))
+
+
+# CSV columns for a report: the same for every run, so files can be appended
+# to and loaded without sniffing; nested fields are flattened as parent_child
+REPORT_COLUMNS = (
+    "spot", "sport", "date", "hour", "score", "recommendation",
+    "breakdown_wind_speed", "breakdown_direction", "breakdown_thermal", "breakdown_gust_factor",
+    "breakdown_time_of_day", "breakdown_marine_layer_penalty",
+    "wind_kts", "wind_dir", "gust_kts",
+    "thermal_coastal_temp_f", "thermal_inland_temp_f", "thermal_delta_f", "thermal_strength",
+    "marine_layer", "tide",
+    "observed_wind_speed_kts", "observed_wind_gust_kts", "observed_wind_direction", "observed_wind_direction_deg",
+    "observed_wind_time",
+    "observed_trend_trend", "observed_trend_change_kts", "nowcast_bias_kts",
+    "best_window_start_hour", "best_window_end_hour", "best_window_mean_score",
+    "stale_as_of", "breakdown_advisory_penalty",
+    "marine_forecast_advisory", "marine_forecast_wind_min_kts", "marine_forecast_wind_max_kts",
+    "marine_forecast_seas_ft",
+)
+
+
+def flatten(record: dict, prefix: str = "") -> dict:
+    """Nested dicts as prefix_key fields; lists are left out."""
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}_"))
+        elif not isinstance(value, list):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def print_csv(rows: list[dict], columns=None, header: bool = True) -> None:
+    """Rows as CSV on stdout; columns default to every key seen, in order."""
+    import csv
+
+    if columns is None:
+        columns = list(dict.fromkeys(k for row in rows for k in row))
+    writer = csv.DictWriter(click.get_text_stream("stdout"), columns, extrasaction="ignore", lineterminator="\n")
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+
+
+def print_records(reports: list[dict], fmt: str, timeline: bool = False, header: bool = True) -> None:
+    """Reports as NDJSON (one per line) or CSV (a row per report, or with
+    timeline a row per hour of each report's timeline)."""
+    if fmt == "ndjson":
+        for report in reports:
+            click.echo(json.dumps(_strip(report, timeline)))
+    elif timeline:
+        print_csv([_tagged(r, row) for r in reports for row in r["timeline"]], header=header)
+    else:
+        print_csv([flatten(r) for r in reports], REPORT_COLUMNS, header)
+
+
+def print_rows(result: dict, rows: list[dict], fmt: str) -> None:
+    """Hourly rows of an ensemble or outlook result, tagged with its spot,
+    as NDJSON or CSV."""
+    rows = [{"spot": result["spot"], **row} for row in rows]
+    if fmt == "ndjson":
+        for row in rows:
+            click.echo(json.dumps(row))
+    else:
+        print_csv(rows)
+
+
+def _tagged(report: dict, row: dict) -> dict:
+    return {"spot": report["spot"], "sport": report["sport"], "date": report["date"], **row}
+
+
+def print_plain(report: dict, timeline: bool = False) -> None:
+    thermal = report["thermal"]
+    best = report["best_window"]
+    click.echo(f"{report['spot_name']}: {report['score']}/100 {report['recommendation']}")
+    if report.get("stale"):
+        click.echo(stale_text(report["stale"]))
+    click.echo(f"Wind: {_wind(report)}")
+    obs = report["observed_wind"]
+    if obs:
+        trend = f", {trend_text(report['observed_trend'])}" if report["observed_trend"] else ""
+        click.echo(f"Observed: {obs['speed_kts'] or '?'} kts {obs['direction']} (NOAA {obs['time']}){trend}")
+    if report["nowcast"]:
+        click.echo(f"Nowcast: {nowcast_text(report['nowcast'])}")
+    click.echo(
+        f"Thermal: {thermal['strength']} (coastal {thermal['coastal_temp_f']:.0f}F, "
+        f"inland {thermal['inland_temp_f']:.0f}F, delta {thermal['delta_f']:.0f}F)"
+    )
+    click.echo(f"Tide: {report['tide']}")
+    if report["marine_forecast"]:
+        click.echo(f"Marine: {marine_text(report['marine_forecast'])}")
+        if report["marine_forecast"]["advisory"]:
+            click.echo(f"{report['marine_forecast']['advisory']} in effect (-{report['breakdown']['advisory_penalty']:g})")
+    click.echo(f"Best window: {fmt_hour(best['start_hour'])} - {fmt_hour(best['end_hour'])}")
+    click.echo(f"{report['sport'].capitalize()} tip: {report['tip']}")
+    if timeline:
+        for row in report["timeline"]:
+            wind = f"{row['wind_kts']:.0f}" if row["wind_kts"] is not None else "?"
+            click.echo(f"  {fmt_hour(row['hour']):>4}  {wind:>3} kts  {row['score']:>3}  {row['recommendation']}")
+
+
+def print_plain_sports(reports: list[dict], timeline: bool = False) -> None:
+    """One spot's reports for several sports side by side: the shared
+    conditions once, then a line per sport (and a score column per sport
+    in the timeline)."""
+    first = reports[0]
+    thermal = first["thermal"]
+    click.echo(f"{first['spot_name']} at {fmt_hour(first['hour'])}: {_wind(first)}")
+    if first.get("stale"):
+        click.echo(stale_text(first["stale"]))
+    click.echo(f"Thermal: {thermal['strength']} (delta {thermal['delta_f']:.0f}F), tide: {first['tide']}")
+    width = max(len(r["sport"]) for r in reports)
+    for r in reports:
+        best = r["best_window"]
+        click.echo(
+            f"  {r['sport'].capitalize():<{width}}  {r['score']:>3}/100 {r['recommendation']:<5}  "
+            f"best {fmt_hour(best['start_hour'])}-{fmt_hour(best['end_hour'])}  {r['tip']}"
+        )
+    if timeline:
+        click.echo(f"  {'':>4}  {'':>7}" + "".join(f"  {r['sport'][:width]:>{width}}" for r in reports))
+        for rows in zip(*(r["timeline"] for r in reports)):
+            wind = f"{rows[0]['wind_kts']:.0f}" if rows[0]["wind_kts"] is not None else "?"
+            click.echo(f"  {fmt_hour(rows[0]['hour']):>4}  {wind:>3} kts" + "".join(f"  {row['score']:>{width}}" for row in rows))
+
+
+def print_plain_spots(reports: list[dict]) -> None:
+    if reports and reports[0].get("stale"):
+        click.echo(stale_text(reports[0]["stale"]))
+    for rank, r in enumerate(reports, 1):
+        click.echo(f"{rank}. {r['spot_name']}: {r['score']}/100 {r['recommendation']}, {_wind(r)}")
+
+
+def print_plain_ensemble(result: dict) -> None:
+    click.echo(f"{result['spot_name']} {result['sport']} ensemble, {result['members']} members ({', '.join(result['models'])})")
+    if result.get("stale"):
+        click.echo(stale_text(result["stale"]))
+    for row in result["hours"]:
+        click.echo(
+            f"  {fmt_hour(row['hour']):>4}  P(GO) {row['p_go']:>4.0%}  median {row['median']:>3}  "
+            f"10-90% {row['p10']}-{row['p90']}  {row['recommendation']}"
+        )
+    best = result.get("best_window")
+    if best:
+        click.echo(f"Best window: {fmt_hour(best['start_hour'])} - {fmt_hour(best['end_hour'])} (median {best['mean_score']})")
+
+
+def print_plain_outlook(result: dict) -> None:
+    """One line per day: the score of each daylight hour, then the best window."""
+    hours = list(DAYLIGHT)
+    if result.get("stale"):
+        click.echo(stale_text(result["stale"]))
+    for sport, days in result["sports"].items():
+        click.echo(f"{result['spot_name']} {sport} outlook, {result['days']} days")
+        click.echo(f"  {'':<10}" + "".join(f"{h % 12 or 12:>4}" for h in hours))
+        for day in days:
+            scores = {row["hour"]: row["score"] for row in day["hours"]}
+            d = date.fromisoformat(day["date"])
+            line = f"  {d:%a %b} {d.day:<2}" + "".join(f"{scores[h]:>4}" if h in scores else "   -" for h in hours)
+            best = day["best_window"]
+            if best:
+                line += f"  best {fmt_hour(best['start_hour'])}-{fmt_hour(best['end_hour'])} ({best['mean_score']})"
+            click.echo(line)
+
+
+# Top-level phases first, then each upstream's request broken down
+PROFILE_PHASES = (
+    "fetch", "history", "score", "render",
+    "request", "queue", "cache_read", "connect", "tls", "send", "wait", "transfer", "parse",
+)
+
+
+def print_profile(profile) -> None:
+    """A timing.Profile as a table on stderr, so it never mixes with reports."""
+    def order(row):
+        name = row["name"]
+        return (row["source"] != "", row["source"], PROFILE_PHASES.index(name) if name in PROFILE_PHASES else len(PROFILE_PHASES))
+
+    rows = sorted(profile.summary(), key=order)
+    width = max([len(r["source"]) for r in rows] + [len(s) for _, s in profile.counters] + [6])
+    wall = profile.to_json()["wall_seconds"]
+    click.echo(f"Profile: {wall * 1e3:.1f} ms wall", err=True)
+    click.echo(f"  {'phase':<10} {'source':<{width}} {'calls':>5} {'total ms':>9} {'max ms':>8}", err=True)
+    for r in rows:
+        click.echo(
+            f"  {r['name']:<10} {r['source'] or '-':<{width}} {r['count']:>5} "
+            f"{r['seconds'] * 1e3:>9.1f} {r['max_seconds'] * 1e3:>8.1f}",
+            err=True,
+        )
+    for (name, source), value in sorted(profile.counters.items(), key=lambda kv: (kv[0][1], kv[0][0])):
+        click.echo(f"  {name:<10} {source or '-':<{width}} {value:>5}", err=True)
@@ -0,0 +1,97 @@
+"""Scoring profiles: the threshold tables behind every scoring factor.
+
+Each factor is a step function: a value scores points[k], where k is the
+number of ascending edges it has reached (x >= edge), so one bisect finds
+it. The bundled tables live in data/profiles.json: shared "factors", and
+per-sport wind_speed and gust_factor tables, the observed wind ranges a
+backtest counts as GO and MAYBE, and the tips shown per wind range. The
+"advisory" factor is not a step table but the points taken off for each
+NWS marine advisory in effect. Adding a sport is an entry under "sports".
+A file named by MBWIND_PROFILES is merged over the bundled one.
+"""
+import json
+import os
+from importlib import resources
+from pathlib import Path
+
+
+def step_table(raw: dict, name: str) -> tuple[tuple, tuple]:
+    """Validate and compile {"edges": [...], "points": [...]}."""
+    edges, points = raw["edges"], raw["points"]
+    if len(points) != len(edges) + 1:
+        raise ValueError(f"profile {name}: need exactly one more point than edges")
+    if any(a >= b for a, b in zip(edges, edges[1:])):
+        raise ValueError(f"profile {name}: edges must be strictly ascending")
+    return tuple(edges), tuple(points)
+
+
+def hour_table(raw: dict, name: str) -> tuple:
+    """Compile inclusive (from, to, points) hour ranges, first match wins,
+    into points for each hour 0-23."""
+    table = [raw["default"]] * 24
+    for lo, hi, points in reversed(raw["hours"]):
+        if not 0 <= lo <= hi <= 23:
+            raise ValueError(f"profile {name}: bad hour range {lo}-{hi}")
+        table[lo:hi + 1] = [points] * (hi - lo + 1)
+    return tuple(table)
+
+
+def tip_table(raw: list, name: str) -> tuple:
+    """Compile tip rules, first match wins, into (below, gusts_over, tip)
+    tuples; a rule without "below" (None) matches any wind speed, NaN
+    included."""
+    rules = []
+    for rule in raw:
+        if not isinstance(rule.get("tip"), str):
+            raise ValueError(f"profile {name}: every rule needs a tip")
+        rules.append((rule.get("below"), rule.get("gusts_over"), rule["tip"]))
+    return tuple(rules)
+
+
+def advisory_table(raw: dict) -> dict[str, float]:
+    """Compile advisory name -> penalty points, keyed by lowercased name."""
+    for name, points in raw.items():
+        if not isinstance(points, (int, float)) or points < 0:
+            raise ValueError(f"profile advisory: penalty for {name} must be a number >= 0")
+    return {name.lower(): points for name, points in raw.items()}
+
+
+def _compile(raw: dict) -> dict:
+    factors = raw["factors"]
+    sports = {}
+    for sport, entry in raw["sports"].items():
+        sports[sport] = {
+            "wind_speed": step_table(entry["wind_speed"], f"{sport}.wind_speed"),
+            "gust_factor": step_table(entry["gust_factor"], f"{sport}.gust_factor"),
+            "observed_go": tuple(entry["observed"]["go"]),
+            "observed_maybe": tuple(entry["observed"]["maybe"]),
+            "tips": tip_table(entry.get("tips", []), f"{sport}.tips"),
+        }
+    if not sports:
+        raise ValueError("profiles define no sports")
+    return {
+        "thermal": step_table(factors["thermal"], "thermal"),
+        "time_of_day": hour_table(factors["time_of_day"], "time_of_day"),
+        "time_of_day_default": factors["time_of_day"]["default"],
+        "marine_layer": step_table(factors["marine_layer"], "marine_layer"),
+        "thermal_strength": step_table(factors["thermal_strength"], "thermal_strength"),
+        "advisory": advisory_table(factors.get("advisory", {})),
+        "sports": sports,
+    }
+
+
+def load_profiles(path: str | Path | None = None) -> dict:
+    """Load and compile the scoring profiles.
+
+    path (default: $MBWIND_PROFILES, if set) names a JSON file whose
+    "factors" and "sports" entries replace or extend the bundled ones."""
+    raw = json.loads(resources.files("mbwind").joinpath("data/profiles.json").read_text())
+    path = path or os.environ.get("MBWIND_PROFILES")
+    if path:
+        extra = json.loads(Path(path).read_text())
+        raw["factors"].update(extra.get("factors", {}))
+        raw["sports"].update(extra.get("sports", {}))
+    return _compile(raw)
+
+
+PROFILES = load_profiles()
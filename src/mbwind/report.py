@@ -0,0 +1,109 @@
+"""Turn fetched source data into a scored report for one spot."""
+from datetime import datetime, time
+
+from .sources.open_meteo import get_hourly_at, find_best_window
+from .sources.noaa import classify_tide
+from .sources.nws import period_at
+from .sources.thermal import compute_thermal_gradient, marine_layer_suppression
+from .score import compute_confidence, sport_tip
+from .timeline import score_timeline_sports, best_window, SESSION_END, WINDOW_HOURS
+
+
+def build_report(
+    data: dict,
+    spot: dict,
+    hour: int,
+    target_date: datetime,
+    sport: str = "laser",
+    window: int = WINDOW_HOURS,
+) -> dict:
+    """Score one spot at the given hour from the data fetch_all returned."""
+    return build_reports(data, spot, hour, target_date, (sport,), window)[0]
+
+
+def build_reports(
+    data: dict,
+    spot: dict,
+    hour: int,
+    target_date: datetime,
+    sports=("laser",),
+    window: int = WINDOW_HOURS,
+) -> list[dict]:
+    """build_report for several sports, one report per sport in order.
+
+    The hour's conditions, tide and the day's timeline inputs are prepared
+    once; only the scoring is repeated per sport."""
+    coastal = data["forecasts"]["coastal"]
+    inland = data["forecasts"]["inland"]
+
+    coastal_now = get_hourly_at(coastal, hour, target_date)
+    inland_now = get_hourly_at(inland, hour, target_date)
+
+    # Thermal gradient
+    thermal = compute_thermal_gradient(coastal_now["temp_f"], inland_now["temp_f"])
+    ml_suppression = marine_layer_suppression(coastal_now["temp_f"], coastal_now["dewpoint_f"])
+
+    # NOAA data (non-critical, already defaulted if unavailable)
+    tide_data = data["tide_data"]
+    tide_str = classify_tide(
+        tide_data["water_level_ft"] if tide_data else None,
+        data["tide_predictions"],
+        data.get("tide_rate"),
+    )
+
+    # The NWS period covering the hour, for its advisory and sea state
+    marine = data["marine_forecast"]
+    period = period_at(marine, datetime.combine(target_date.date(), time(hour)))
+
+    timelines = score_timeline_sports(coastal, inland, target_date.date(), sports, spot["directions"], marine)
+    reports = []
+    for sport in sports:
+        result = compute_confidence(
+            wind_kts=coastal_now["wind_kts"],
+            wind_dir=coastal_now["wind_dir"],
+            gust_kts=coastal_now["gusts_kts"],
+            thermal_delta_f=thermal["delta_f"],
+            marine_layer_suppression=ml_suppression,
+            hour=hour,
+            sport=sport,
+            direction_sectors=spot["directions"],
+            advisory=period["advisory"] if period else None,
+        )
+
+        # Best window from the full per-hour model; the raw-wind peak is only a fallback
+        timeline = timelines[sport]
+        best = best_window(timeline, window)
+        if best is None:
+            start = find_best_window(coastal, target_date)["hour"]
+            best = {"start_hour": start, "end_hour": min(start + window, SESSION_END), "mean_score": None}
+
+        reports.append({
+            "spot": spot["id"],
+            "spot_name": spot["name"],
+            "sport": sport,
+            "date": target_date.date().isoformat(),
+            "hour": hour,
+            "score": result["score"],
+            "recommendation": result["recommendation"],
+            "breakdown": result["breakdown"],
+            "wind_kts": coastal_now["wind_kts"],
+            "wind_dir": coastal_now["wind_dir"],
+            "gust_kts": coastal_now["gusts_kts"],
+            "thermal": thermal,
+            "marine_layer": ml_suppression,
+            "tide": tide_str,
+            "observed_wind": data["observed_wind"],
+            "observed_trend": data.get("observed_trend"),
+            "nowcast": data.get("nowcast"),
+            "marine_forecast": period,
+            "stale": data.get("stale"),
+            "best_window": best,
+            "tip": sport_tip(coastal_now["wind_kts"], coastal_now["gusts_kts"], sport),
+            "timeline": timeline,
+        })
+    return reports
+
+
+def rank_spots(reports: list[dict]) -> list[dict]:
+    """Reports best first: by score, then by the best window's mean score."""
+    return sorted(reports, key=lambda r: (r["score"], r["best_window"]["mean_score"] or 0), reverse=True)
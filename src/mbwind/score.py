@@ -1,7 +1,19 @@
-from datetime import datetime
+from bisect import bisect_right
 
+from .profiles import PROFILES
 
-SPORTS = ("laser", "wingfoil")
+# Sports with a scoring profile, in profile order
+SPORTS = tuple(PROFILES["sports"])
+
+# Mission Bay direction sectors as (from, to, points), inclusive, first match
+# wins; a sector with from > to wraps through north
+DIRECTION_SECTORS = (
+    (240, 310, 20),  # W/WNW thermal
+    (220, 330, 15),
+    (180, 220, 10),
+    (330, 30, 5),
+)
+OTHER_DIRECTION_POINTS = 2  # E/ENE offshore Santa Ana and everything else
 
 
 def direction_name(degrees: float) -> str:
@@ -12,123 +24,67 @@ def direction_name(degrees: float) -> str:
     return dirs[idx]
 
 
+def _sport(sport: str) -> dict:
+    try:
+        return PROFILES["sports"][sport]
+    except KeyError:
+        raise ValueError(f"unknown sport: {sport}") from None
+
+
 def score_wind_speed(kts: float, sport: str = "laser") -> float:
-    """Score wind speed (0-30 points)."""
-    if kts is None or kts < 3:
+    """Score wind speed (0-30 points) from the sport's profile."""
+    if kts is None:
         return 0
+    edges, points = _sport(sport)["wind_speed"]
+    return points[bisect_right(edges, kts)]
 
-    if sport == "wingfoil":
-        # Wingfoil needs more wind; ideal 15-22 kts
-        if kts < 8:
-            return 5
-        elif kts < 12:
-            return 12
-        elif kts < 15:
-            return 22
-        elif kts < 22:
-            return 30  # ideal wingfoil range
-        elif kts < 28:
-            return 22
-        elif kts < 35:
-            return 12
-        else:
-            return 3  # dangerous
-    else:
-        # Laser: ideal 8-12 kts
-        if kts < 6:
-            return 10
-        elif kts < 8:
-            return 18
-        elif kts < 12:
-            return 30
-        elif kts < 16:
-            return 25
-        elif kts < 20:
-            return 18
-        elif kts < 25:
-            return 10
-        else:
-            return 5
-
-
-def score_direction(degrees: float) -> float:
-    """Score wind direction for Mission Bay (0-20 points).
-    W/WNW (250-300) is ideal thermal direction.
+
+def score_direction(degrees: float, sectors=None) -> float:
+    """Score wind direction (0-20 points) against a spot's sectors.
+    Defaults to Mission Bay: W/WNW (250-300) is ideal thermal direction,
     E/ENE (60-110) is offshore Santa Ana — bad."""
     if degrees is None:
         return 5
-    if 240 <= degrees <= 310:
-        return 20
-    elif 220 <= degrees <= 330:
-        return 15
-    elif 180 <= degrees <= 220:
-        return 10
-    elif 330 <= degrees or degrees <= 30:
-        return 5
-    else:
-        return 2
+    for lo, hi, points in sectors or DIRECTION_SECTORS:
+        if lo <= hi:
+            if lo <= degrees <= hi:
+                return points
+        elif degrees >= lo or degrees <= hi:
+            return points
+    return OTHER_DIRECTION_POINTS
 
 
 def score_thermal(delta_f: float) -> float:
     """Score thermal gradient (0-20 points)."""
-    if delta_f >= 25:
-        return 20
-    elif delta_f >= 18:
-        return 17
-    elif delta_f >= 12:
-        return 13
-    elif delta_f >= 6:
-        return 8
-    elif delta_f >= 3:
-        return 4
-    else:
-        return 0
+    edges, points = PROFILES["thermal"]
+    if delta_f is None or delta_f != delta_f:
+        return points[0]
+    return points[bisect_right(edges, delta_f)]
 
 
 def score_gust_factor(wind_kts: float, gust_kts: float, sport: str = "laser") -> float:
-    """Score gust reliability (0-15 points)."""
+    """Score gust reliability (0-15 points) from the sport's profile."""
     if wind_kts is None or wind_kts < 1:
         return 0
     if gust_kts is None:
         gust_kts = wind_kts
-    ratio = gust_kts / wind_kts
-
-    if sport == "wingfoil":
-        # Wingfoilers are more tolerant of gusts
-        if ratio < 1.4:
-            return 15
-        elif ratio < 1.7:
-            return 12
-        elif ratio < 2.0:
-            return 8
-        elif ratio < 2.5:
-            return 4
-        else:
-            return 1
-    else:
-        if ratio < 1.3:
-            return 15
-        elif ratio < 1.5:
-            return 12
-        elif ratio < 1.8:
-            return 8
-        elif ratio < 2.2:
-            return 4
-        else:
-            return 1
+    edges, points = _sport(sport)["gust_factor"]
+    return points[bisect_right(edges, gust_kts / wind_kts)]
 
 
 def score_time_of_day(hour: int) -> float:
     """Score time of day for thermal wind (0-15 points).
     Peak thermal fill is typically 11am-3pm."""
-    if 11 <= hour <= 15:
-        return 15
-    elif 10 <= hour <= 16:
-        return 12
-    elif 9 <= hour <= 17:
-        return 8
-    else:
-        return 3
+    if 0 <= hour <= 23:
+        return PROFILES["time_of_day"][hour]
+    return PROFILES["time_of_day_default"]
+
+
+def advisory_penalty(advisory: str | None) -> float:
+    """Points taken off while an NWS marine advisory is in effect."""
+    if not advisory:
+        return 0
+    return PROFILES["advisory"].get(advisory.lower(), 0)
 
 
 def compute_confidence(
@@ -139,10 +95,14 @@ def compute_confidence(
     marine_layer_suppression: float,
     hour: int,
     sport: str = "laser",
+    direction_sectors=None,
+    advisory: str | None = None,
 ) -> dict:
-    """Compute overall wind confidence score (0-100)."""
+    """Compute overall wind confidence score (0-100).
+
+    advisory is the NWS marine advisory in effect for the hour, if any."""
     s_wind = score_wind_speed(wind_kts, sport)
-    s_dir = score_direction(wind_dir)
+    s_dir = score_direction(wind_dir, direction_sectors)
     s_thermal = score_thermal(thermal_delta_f)
     s_gust = score_gust_factor(wind_kts, gust_kts, sport)
     s_time = score_time_of_day(hour)
@@ -150,7 +110,8 @@ def compute_confidence(
     raw = s_wind + s_dir + s_thermal + s_gust + s_time
 
     penalty = marine_layer_suppression * 15
-    score = max(0, min(100, round(raw - penalty)))
+    s_advisory = advisory_penalty(advisory)
+    score = max(0, min(100, round(raw - penalty - s_advisory)))
 
     if score >= 65:
         recommendation = "GO"
@@ -169,36 +130,21 @@ def compute_confidence(
             "gust_factor": s_gust,
             "time_of_day": s_time,
             "marine_layer_penalty": round(penalty, 1),
+            "advisory_penalty": s_advisory,
         },
     }
 
 
+# Tip for a sport whose profile lists none
+GENERIC_TIP = "No tips for this sport yet — judge the wind range against your own limits"
+
+
 def sport_tip(wind_kts: float, gust_kts: float, sport: str = "laser") -> str:
-    """Generate a tip based on conditions and sport."""
-    if sport == "wingfoil":
-        if wind_kts is None or wind_kts < 8:
-            return "Too light for foiling — try prone or SUP instead"
-        elif wind_kts < 12:
-            return "Marginal — big wing (6m+) and pumping required"
-        elif wind_kts < 15:
-            return "Rideable with a mid-size wing (5-6m)"
-        elif wind_kts < 22:
-            return "Sweet spot — great foiling conditions"
-        elif wind_kts < 28:
-            return "Powered up — small wing (3-4m), watch for chop"
-        else:
-            return "Nuking — experienced riders only, small wing"
-    else:
-        if wind_kts is None or wind_kts < 5:
-            return "Light air — focus on kinetics and sail trim"
-        elif wind_kts < 10:
-            gust_kts = gust_kts or wind_kts
-            if gust_kts > 14:
-                return "Shifty/gusty — stay ready to hike, keep weight forward in lulls"
-            return "Pleasant conditions, good for technique work"
-        elif wind_kts < 15:
-            return "Good hiking conditions, reef if overpowered in gusts"
-        elif wind_kts < 20:
-            return "Full hike, consider reefing. Watch for gusts on the bay"
-        else:
-            return "Heavy air — reef recommended, watch for capsizes"
+    """Tip for the conditions from the sport's profile: the first rule whose
+    wind range (and gust threshold, if any) the hour falls in."""
+    wind = wind_kts or 0
+    gust = gust_kts or wind
+    for below, gusts_over, tip in _sport(sport)["tips"]:
+        if (below is None or wind < below) and (gusts_over is None or gust > gusts_over):
+            return tip
+    return GENERIC_TIP
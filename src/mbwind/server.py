@@ -0,0 +1,240 @@
+"""Long-running HTTP/JSON server answering scores from in-memory data.
+
+Upstream data is refreshed on a schedule by a background thread that keeps
+one pooled HttpClient (and the on-disk cache) warm; requests are answered
+from the last successful fetch and never wait on NOAA or Open-Meteo. With a
+history store, every refresh is recorded there and a restarted server
+answers from the latest stored snapshot until its first refresh lands.
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from .fetch import fetch_spots, FetchError, DEADLINE, REFRESH_INTERVAL, REQUEST_TIMEOUT
+from .nowcast import nowcast_spots
+from .report import build_report
+from .score import SPORTS
+from .sources.http import HttpClient
+from .sources.open_meteo import FORECAST_TTL
+from .store import HistoryStore, record_run, attach_observations, load_snapshot, series_since
+from .timeline import WINDOW_HOURS
+
+
+class ForecastState:
+    """Latest fetched data for every spot, refreshed in the background."""
+
+    def __init__(
+        self,
+        spots: dict[str, dict],
+        interval: float = REFRESH_INTERVAL,
+        history: Path | str | None = None,
+        **client_options,
+    ):
+        self.spots = spots
+        self.interval = interval
+        self.history = history
+        self.client_options = client_options
+        self.data: dict[str, dict] | None = None
+        self.fetched_at: float | None = None
+        self.last_error: str | None = None
+        self._reports: dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="mbwind-refresh", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=REQUEST_TIMEOUT)
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Block until the first refresh attempt has finished."""
+        return self._ready.wait(timeout)
+
+    def _run(self) -> None:
+        asyncio.run(self._refresh_loop())
+
+    async def _refresh_loop(self) -> None:
+        # The store's connection belongs to this thread, like the client
+        store = None
+        if self.history is not None:
+            try:
+                store = HistoryStore(self.history)
+            except (sqlite3.Error, OSError) as e:
+                self.last_error = f"history store: {e}"
+        try:
+            if store is not None:
+                self.warm_start(store)
+            async with HttpClient(timeout=REQUEST_TIMEOUT, **self.client_options) as client:
+                while not self._stop.is_set():
+                    await self.refresh(client, store)
+                    self._ready.set()
+                    if await asyncio.to_thread(self._stop.wait, self.interval):
+                        break
+        finally:
+            if store is not None:
+                store.close()
+
+    def warm_start(self, store: HistoryStore) -> bool:
+        """Serve the latest stored snapshot, if still fresh, until the first refresh."""
+        try:
+            data = load_snapshot(store, list(self.spots.values()), FORECAST_TTL)
+        except (sqlite3.Error, OSError) as e:
+            self.last_error = f"history store: {e}"
+            return False
+        if data is None:
+            return False
+        issued = min(d["forecasts"]["coastal"].meta["issued"] for d in data.values())
+        with self._lock:
+            self.data = data
+            self.fetched_at = float(issued)
+            self._reports = {}
+        self._ready.set()
+        return True
+
+    async def refresh(self, client: HttpClient, store: HistoryStore | None = None) -> None:
+        spots = list(self.spots.values())
+        # The history store is a nice-to-have: a refresh never fails over it
+        store_error = None
+        try:
+            since = series_since(store, spots) if store is not None else None
+        except (sqlite3.Error, OSError) as e:
+            since, store_error = None, e
+        try:
+            data = await fetch_spots(client, spots, DEADLINE, since=since)
+        except FetchError as e:
+            # Keep serving the previous data; report the failure on /health
+            self.last_error = str(e)
+            return
+        if store is not None and store_error is None:
+            try:
+                record_run(store, spots, data)
+                attach_observations(store, spots, data)
+                nowcast_spots(store, spots, data)
+            except (sqlite3.Error, OSError) as e:
+                store_error = e
+        with self._lock:
+            self.data = data
+            self.fetched_at = time.time()
+            self.last_error = f"history store: {store_error}" if store_error else None
+            self._reports = {}
+
+    def report(self, spot_id: str, sport: str, target_date: datetime, hour: int) -> dict | None:
+        """Scored report from memory, memoized until the next refresh."""
+        key = (spot_id, sport, target_date.date(), hour)
+        with self._lock:
+            data, reports = self.data, self._reports
+        if data is None:
+            return None
+        report = reports.get(key)
+        if report is None:
+            # Scored outside the lock, so requests and the refresh swap never wait on it;
+            # a refresh meanwhile replaces reports, and this one is dropped with it
+            report = build_report(data[spot_id], self.spots[spot_id], hour, target_date, sport, WINDOW_HOURS)
+            with self._lock:
+                report = reports.setdefault(key, report)
+        return report
+
+    def health(self) -> dict:
+        return {
+            "ready": self.data is not None,
+            "fetched_at": datetime.fromtimestamp(self.fetched_at).astimezone().isoformat() if self.fetched_at else None,
+            "age_s": round(time.time() - self.fetched_at, 1) if self.fetched_at else None,
+            "last_error": self.last_error,
+            "spots": list(self.spots),
+        }
+
+
+class _Error(Exception):
+    def __init__(self, status: int, message: str):
+        self.status = status
+        self.message = message
+
+
+def _query(url: str) -> dict[str, str]:
+    return {k: v[-1] for k, v in parse_qs(urlsplit(url).query).items()}
+
+
+def _score_args(state: ForecastState, query: dict[str, str], default_spot: str) -> tuple:
+    spot_id = query.get("spot", default_spot)
+    if spot_id not in state.spots:
+        raise _Error(404, f"unknown spot {spot_id!r}")
+    sport = query.get("sport", "laser")
+    if sport not in SPORTS:
+        raise _Error(400, f"sport must be one of {', '.join(SPORTS)}")
+    now = datetime.now().astimezone()
+    try:
+        target_date = datetime.fromisoformat(query["date"]).astimezone() if "date" in query else now
+        hour = int(query.get("hour", now.hour))
+    except ValueError as e:
+        raise _Error(400, str(e)) from e
+    if not 0 <= hour <= 23:
+        raise _Error(400, "hour must be 0-23")
+    return spot_id, sport, target_date, hour
+
+
+def make_handler(state: ForecastState, default_spot: str):
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "mbwind"
+
+        def do_GET(self):
+            path = urlsplit(self.path).path.rstrip("/") or "/"
+            try:
+                if path == "/health":
+                    return self._send(200, state.health())
+                if path in ("/score", "/timeline"):
+                    report = state.report(*_score_args(state, _query(self.path), default_spot))
+                    if report is None:
+                        raise _Error(503, state.last_error or "no data fetched yet")
+                    if path == "/score":
+                        report = {k: v for k, v in report.items() if k != "timeline"}
+                    return self._send(200, report)
+                raise _Error(404, f"no such endpoint: {path}")
+            except _Error as e:
+                self._send(e.status, {"error": e.message})
+            except Exception as e:  # a bug or odd data: answer, don't drop the connection
+                self._send(500, {"error": f"{type(e).__name__}: {e}"})
+
+        def _send(self, status: int, body: dict) -> None:
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass  # keep the console quiet; the server is polled constantly
+
+    return Handler
+
+
+def serve(
+    spots: dict[str, dict],
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    interval: float = REFRESH_INTERVAL,
+    default_spot: str = "mission_bay",
+    history: Path | str | None = None,
+    **client_options,
+) -> None:
+    """Run the server until interrupted."""
+    state = ForecastState(spots, interval, history, **client_options)
+    state.start()
+    httpd = ThreadingHTTPServer((host, port), make_handler(state, default_spot))
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        state.stop()
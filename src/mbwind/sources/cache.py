@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from urllib.parse import urlencode
+
+# Keep the cache small; entries are a few KB each
+MAX_BYTES = 20 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """Cache directory: $MBWIND_CACHE_DIR, else $XDG_CACHE_HOME/mbwind, else ~/.cache/mbwind."""
+    if os.environ.get("MBWIND_CACHE_DIR"):
+        return Path(os.environ["MBWIND_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "mbwind"
+
+
+def cache_key(url: str, params: dict | None = None) -> str:
+    query = urlencode(sorted((params or {}).items()))
+    return hashlib.sha256(f"{url}?{query}".encode()).hexdigest()
+
+
+class ResponseCache:
+    """On-disk cache of JSON responses, one file per URL + query.
+
+    Entries keep their ETag/Last-Modified validators so stale entries can be
+    revalidated with a conditional request. Expired entries are not deleted
+    (they remain usable for revalidation); the least recently written ones
+    are evicted once the directory grows past max_bytes."""
+
+    def __init__(self, directory: Path | str | None = None, max_bytes: int = MAX_BYTES):
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, body, etag: str | None = None, last_modified: str | None = None) -> dict:
+        entry = {
+            "fetched_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body,
+        }
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self._path(key).with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp, self._path(key))
+            self._evict()
+        except OSError:
+            pass  # a read-only or full disk should never break a run
+        return entry
+
+    def touch(self, key: str, entry: dict) -> None:
+        """Mark an entry as freshly validated (after a 304)."""
+        self.put(key, entry["body"], entry.get("etag"), entry.get("last_modified"))
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        files = []
+        total = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def is_fresh(entry: dict, ttl: float) -> bool:
+    return time.time() - entry.get("fetched_at", 0) < ttl
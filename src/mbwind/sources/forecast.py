@@ -0,0 +1,227 @@
+import json
+import math
+import re
+from array import array
+from datetime import date, datetime
+from json.decoder import scanstring
+
+# Open-Meteo hourly variable -> name used in per-hour records
+VARIABLES = {
+    "temperature_2m": "temp_f",
+    "wind_speed_10m": "wind_kts",
+    "wind_direction_10m": "wind_dir",
+    "wind_gusts_10m": "gusts_kts",
+    "dewpoint_2m": "dewpoint_f",
+}
+
+
+# Characters of a JSON array decoded at a time by decode_payloads (the
+# response body itself is held whole, as one str)
+CHUNK = 64 * 1024
+
+
+def _column(values) -> array:
+    """Pack a list of numbers into a float array, with None stored as NaN.
+    An array (from decode_payloads) is used as is."""
+    if isinstance(values, array):
+        return values
+    return array("d", (math.nan if v is None else v for v in values))
+
+
+def _times(values: list) -> list[datetime]:
+    if values and isinstance(values[0], datetime):
+        return values
+    return [datetime.fromisoformat(t) for t in values]
+
+
+def _value(x: float) -> float | None:
+    return None if math.isnan(x) else x
+
+
+class Forecast:
+    """Hourly forecast held column-wise, parsed once per fetch.
+
+    Timestamps are parsed a single time; each variable lives in a compact
+    float array (missing values as NaN), and a (date, hour) index gives O(1)
+    lookup of any hour."""
+
+    def __init__(self, times: list[datetime], columns: dict[str, array], meta: dict | None = None):
+        self.times = times
+        self.columns = columns
+        self.meta = meta or {}
+        self._index = {}
+        self._days = {}
+        for i, t in enumerate(times):
+            self._index[(t.date(), t.hour)] = i
+            start, _ = self._days.get(t.date(), (i, i))
+            self._days[t.date()] = (start, i + 1)
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "Forecast":
+        """Build from an Open-Meteo JSON response (single location)."""
+        hourly = payload["hourly"]
+        times = _times(hourly["time"])
+        columns = {name: _column(hourly[key]) for key, name in VARIABLES.items() if key in hourly}
+        meta = {k: v for k, v in payload.items() if k not in ("hourly", "hourly_units")}
+        return cls(times, columns, meta)
+
+    @classmethod
+    def from_columns(cls, times: list[datetime], values: dict[str, list], meta: dict | None = None) -> "Forecast":
+        """Build from per-variable value lists (None for missing), keyed by record name."""
+        return cls(times, {name: _column(v) for name, v in values.items()}, meta)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def column(self, name: str) -> array:
+        return self.columns[name]
+
+    def value(self, name: str, i: int) -> float | None:
+        """A single value from a column, with missing data as None."""
+        return _value(self.columns[name][i])
+
+    def index(self, day: date, hour: int) -> int | None:
+        return self._index.get((day, hour))
+
+    def day_range(self, day: date) -> range:
+        """Indices of every hour on the given date (empty if not covered)."""
+        start, end = self._days.get(day, (0, 0))
+        return range(start, end)
+
+    def days(self) -> list[date]:
+        return list(self._days)
+
+    def hour(self, i: int) -> dict:
+        """Per-hour record, in the shape get_hourly_at returns."""
+        t = self.times[i]
+        record = {"time": t.isoformat(timespec="minutes"), "hour": t.hour}
+        for name, col in self.columns.items():
+            record[name] = _value(col[i])
+        return record
+
+
+def split_members(payload: dict) -> dict[str, Forecast]:
+    """Split a multi-model or ensemble Open-Meteo payload into one Forecast per member.
+
+    Such payloads suffix each variable with the member and/or model, e.g.
+    "wind_speed_10m_member03_gfs025"; the suffix becomes the member key and
+    unsuffixed columns (the control run) the "control" member. All members
+    share the payload's time axis."""
+    hourly = payload["hourly"]
+    times = _times(hourly["time"])
+    members: dict[str, dict[str, array]] = {}
+    for key, values in hourly.items():
+        for var, name in VARIABLES.items():
+            if key == var or key.startswith(var + "_"):
+                member = key[len(var) + 1:] or "control"
+                members.setdefault(member, {})[name] = _column(values)
+                break
+    return {member: Forecast(times, columns) for member, columns in members.items()}
+
+
+_WS = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+def decode_payloads(text: str) -> list[dict]:
+    """Decode an Open-Meteo response (one location, or a list of them).
+
+    Gives what json.loads would, as a list, except that the hourly arrays
+    never exist as Python lists: "time" becomes a list of datetimes and
+    every other hourly variable an array('d') with NaN for null, each
+    scanned CHUNK characters at a time. This is a chunked scan of a body
+    already in memory, not a streaming decode: the text is held whole, and
+    only the decoded values stay bounded. from_payload and split_members
+    take these payloads as they take parsed JSON."""
+    pos = _skip(text, 0)
+    if not text.startswith("[", pos):
+        payload, pos = _object(text, pos, _location_value)
+        _end(text, pos)
+        return [payload]
+    payloads = []
+    pos = _skip(text, pos + 1)
+    while not text.startswith("]", pos):
+        payload, pos = _object(text, pos, _location_value)
+        payloads.append(payload)
+        pos = _skip(text, pos)
+        if text.startswith(",", pos):
+            pos = _skip(text, pos + 1)
+    _end(text, pos + 1)
+    return payloads
+
+
+def _skip(text: str, pos: int) -> int:
+    return _WS.match(text, pos).end()
+
+
+def _expect(text: str, pos: int, char: str) -> int:
+    pos = _skip(text, pos)
+    if not text.startswith(char, pos):
+        raise ValueError(f"expected {char!r} at offset {pos} of Open-Meteo response")
+    return pos + 1
+
+
+def _end(text: str, pos: int) -> None:
+    if _skip(text, pos) != len(text):
+        raise ValueError(f"extra data at offset {pos} of Open-Meteo response")
+
+
+def _object(text: str, pos: int, read_value) -> tuple[dict, int]:
+    """Decode the object at pos, reading each member with
+    read_value(key, text, pos) -> (value, end)."""
+    pos = _skip(text, _expect(text, pos, "{"))
+    result = {}
+    if text.startswith("}", pos):
+        return result, pos + 1
+    while True:
+        key, pos = scanstring(text, _expect(text, pos, '"'))
+        pos = _skip(text, _expect(text, pos, ":"))
+        result[key], pos = read_value(key, text, pos)
+        pos = _skip(text, pos)
+        if not text.startswith(",", pos):
+            return result, _expect(text, pos, "}")
+        pos += 1
+
+
+def _location_value(key: str, text: str, pos: int):
+    if key == "hourly" and text.startswith("{", pos):
+        return _object(text, pos, _hourly_value)
+    return _decoder.raw_decode(text, pos)
+
+
+def _hourly_value(key: str, text: str, pos: int):
+    if not text.startswith("[", pos):
+        return _decoder.raw_decode(text, pos)
+    if key == "time":
+        out = []
+        for items in _chunks(text, pos):
+            out.extend(datetime.fromisoformat(t) for t in items)
+    else:
+        out = array("d")
+        for items in _chunks(text, pos):
+            try:
+                out.extend(array("d", items))
+            except TypeError:  # nulls
+                out.extend(array("d", (math.nan if v is None else v for v in items)))
+    return out, text.index("]", pos) + 1
+
+
+def _chunks(text: str, pos: int):
+    """Decode the flat array at pos (numbers, nulls or timestamps, so no
+    nested brackets) as lists of at most about CHUNK characters."""
+    end = text.index("]", pos)
+    pos += 1
+    while pos < end:
+        stop = end if end - pos <= CHUNK else text.rfind(",", pos, pos + CHUNK)
+        if stop <= pos:  # one value longer than CHUNK
+            stop = text.find(",", pos, end)
+            stop = end if stop == -1 else stop
+        yield json.loads("[" + text[pos:stop] + "]")
+        pos = stop + 1
+
+
+def as_forecast(forecast) -> Forecast:
+    """Accept either a Forecast or a raw Open-Meteo payload."""
+    if isinstance(forecast, Forecast):
+        return forecast
+    return Forecast.from_payload(forecast)
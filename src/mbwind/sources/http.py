@@ -0,0 +1,309 @@
+import asyncio
+import importlib.util
+import os
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import httpx
+
+from .. import timing
+from .cache import ResponseCache, cache_key, is_fresh
+
+USER_AGENT = "mbwind/0.1 (sailwind confidence tool)"
+
+# Statuses worth retrying: rate limiting and transient upstream failures
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Each upstream can be pointed elsewhere (a stub server, a mirror) by setting
+# its variable to a base URL, e.g. MBWIND_OPEN_METEO_URL=http://127.0.0.1:8000
+UPSTREAM_ENV = {
+    "https://api.open-meteo.com": "MBWIND_OPEN_METEO_URL",
+    "https://historical-forecast-api.open-meteo.com": "MBWIND_OPEN_METEO_ARCHIVE_URL",
+    "https://ensemble-api.open-meteo.com": "MBWIND_OPEN_METEO_ENSEMBLE_URL",
+    "https://api.tidesandcurrents.noaa.gov": "MBWIND_COOPS_URL",
+    "https://api.weather.gov": "MBWIND_NWS_URL",
+}
+# How each upstream is named when a report is built from its saved responses
+UPSTREAM_NAMES = {
+    "https://api.open-meteo.com": "Open-Meteo",
+    "https://historical-forecast-api.open-meteo.com": "Open-Meteo archive",
+    "https://ensemble-api.open-meteo.com": "Open-Meteo ensemble",
+    "https://api.tidesandcurrents.noaa.gov": "NOAA CO-OPS",
+    "https://api.weather.gov": "NWS",
+}
+
+
+def upstream_overrides() -> dict[str, str]:
+    """Origin -> replacement base URL, from the MBWIND_*_URL variables set."""
+    return {
+        origin: os.environ[var].rstrip("/")
+        for origin, var in UPSTREAM_ENV.items() if os.environ.get(var)
+    }
+
+
+# Profiled phase -> the httpcore trace steps it spans, timed from the
+# first's .started to the last's .complete, so each phase counts once per
+# request. connect_tcp includes the DNS lookup, which httpcore does not
+# report apart.
+TRACE_PHASES = {
+    "connect": ("connect_tcp", "connect_tcp"),
+    "tls": ("start_tls", "start_tls"),
+    "send": ("send_request_headers", "send_request_body"),
+    "wait": ("receive_response_headers", "receive_response_headers"),
+    "transfer": ("receive_response_body", "receive_response_body"),
+}
+_PHASE_STARTS = {first: phase for phase, (first, _) in TRACE_PHASES.items()}
+_PHASE_ENDS = {last: phase for phase, (_, last) in TRACE_PHASES.items()}
+
+
+def upstream_name(url: str) -> str:
+    parts = urlsplit(url)
+    return UPSTREAM_NAMES.get(f"{parts.scheme}://{parts.netloc}", parts.netloc)
+
+
+def source_label(url: str, params: dict | None = None) -> str:
+    """Short name for an upstream endpoint in profiles, e.g.
+    "api.open-meteo.com/v1/forecast" or a CO-OPS URL plus its product."""
+    parts = urlsplit(url)
+    product = (params or {}).get("product")
+    return f"{parts.netloc}{parts.path}" + (f" {product}" if product else "")
+
+
+def _tracer(profile: timing.Profile, source: str):
+    """httpx trace extension recording connection and transfer phases."""
+    started = {}
+
+    async def trace(event: str, info: dict) -> None:
+        _, step, state = event.split(".")
+        if state == "started" and step in _PHASE_STARTS:
+            started[_PHASE_STARTS[step]] = time.perf_counter()
+        elif state == "complete" and step in _PHASE_ENDS and _PHASE_ENDS[step] in started:
+            phase = _PHASE_ENDS[step]
+            start = started.pop(phase)
+            profile.add(phase, time.perf_counter() - start, source, start)
+    return trace
+
+
+class HttpClient:
+    """Shared async HTTP client used by every source fetcher.
+
+    Wraps a single pooled httpx.AsyncClient so requests to the same host
+    reuse one keep-alive connection (and one DNS lookup / TLS handshake),
+    caps concurrent requests per host, and retries transient failures
+    with exponential backoff. With a ResponseCache, get_json calls that pass
+    a ttl are served from disk while fresh and revalidated once stale;
+    refresh=True skips fresh hits but still revalidates.
+
+    When an upstream can't be reached (or keeps failing with a retryable
+    status), an expired cache entry is returned rather than the error, and
+    offline=True never makes a request: every call is answered from the
+    cache, however old, or fails. Either way, the upstreams answered from
+    expired entries are collected for take_stale. upstreams maps origins
+    to replacement base URLs, as the MBWIND_*_URL variables do, and
+    replaces them."""
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        max_keepalive: int = 10,
+        keepalive_expiry: float = 60.0,
+        per_host: int = 4,
+        http2: bool = False,
+        retries: int = 2,
+        backoff: float = 0.5,
+        transport: httpx.AsyncBaseTransport | None = None,
+        cache: ResponseCache | None = None,
+        refresh: bool = False,
+        offline: bool = False,
+        upstreams: dict[str, str] | None = None,
+    ):
+        # HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 without it
+        if http2 and importlib.util.find_spec("h2") is None:
+            http2 = False
+        self.http2 = http2
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.cache = cache
+        self.refresh = refresh
+        self.offline = offline
+        self.overrides = upstreams if upstreams is not None else upstream_overrides()
+        # Upstream name -> fetch time of the oldest expired entry served
+        self.stale: dict[str, float] = {}
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            http2=http2,
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "HttpClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    def take_stale(self) -> dict | None:
+        """The upstreams answered from expired cache entries since the last
+        call, and when the oldest of those was fetched; None if there were none."""
+        if not self.stale:
+            return None
+        stale, self.stale = self.stale, {}
+        return {
+            "as_of": datetime.fromtimestamp(min(stale.values())).isoformat(timespec="minutes"),
+            "sources": sorted(stale),
+        }
+
+    def resolve(self, url: str) -> str:
+        """url, redirected if its upstream is overridden (see UPSTREAM_ENV)."""
+        for origin, base in self.overrides.items():
+            if url.startswith(origin + "/"):
+                return base + url[len(origin):]
+        return url
+
+    def _slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host)
+        return self._host_slots[host]
+
+    async def get(
+        self, url: str, params: dict | None = None, headers: dict | None = None, source: str | None = None,
+    ) -> httpx.Response:
+        """GET with retry/backoff; raises httpx.HTTPStatusError on a final failure.
+
+        A 304 Not Modified is returned as-is for conditional requests. url
+        is resolved here; source is its profile label, when the caller has
+        already computed it."""
+        if self.offline:
+            raise httpx.ConnectError(f"offline: no saved response for {url}")
+        profile = timing.active()
+        if source is None:
+            source = source_label(url, params) if profile else ""
+        url = self.resolve(url)
+        attempt = 0
+        while True:
+            try:
+                slot = self._slot(url)
+                with timing.span("queue", source):
+                    await slot.acquire()
+                try:
+                    extensions = {"trace": _tracer(profile, source)} if profile else None
+                    resp = await self._client.get(url, params=params, headers=headers, extensions=extensions)
+                finally:
+                    slot.release()
+                if resp.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                    if resp.status_code != 304:
+                        resp.raise_for_status()
+                    return resp
+                delay = _retry_after(resp) or self.backoff * 2 ** attempt
+            except httpx.TransportError:
+                if attempt >= self.retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+            attempt += 1
+            timing.count("retry", source)
+            await asyncio.sleep(delay)
+
+    async def get_json(
+        self,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        ttl: float | None = None,
+        raw: bool = False,
+        parse=None,
+    ):
+        """GET and decode JSON, going through the cache when ttl is given.
+
+        raw=True returns (and caches) the body text undecoded, for callers
+        with their own decoder. parse, if given, is applied to a freshly
+        downloaded body and its result is what gets returned and cached, so
+        cache hits and 304 revalidations skip it."""
+        if timing.active() is None:
+            return await self._get_json(url, params, headers, ttl, raw, parse, "")
+        source = source_label(url, params)
+        with timing.span("request", source):
+            return await self._get_json(url, params, headers, ttl, raw, parse, source)
+
+    async def _get_json(
+        self, url: str, params: dict | None, headers: dict | None, ttl: float | None, raw: bool, parse, source: str,
+    ):
+        name = upstream_name(url)
+        if self.cache is None or ttl is None:
+            resp = await self.get(url, params=params, headers=headers, source=source)
+            return self._decode(resp, raw, parse, source)
+
+        # Cached under the URL actually fetched, so a stub never answers for the real upstream;
+        # raw text and parsed results are kept apart from the decoded body of the same URL
+        fetched = self.resolve(url)
+        if raw:
+            fetched += "#raw"
+        if parse is not None:
+            fetched += f"#{parse.__module__}.{parse.__qualname__}"
+        key = cache_key(fetched, params)
+        with timing.span("cache_read", source):
+            entry = self.cache.get(key)
+        if entry is not None and (self.offline or not self.refresh) and is_fresh(entry, ttl):
+            timing.count("cache_hit", source)
+            return entry["body"]
+        if entry is not None and self.offline:
+            return self._stale(name, entry, source)
+
+        headers = dict(headers or {})
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            resp = await self.get(url, params=params, headers=headers, source=source)
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            failed = isinstance(e, httpx.TransportError) or e.response.status_code in RETRY_STATUSES
+            if entry is None or not failed:
+                raise
+            return self._stale(name, entry, source)
+        if resp.status_code == 304 and entry is not None:
+            timing.count("cache_revalidated", source)
+            self.cache.touch(key, entry)
+            return entry["body"]
+
+        timing.count("cache_miss", source)
+        body = self._decode(resp, raw, parse, source)
+        self.cache.put(key, body, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return body
+
+    @staticmethod
+    def _decode(resp: httpx.Response, raw: bool, parse, source: str):
+        if raw and parse is None:
+            return resp.text
+        with timing.span("parse", source):
+            body = resp.text if raw else resp.json()
+            return body if parse is None else parse(body)
+
+    def _stale(self, name: str, entry: dict, source: str):
+        timing.count("cache_stale", source)
+        fetched = entry.get("fetched_at", 0)
+        self.stale[name] = min(self.stale.get(name, fetched), fetched)
+        return entry["body"]
+
+
+def _retry_after(resp: httpx.Response) -> float | None:
+    """Seconds from a Retry-After header, capped so one upstream can't stall a run."""
+    value = resp.headers.get("Retry-After")
+    try:
+        return min(float(value), 10.0) if value else None
+    except ValueError:
+        return None
@@ -1,19 +1,34 @@
-import httpx
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import TYPE_CHECKING
+
+from .nws import parse_zone_forecast
+
+if TYPE_CHECKING:
+    from .http import HttpClient
 
 # NOAA station IDs near Mission Bay
 # San Diego Bay - 9410170
 TIDE_STATION = "9410170"
 
 NWS_MARINE_ZONE = "PZZ775"  # Coastal waters San Diego
-NWS_OFFICE = "SGX"  # San Diego NWS office
 
+# Cache lifetimes (seconds), matched to how often each product changes
+OBSERVATION_TTL = 6 * 60  # CO-OPS publishes 6-minute observations
+PREDICTIONS_TTL = 24 * 60 * 60  # hi/lo predictions are fixed for the day
+MARINE_TTL = 30 * 60
+
+# Observed water level changing slower than this (ft/hour) is slack water
+SLACK_FT_PER_HR = 0.1
 
-def fetch_tide_data() -> dict:
+
+async def fetch_tide_data(client: HttpClient, station: str = TIDE_STATION) -> dict:
     """Fetch current tide data from NOAA CO-OPS."""
     url = "https://api.tidesandcurrents.noaa.gov/api/prod/datagetter"
     params = {
         "date": "latest",
-        "station": TIDE_STATION,
+        "station": station,
         "product": "water_level",
         "datum": "MLLW",
         "units": "english",
@@ -21,9 +36,7 @@ def fetch_tide_data() -> dict:
         "format": "json",
         "application": "mbwind",
     }
-    resp = httpx.get(url, params=params, timeout=10)
-    resp.raise_for_status()
-    data = resp.json()
+    data = await client.get_json(url, params=params, ttl=OBSERVATION_TTL)
 
     if "data" in data and data["data"]:
         entry = data["data"][0]
@@ -34,12 +47,15 @@ def fetch_tide_data() -> dict:
     return {"water_level_ft": None, "time": None}
 
 
-def fetch_tide_predictions() -> list[dict]:
+async def fetch_tide_predictions(client: HttpClient, station: str = TIDE_STATION) -> list[dict]:
     """Fetch today's tide predictions (hi/lo) from NOAA."""
     url = "https://api.tidesandcurrents.noaa.gov/api/prod/datagetter"
     params = {
-        "date": "today",
-        "station": TIDE_STATION,
+        # An explicit date (rather than "today") keeps cached predictions from
+        # outliving the day they were fetched for
+        "begin_date": date.today().strftime("%Y%m%d"),
+        "end_date": date.today().strftime("%Y%m%d"),
+        "station": station,
         "product": "predictions",
         "datum": "MLLW",
         "units": "english",
@@ -48,9 +64,7 @@ def fetch_tide_predictions() -> list[dict]:
         "interval": "hilo",
         "application": "mbwind",
     }
-    resp = httpx.get(url, params=params, timeout=10)
-    resp.raise_for_status()
-    data = resp.json()
+    data = await client.get_json(url, params=params, ttl=PREDICTIONS_TTL)
     predictions = []
     for entry in data.get("predictions", []):
         predictions.append({
@@ -61,12 +75,12 @@ def fetch_tide_predictions() -> list[dict]:
     return predictions
 
 
-def fetch_wind_observation() -> dict | None:
+async def fetch_wind_observation(client: HttpClient, station: str = TIDE_STATION) -> dict | None:
     """Fetch latest wind observation from NOAA station."""
     url = "https://api.tidesandcurrents.noaa.gov/api/prod/datagetter"
     params = {
         "date": "latest",
-        "station": TIDE_STATION,
+        "station": station,
         "product": "wind",
         "units": "english",
         "time_zone": "lst_ldt",
@@ -74,9 +88,7 @@ def fetch_wind_observation() -> dict | None:
         "application": "mbwind",
     }
     try:
-        resp = httpx.get(url, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
+        data = await client.get_json(url, params=params, ttl=OBSERVATION_TTL)
         if "data" in data and data["data"]:
             entry = data["data"][0]
             speed = float(entry["s"]) if entry["s"] else None
@@ -86,6 +98,7 @@ def fetch_wind_observation() -> dict | None:
                 "speed_kts": speed,
                 "gust_kts": gust,
                 "direction": direction,
+                "direction_deg": float(entry["d"]) if entry.get("d") else None,
                 "time": entry["t"],
             }
     except Exception:
@@ -93,32 +106,108 @@ def fetch_wind_observation() -> dict | None:
     return None
 
 
-def fetch_marine_forecast() -> str | None:
-    """Fetch marine forecast discussion from NWS."""
-    url = f"https://api.weather.gov/offices/{NWS_OFFICE}"
-    headers = {"User-Agent": "mbwind/0.1 (sailwind confidence tool)"}
-    try:
-        resp = httpx.get(url, headers=headers, timeout=10, follow_redirects=True)
-        resp.raise_for_status()
-    except Exception:
-        pass
+async def fetch_wind_history(client: HttpClient, station: str, start: date, end: date) -> list[dict]:
+    """Fetch hourly wind observations for start..end (inclusive).
+
+    CO-OPS serves at most a year of hourly data per request. Returns one
+    record per hour with time as "YYYY-MM-DDTHH:MM" local time, matching
+    Open-Meteo's timestamps, and None for missing values."""
+    url = "https://api.tidesandcurrents.noaa.gov/api/prod/datagetter"
+    params = {
+        "begin_date": start.strftime("%Y%m%d"),
+        "end_date": end.strftime("%Y%m%d"),
+        "station": station,
+        "product": "wind",
+        "interval": "h",
+        "units": "english",
+        "time_zone": "lst_ldt",
+        "format": "json",
+        "application": "mbwind",
+    }
+    return [_wind_record(entry) for entry in _coops_rows(await client.get_json(url, params=params))]
+
+
+async def fetch_wind_series(client: HttpClient, station: str, begin: datetime, end: datetime | None = None) -> list[dict]:
+    """Fetch 6-minute wind observations from begin to end (default now).
+
+    For incremental polling: pass the last ingested time (plus a minute) as
+    begin to receive only readings not seen yet. Records are shaped like
+    fetch_wind_history's; an empty range gives []."""
+    url = "https://api.tidesandcurrents.noaa.gov/api/prod/datagetter"
+    params = {
+        **_series_range(begin, end),
+        "station": station,
+        "product": "wind",
+        "units": "english",
+        "time_zone": "lst_ldt",
+        "format": "json",
+        "application": "mbwind",
+    }
+    return [_wind_record(entry) for entry in _coops_rows(await client.get_json(url, params=params))]
+
+
+async def fetch_water_level_series(client: HttpClient, station: str, begin: datetime, end: datetime | None = None) -> list[dict]:
+    """Fetch 6-minute water levels from begin to end (default now), like
+    fetch_wind_series. Records have time and water_level_ft."""
+    url = "https://api.tidesandcurrents.noaa.gov/api/prod/datagetter"
+    params = {
+        **_series_range(begin, end),
+        "station": station,
+        "product": "water_level",
+        "datum": "MLLW",
+        "units": "english",
+        "time_zone": "lst_ldt",
+        "format": "json",
+        "application": "mbwind",
+    }
+    return [
+        {"time": entry["t"].replace(" ", "T"), "water_level_ft": float(entry["v"]) if entry.get("v") else None}
+        for entry in _coops_rows(await client.get_json(url, params=params))
+    ]
 
-    # Try fetching the zone forecast directly
-    url = f"https://api.weather.gov/zones/forecast/{NWS_MARINE_ZONE}/forecast"
+
+def _series_range(begin: datetime, end: datetime | None) -> dict:
+    end = end or datetime.now()
+    return {"begin_date": begin.strftime("%Y%m%d %H:%M"), "end_date": end.strftime("%Y%m%d %H:%M")}
+
+
+def _coops_rows(data: dict) -> list[dict]:
+    if "error" in data:
+        # CO-OPS reports "No data was found" and bad ranges with a 200
+        message = data["error"].get("message", "")
+        if message.startswith("No data"):
+            return []
+        raise ValueError(f"CO-OPS: {message}")
+    return data.get("data", [])
+
+
+def _wind_record(entry: dict) -> dict:
+    return {
+        "time": entry["t"].replace(" ", "T"),
+        "wind_kts": float(entry["s"]) if entry.get("s") else None,
+        "wind_dir": float(entry["d"]) if entry.get("d") else None,
+        "gust_kts": float(entry["g"]) if entry.get("g") else None,
+    }
+
+
+async def fetch_marine_forecast(client: HttpClient, zone: str = NWS_MARINE_ZONE) -> dict | None:
+    """Fetch the NWS zone forecast, parsed into periods (see nws.py).
+
+    The parsed forecast, with its update time, is what the response cache
+    keeps, so a cached or revalidated forecast is not parsed again."""
+    url = f"https://api.weather.gov/zones/forecast/{zone}/forecast"
     try:
-        resp = httpx.get(url, headers=headers, timeout=10, follow_redirects=True)
-        resp.raise_for_status()
-        data = resp.json()
-        periods = data.get("properties", {}).get("periods", [])
-        if periods:
-            return periods[0].get("detailedForecast", "")
+        forecast = await client.get_json(url, ttl=MARINE_TTL, parse=parse_zone_forecast)
     except Exception:
-        pass
-    return None
+        return None
+    return forecast if forecast["periods"] else None
+
 
+def classify_tide(water_level_ft: float | None, predictions: list[dict], rate_ft_per_hr: float | None = None) -> str:
+    """Classify current tide state.
 
-def classify_tide(water_level_ft: float | None, predictions: list[dict]) -> str:
-    """Classify current tide state."""
+    With an observed rate of change (from recent water levels) the direction
+    is measured; otherwise it is inferred from the next predicted hi/lo."""
     if water_level_ft is None:
         return "Unknown"
 
@@ -129,8 +218,13 @@ def classify_tide(water_level_ft: float | None, predictions: list[dict]) -> str:
     else:
         base = "Mid"
 
+    if rate_ft_per_hr is not None:
+        if abs(rate_ft_per_hr) < SLACK_FT_PER_HR:
+            return f"{base}, slack"
+        direction = "incoming" if rate_ft_per_hr > 0 else "outgoing"
+        return f"{base}, {direction} ({rate_ft_per_hr:+.1f} ft/h)"
+
     # Try to determine if incoming or outgoing from predictions
-    from datetime import datetime
     now = datetime.now()
     next_tides = []
     for p in predictions:
@@ -0,0 +1,88 @@
+"""NWS marine zone forecasts, parsed into structured periods.
+
+The zone forecast's periods are free text ("W wind 10 to 15 kt with gusts
+up to 25 kt. Wind waves 2 to 4 ft. W swell 5 ft at 10 seconds."). Each is
+parsed once, when the response is fetched, into the wind range, direction,
+gusts, sea height, swells and the most severe advisory in effect; the
+parsed forecast is what the response cache keeps.
+"""
+import re
+from datetime import datetime
+
+# Advisories and warnings for coastal waters, most severe first
+ADVISORIES = (
+    "Hurricane Force Wind Warning",
+    "Storm Warning",
+    "Gale Warning",
+    "Hazardous Seas Warning",
+    "Small Craft Advisory",
+)
+
+_ADVISORY = re.compile("|".join(re.escape(a) for a in ADVISORIES), re.IGNORECASE)
+_DIRECTION = re.compile(r"\b([NSEW]{1,3}|variable)\s+winds?\b", re.IGNORECASE)
+_GUSTS = re.compile(r"gusts\s+(?:up\s+)?to\s+(\d+)\s*kt", re.IGNORECASE)
+_SPEED = re.compile(r"(?:(less than|up to)\s+)?(\d+)(?:\s+to\s+(\d+))?\s*kt\b", re.IGNORECASE)
+_SEAS = re.compile(r"(?:wind waves|seas)\s+(\d+)(?:\s+to\s+(\d+))?\s*ft", re.IGNORECASE)
+_SWELL = re.compile(r"\b([NSEW]{1,3})\s+(?:swell\s+)?(\d+)(?:\s+to\s+(\d+))?\s*ft\s+at\s+(\d+)\s+seconds", re.IGNORECASE)
+
+
+def parse_period(text: str) -> dict:
+    """Structured fields of one period's text; None where it says nothing.
+
+    Wind speeds are the range over every phrase ("5 to 10 kt, becoming 10
+    to 15 kt" is 5-15); "less than 5 kt" counts as 0-5. Seas are the highest
+    wind wave or sea height, swells one entry per train."""
+    found = {a.lower() for a in _ADVISORY.findall(text)}
+    direction = _DIRECTION.search(text)
+    gusts = [int(g) for g in _GUSTS.findall(text)]
+    lows, highs = [], []
+    for qualifier, low, high in _SPEED.findall(_GUSTS.sub("", text)):
+        lows.append(0 if qualifier else int(low))
+        highs.append(int(high or low))
+    seas = [int(high or low) for low, high in _SEAS.findall(text)]
+    swell = [
+        {"direction": d.upper(), "height_ft": int(high or low), "period_s": int(period)}
+        for d, low, high, period in _SWELL.findall(text)
+    ]
+    return {
+        "wind_dir": direction.group(1).upper() if direction and direction.group(1).lower() != "variable" else None,
+        "wind_min_kts": min(lows) if lows else None,
+        "wind_max_kts": max(highs) if highs else None,
+        "gust_kts": max(gusts) if gusts else None,
+        "seas_ft": max(seas) if seas else None,
+        "swell": swell,
+        "advisory": next((a for a in ADVISORIES if a.lower() in found), None),
+    }
+
+
+def parse_zone_forecast(data: dict) -> dict:
+    """The zone forecast response as {"zone", "updated", "periods"}; each
+    period has its name, start and end (ISO, with offset), text and the
+    parse_period fields."""
+    props = data.get("properties", {})
+    periods = []
+    for period in props.get("periods", []):
+        text = period.get("detailedForecast") or ""
+        periods.append({
+            "name": period.get("name"),
+            "start": period.get("startTime"),
+            "end": period.get("endTime"),
+            "text": text,
+            **parse_period(text),
+        })
+    zone = props.get("zone") or ""
+    return {"zone": zone.rsplit("/", 1)[-1], "updated": props.get("updated"), "periods": periods}
+
+
+def period_at(forecast: dict | None, when: datetime) -> dict | None:
+    """The period covering when, a naive local time as forecasts use; None
+    if the forecast doesn't cover it."""
+    for period in (forecast or {}).get("periods", []):
+        try:
+            start = datetime.fromisoformat(period["start"]).replace(tzinfo=None)
+            end = datetime.fromisoformat(period["end"]).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            continue
+        if start <= when < end:
+            return period
+    return None
@@ -1,5 +1,12 @@
-import httpx
-from datetime import datetime, timedelta, timezone
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+from .. import timing
+from .forecast import Forecast, as_forecast, decode_payloads, split_members
+if TYPE_CHECKING:
+    from .http import HttpClient
 
 # Pacific Time (standard offset; DST not handled but sufficient for date comparison)
 PT = timezone(timedelta(hours=-8))
@@ -9,36 +16,122 @@ COASTAL_LAT, COASTAL_LON = 32.77, -117.23
 # El Cajon (inland reference)
 INLAND_LAT, INLAND_LON = 32.79, -116.96
 
-BASE_URL = "https://api.open-meteo.com/v1/forecast"
+# Inland stations usable as thermal references
+INLAND_STATIONS = {
+    "el_cajon": (INLAND_LAT, INLAND_LON),
+    "santee": (32.84, -116.97),
+    "ramona": (33.04, -116.87),
+    "alpine": (32.84, -116.77),
+}
 
+# Points fetched for every report
+REFERENCE_POINTS = {
+    "coastal": (COASTAL_LAT, COASTAL_LON),
+    "inland": (INLAND_LAT, INLAND_LON),
+}
 
-def _fetch_forecast(lat: float, lon: float) -> dict:
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "hourly": "temperature_2m,wind_speed_10m,wind_direction_10m,wind_gusts_10m,dewpoint_2m",
+BASE_URL = "https://api.open-meteo.com/v1/forecast"
+# Past model runs, stitched into a continuous hourly series (2022 onwards)
+ARCHIVE_URL = "https://historical-forecast-api.open-meteo.com/v1/forecast"
+# Ensemble members of several models (GFS, ICON, ECMWF ...), in one request
+ENSEMBLE_URL = "https://ensemble-api.open-meteo.com/v1/ensemble"
+ENSEMBLE_MODELS = ("icon_seamless", "gfs_seamless", "ecmwf_ifs025")
+
+# Longest horizon the forecast API serves
+MAX_FORECAST_DAYS = 16
+
+HOURLY = "temperature_2m,wind_speed_10m,wind_direction_10m,wind_gusts_10m,dewpoint_2m"
+
+# Open-Meteo refreshes its hourly models about once an hour
+FORECAST_TTL = 60 * 60
+
+
+async def fetch_forecasts(client: HttpClient, points: dict[str, tuple[float, float]], days: int = 2) -> dict[str, Forecast]:
+    """Fetch forecasts for several points in one request.
+
+    Open-Meteo accepts comma-separated coordinate lists and answers with one
+    forecast per location, in order, covering days days from today (up to
+    MAX_FORECAST_DAYS). Returns forecasts keyed like points."""
+    params = {**_location_params(points), "forecast_days": days}
+    data = await _get_payloads(client, BASE_URL, params, FORECAST_TTL)
+    return _by_name(points, data)
+
+
+async def fetch_archive(
+    client: HttpClient,
+    points: dict[str, tuple[float, float]],
+    start: date,
+    end: date,
+) -> dict[str, Forecast]:
+    """Fetch past forecasts for several points over start..end (inclusive).
+
+    Same variables and units as fetch_forecasts, from the historical
+    forecast archive. Not cached: the caller stores what it downloads."""
+    params = {**_location_params(points), "start_date": start.isoformat(), "end_date": end.isoformat()}
+    data = await _get_payloads(client, ARCHIVE_URL, params)
+    return _by_name(points, data)
+
+
+async def fetch_ensemble(
+    client: HttpClient,
+    points: dict[str, tuple[float, float]],
+    models: tuple[str, ...] = ENSEMBLE_MODELS,
+) -> dict[str, dict[str, Forecast]]:
+    """Fetch every ensemble member of several models for several points.
+
+    One request covers all points and models. Returns, per point name, a
+    Forecast per member keyed like "member07_gfs025" (see split_members)."""
+    params = {**_location_params(points), "models": ",".join(models), "forecast_days": 2}
+    data = await _get_payloads(client, ENSEMBLE_URL, params, FORECAST_TTL)
+    if len(data) != len(points):
+        raise ValueError(f"expected {len(points)} ensembles from Open-Meteo, got {len(data)}")
+    return {name: split_members(payload) for name, payload in zip(points, data)}
+
+
+async def _get_payloads(client: HttpClient, url: str, params: dict, ttl: float | None = None) -> list[dict]:
+    """One payload per location, decoded by decode_payloads rather than
+    as a whole JSON tree."""
+    body = await client.get_json(url, params=params, ttl=ttl, raw=True)
+    if timing.active() is None:
+        return decode_payloads(body)
+    from .http import source_label
+    with timing.span("parse", source_label(url, params)):
+        return decode_payloads(body)
+
+
+def _location_params(points: dict[str, tuple[float, float]]) -> dict:
+    return {
+        "latitude": ",".join(str(lat) for lat, _ in points.values()),
+        "longitude": ",".join(str(lon) for _, lon in points.values()),
+        "hourly": HOURLY,
         "wind_speed_unit": "kn",
         "temperature_unit": "fahrenheit",
         "timezone": "America/Los_Angeles",
-        "forecast_days": 2,
     }
-    resp = httpx.get(BASE_URL, params=params, timeout=10)
-    resp.raise_for_status()
-    return resp.json()
 
 
-def fetch_coastal_forecast() -> dict:
-    return _fetch_forecast(COASTAL_LAT, COASTAL_LON)
+def _by_name(points: dict, data: list[dict]) -> dict[str, Forecast]:
+    if len(data) != len(points):
+        raise ValueError(f"expected {len(points)} forecasts from Open-Meteo, got {len(data)}")
+    return {name: Forecast.from_payload(payload) for name, payload in zip(points, data)}
+
 
+async def fetch_reference_forecasts(client: HttpClient) -> dict[str, Forecast]:
+    """Coastal and inland forecasts in a single request."""
+    return await fetch_forecasts(client, REFERENCE_POINTS)
 
-def fetch_inland_forecast() -> dict:
-    return _fetch_forecast(INLAND_LAT, INLAND_LON)
 
+async def fetch_coastal_forecast(client: HttpClient) -> Forecast:
+    return (await fetch_forecasts(client, {"coastal": (COASTAL_LAT, COASTAL_LON)}))["coastal"]
 
-def get_hourly_at(forecast: dict, target_hour: int | None = None, target_date: datetime | None = None) -> dict:
+
+async def fetch_inland_forecast(client: HttpClient) -> Forecast:
+    return (await fetch_forecasts(client, {"inland": (INLAND_LAT, INLAND_LON)}))["inland"]
+
+
+def get_hourly_at(forecast: Forecast | dict, target_hour: int | None = None, target_date: datetime | None = None) -> dict:
     """Extract data for a specific hour (0-23) and date, or the current hour."""
-    hourly = forecast["hourly"]
-    times = hourly["time"]
+    forecast = as_forecast(forecast)
 
     if target_hour is None:
         now = datetime.now(PT)
@@ -47,61 +140,37 @@ def get_hourly_at(forecast: dict, target_hour: int | None = None, target_date: d
     if target_date is None:
         target_date = datetime.now(PT)
 
-    for i, t in enumerate(times):
-        dt = datetime.fromisoformat(t)
-        if dt.hour == target_hour and dt.date() == target_date.date():
-            return {
-                "time": t,
-                "hour": dt.hour,
-                "temp_f": hourly["temperature_2m"][i],
-                "wind_kts": hourly["wind_speed_10m"][i],
-                "wind_dir": hourly["wind_direction_10m"][i],
-                "gusts_kts": hourly["wind_gusts_10m"][i],
-                "dewpoint_f": hourly["dewpoint_2m"][i],
-            }
-
-    # Fallback to last available hour
-    i = len(times) - 1
-    dt = datetime.fromisoformat(times[i])
-    return {
-        "time": times[i],
-        "hour": dt.hour,
-        "temp_f": hourly["temperature_2m"][i],
-        "wind_kts": hourly["wind_speed_10m"][i],
-        "wind_dir": hourly["wind_direction_10m"][i],
-        "gusts_kts": hourly["wind_gusts_10m"][i],
-        "dewpoint_f": hourly["dewpoint_2m"][i],
-    }
+    i = forecast.index(target_date.date(), target_hour)
+    if i is None:
+        # Fallback to last available hour
+        i = len(forecast) - 1
+    return forecast.hour(i)
 
 
-def find_best_window(forecast: dict, target_date: datetime | None = None) -> dict:
+def find_best_window(forecast: Forecast | dict, target_date: datetime | None = None) -> dict:
     """Find the best wind window in the forecast for a given date."""
-    hourly = forecast["hourly"]
+    forecast = as_forecast(forecast)
     if target_date is None:
         target_date = datetime.now(PT)
 
+    day = target_date.date()
+    speeds = forecast.column("wind_kts")
     best_i = None
     best_speed = 0
-    for i, speed in enumerate(hourly["wind_speed_10m"]):
-        if speed is not None and speed > best_speed:
-            dt = datetime.fromisoformat(hourly["time"][i])
-            if dt.date() == target_date.date() and 9 <= dt.hour <= 18:
-                best_speed = speed
-                best_i = i
+    for i in forecast.day_range(day):
+        # NaN (missing) never compares greater, so it is skipped like None
+        if speeds[i] > best_speed and 9 <= forecast.times[i].hour <= 18:
+            best_speed = speeds[i]
+            best_i = i
 
     if best_i is None:
         # No daytime wind found — default to 1pm (typical thermal peak)
-        for i, t in enumerate(hourly["time"]):
-            dt = datetime.fromisoformat(t)
-            if dt.date() == target_date.date() and dt.hour == 13:
-                best_i = i
-                break
+        best_i = forecast.index(day, 13)
         if best_i is None:
             best_i = 0
 
-    dt = datetime.fromisoformat(hourly["time"][best_i])
     return {
-        "hour": dt.hour,
+        "hour": forecast.times[best_i].hour,
         "wind_kts": best_speed,
-        "wind_dir": hourly["wind_direction_10m"][best_i],
+        "wind_dir": forecast.value("wind_dir", best_i),
     }
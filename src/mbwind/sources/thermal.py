@@ -1,17 +1,13 @@
+from bisect import bisect_right
+
+from ..profiles import PROFILES
+
+
 def compute_thermal_gradient(coastal_temp_f: float, inland_temp_f: float) -> dict:
     """Compute thermal gradient and classify strength."""
     delta = inland_temp_f - coastal_temp_f
-
-    if delta >= 25:
-        strength = "Very Strong"
-    elif delta >= 18:
-        strength = "Strong"
-    elif delta >= 12:
-        strength = "Moderate"
-    elif delta >= 6:
-        strength = "Weak"
-    else:
-        strength = "None"
+    edges, labels = PROFILES["thermal_strength"]
+    strength = labels[0] if delta != delta else labels[bisect_right(edges, delta)]
 
     return {
         "coastal_temp_f": coastal_temp_f,
@@ -24,11 +20,5 @@ def compute_thermal_gradient(coastal_temp_f: float, inland_temp_f: float) -> dic
 def marine_layer_suppression(temp_f: float, dewpoint_f: float) -> float:
     """Estimate marine layer suppression factor (0-1, where 1 = full suppression).
     A small temp-dewpoint spread means thick marine layer."""
-    spread = temp_f - dewpoint_f
-    if spread < 3:
-        return 0.7  # thick marine layer, significant suppression
-    elif spread < 6:
-        return 0.3
-    elif spread < 10:
-        return 0.1
-    return 0.0  # clear, no suppression
+    edges, factors = PROFILES["marine_layer"]
+    return factors[bisect_right(edges, temp_f - dewpoint_f)]
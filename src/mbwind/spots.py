@@ -0,0 +1,65 @@
+"""Registry of sailing venues: coordinates, references and direction sectors."""
+import json
+from importlib import resources
+from pathlib import Path
+
+from .score import DIRECTION_SECTORS
+from .sources.open_meteo import INLAND_STATIONS
+
+DEFAULT_SPOT = "mission_bay"
+
+
+def _load_file(path: Path) -> dict:
+    if path.suffix == ".toml":
+        try:
+            import tomllib
+        except ImportError:  # Python 3.10
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ValueError("TOML spot files need Python 3.11+ or the tomli package") from None
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path) as f:
+        return json.load(f)
+
+
+def _normalize(raw: dict) -> dict:
+    inland = raw["inland"]
+    if isinstance(inland, str):
+        if inland not in INLAND_STATIONS:
+            raise ValueError(f"spot {raw['id']}: unknown inland station {inland!r}")
+        inland = INLAND_STATIONS[inland]
+    directions = raw.get("directions") or DIRECTION_SECTORS
+    return {
+        "id": raw["id"],
+        "name": raw.get("name", raw["id"]),
+        "coastal": (float(raw["lat"]), float(raw["lon"])),
+        "inland": (float(inland[0]), float(inland[1])),
+        "tide_station": raw.get("tide_station") or None,
+        "marine_zone": raw.get("marine_zone") or None,
+        "directions": tuple((lo, hi, points) for lo, hi, points in directions),
+    }
+
+
+def load_spots(path: str | Path | None = None) -> dict[str, dict]:
+    """Load the spot registry, keyed by spot id, in file order.
+
+    Reads the bundled registry by default; path may point at a JSON or TOML
+    file with the same layout (a top-level "spots" list)."""
+    if path is None:
+        raw = json.loads(resources.files("mbwind").joinpath("data/spots.json").read_text())
+    else:
+        raw = _load_file(Path(path))
+    spots = {}
+    for entry in raw["spots"]:
+        spot = _normalize(entry)
+        spots[spot["id"]] = spot
+    return spots
+
+
+def get_spot(spot_id: str = DEFAULT_SPOT, spots: dict[str, dict] | None = None) -> dict:
+    spots = spots if spots is not None else load_spots()
+    if spot_id not in spots:
+        raise KeyError(f"unknown spot {spot_id!r}; known: {', '.join(spots)}")
+    return spots[spot_id]
@@ -0,0 +1,449 @@
+"""Local SQLite store of forecasts and wind observations.
+
+Holds the archive history backtests download, plus every forecast snapshot
+and observation a run fetches, so later runs can compare forecasts with
+what happened, show trends and start warm. Valid times are local
+"YYYY-MM-DDTHH:MM" strings, as Open-Meteo and CO-OPS both report them, so
+forecasts and observations join on equality; issue and fetch times are
+Unix seconds.
+"""
+import math
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from .fetch import grid_cell, OPTIONAL_DEFAULTS
+from .score import direction_name
+from .sources.cache import default_cache_dir
+from .sources.forecast import Forecast
+
+FORECAST_FIELDS = ("temp_f", "wind_kts", "wind_dir", "gusts_kts", "dewpoint_f")
+OBSERVATION_FIELDS = ("wind_kts", "wind_dir", "gust_kts")
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS forecasts (
+    point TEXT NOT NULL,
+    time TEXT NOT NULL,
+    {", ".join(f"{f} REAL" for f in FORECAST_FIELDS)},
+    PRIMARY KEY (point, time)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS observations (
+    station TEXT NOT NULL,
+    time TEXT NOT NULL,
+    {", ".join(f"{f} REAL" for f in OBSERVATION_FIELDS)},
+    PRIMARY KEY (station, time)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS water_levels (
+    station TEXT NOT NULL,
+    time TEXT NOT NULL,
+    water_level_ft REAL,
+    PRIMARY KEY (station, time)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS forecast_snapshots (
+    source TEXT NOT NULL,
+    point TEXT NOT NULL,
+    valid_time TEXT NOT NULL,
+    issued INTEGER NOT NULL,
+    {", ".join(f"{f} REAL" for f in FORECAST_FIELDS)},
+    PRIMARY KEY (source, point, valid_time, issued)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS forecast_snapshots_valid ON forecast_snapshots (source, valid_time);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS ingested (
+    source TEXT NOT NULL,
+    key TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    PRIMARY KEY (source, key, start_date, end_date)
+);
+"""
+
+# Open-Meteo updates hourly, so snapshots are bucketed by the hour fetched
+ISSUE_BUCKET = 60 * 60
+# Snapshots older than this keep only their latest issue per valid hour ...
+COMPACT_AFTER_DAYS = 7
+# ... and are dropped entirely after this; observations are kept
+SNAPSHOT_RETENTION_DAYS = 365
+MAINTENANCE_INTERVAL = 24 * 60 * 60
+# How old a stored forecast may be to stand in when upstream is unreachable
+STALE_MAX_AGE = 2 * 24 * 60 * 60
+
+# Change over the trend window (knots) that counts as building or easing
+TREND_KTS = 2.0
+TREND_HOURS = 2
+# Water levels used for the tide's rate of change
+TIDE_RATE_HOURS = 1
+# Stored readings older than this are not shown as the current observation
+OBSERVATION_MAX_AGE = 60 * 60
+
+
+def default_store_path() -> Path:
+    return default_cache_dir() / "history.sqlite3"
+
+
+def _real(x: float | None) -> float | None:
+    return None if x is None or math.isnan(x) else x
+
+
+class HistoryStore:
+    """Hourly forecasts keyed by grid point and observations keyed by station.
+
+    Rows are upserted, so re-downloading a range is harmless. Completed
+    downloads are recorded per (source, key, date range) so later runs can
+    skip them."""
+
+    def __init__(self, path: Path | str | None = None):
+        self.path = Path(path) if path is not None else default_store_path()
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=5)
+        # WAL lets the server keep writing while CLI runs and backtests read
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def put_forecast(self, point: str, forecast: Forecast) -> int:
+        columns = [forecast.columns.get(f) for f in FORECAST_FIELDS]
+        rows = (
+            (point, t.isoformat(timespec="minutes"), *(_real(c[i]) if c is not None else None for c in columns))
+            for i, t in enumerate(forecast.times)
+        )
+        with self.db:
+            cur = self.db.executemany(
+                f"INSERT OR REPLACE INTO forecasts VALUES (?, ?{', ?' * len(FORECAST_FIELDS)})", rows
+            )
+        return cur.rowcount
+
+    def put_observations(self, station: str, records: list[dict]) -> int:
+        rows = ((station, r["time"], *(r[f] for f in OBSERVATION_FIELDS)) for r in records)
+        with self.db:
+            cur = self.db.executemany(
+                f"INSERT OR REPLACE INTO observations VALUES (?, ?{', ?' * len(OBSERVATION_FIELDS)})", rows
+            )
+        return cur.rowcount
+
+    def put_water_levels(self, station: str, records: list[dict]) -> int:
+        rows = ((station, r["time"], r["water_level_ft"]) for r in records)
+        with self.db:
+            cur = self.db.executemany("INSERT OR REPLACE INTO water_levels VALUES (?, ?, ?)", rows)
+        return cur.rowcount
+
+    def water_levels_since(self, station: str, start: str) -> list[tuple]:
+        """(time, water_level_ft) rows at or after start, in time order."""
+        return self.db.execute(
+            "SELECT time, water_level_ft FROM water_levels WHERE station = ? AND time >= ? ORDER BY time",
+            (station, start),
+        ).fetchall()
+
+    def last_time(self, table: str, station: str) -> datetime | None:
+        """Time of the newest stored row for a station in observations or water_levels."""
+        if table not in ("observations", "water_levels"):
+            raise ValueError(f"no per-station table {table!r}")
+        row = self.db.execute(f"SELECT max(time) FROM {table} WHERE station = ?", (station,)).fetchone()
+        return datetime.fromisoformat(row[0]) if row[0] else None
+
+    def get_meta(self, key: str) -> str | None:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def mark_ingested(self, source: str, key: str, start: str, end: str) -> None:
+        with self.db:
+            self.db.execute("INSERT OR IGNORE INTO ingested VALUES (?, ?, ?, ?)", (source, key, start, end))
+
+    def is_ingested(self, source: str, key: str, start: str, end: str) -> bool:
+        row = self.db.execute(
+            "SELECT 1 FROM ingested WHERE source = ? AND key = ? AND start_date = ? AND end_date = ?",
+            (source, key, start, end),
+        ).fetchone()
+        return row is not None
+
+    def joined(self, coastal: str, inland: str, station: str, start: str = "", end: str = "~") -> list[tuple]:
+        """Hours with a coastal forecast, an inland forecast and an observation.
+
+        Rows are (time, coastal temp_f, wind_kts, wind_dir, gusts_kts,
+        dewpoint_f, inland temp_f, observed wind_kts) for start <= time < end,
+        in time order."""
+        return self.db.execute(
+            """
+            SELECT c.time, c.temp_f, c.wind_kts, c.wind_dir, c.gusts_kts, c.dewpoint_f, i.temp_f, o.wind_kts
+            FROM forecasts c
+            JOIN forecasts i ON i.point = ? AND i.time = c.time
+            JOIN observations o ON o.station = ? AND o.time = c.time
+            WHERE c.point = ? AND c.time >= ? AND c.time < ?
+            ORDER BY c.time
+            """,
+            (inland, station, coastal, start, end),
+        ).fetchall()
+
+    def hours(self, coastal: str, inland: str, station: str, start: str = "", end: str = "~") -> sqlite3.Cursor:
+        """Every coastal forecast hour for start <= time < end, as a cursor
+        read lazily in time order.
+
+        Rows are shaped like joined()'s, with None for the inland temperature
+        and observed wind where there is none."""
+        return self.db.execute(
+            """
+            SELECT c.time, c.temp_f, c.wind_kts, c.wind_dir, c.gusts_kts, c.dewpoint_f, i.temp_f, o.wind_kts
+            FROM forecasts c
+            LEFT JOIN forecasts i ON i.point = ? AND i.time = c.time
+            LEFT JOIN observations o ON o.station = ? AND o.time = c.time
+            WHERE c.point = ? AND c.time >= ? AND c.time < ?
+            ORDER BY c.time
+            """,
+            (inland, station, coastal, start, end),
+        )
+
+    def put_snapshot(self, source: str, point: str, issued: int, forecast: Forecast) -> int:
+        """Append a forecast as issued at `issued`; repeats within a bucket are ignored."""
+        columns = [forecast.columns.get(f) for f in FORECAST_FIELDS]
+        rows = (
+            (source, point, t.isoformat(timespec="minutes"), issued,
+             *(_real(c[i]) if c is not None else None for c in columns))
+            for i, t in enumerate(forecast.times)
+        )
+        with self.db:
+            cur = self.db.executemany(
+                f"INSERT OR IGNORE INTO forecast_snapshots VALUES (?, ?, ?, ?{', ?' * len(FORECAST_FIELDS)})", rows
+            )
+        return cur.rowcount
+
+    def latest_snapshot(self, source: str, point: str, since: int = 0) -> tuple[int, Forecast] | None:
+        """The most recent snapshot issued at or after `since`, with its issue time."""
+        row = self.db.execute(
+            "SELECT max(issued) FROM forecast_snapshots WHERE source = ? AND point = ? AND issued >= ?",
+            (source, point, since),
+        ).fetchone()
+        if row[0] is None:
+            return None
+        issued = row[0]
+        rows = self.db.execute(
+            f"SELECT valid_time, {', '.join(FORECAST_FIELDS)} FROM forecast_snapshots "
+            "WHERE source = ? AND point = ? AND issued = ? ORDER BY valid_time",
+            (source, point, issued),
+        ).fetchall()
+        times = [datetime.fromisoformat(r[0]) for r in rows]
+        values = {f: [r[k + 1] for r in rows] for k, f in enumerate(FORECAST_FIELDS)}
+        return issued, Forecast.from_columns(times, values, {"issued": issued})
+
+    def observations_since(self, station: str, start: str) -> list[tuple]:
+        """(time, wind_kts, wind_dir, gust_kts) rows at or after start, in time order."""
+        return self.db.execute(
+            f"SELECT time, {', '.join(OBSERVATION_FIELDS)} FROM observations "
+            "WHERE station = ? AND time >= ? ORDER BY time",
+            (station, start),
+        ).fetchall()
+
+    def compact(self, now: float | None = None) -> dict:
+        """Apply snapshot retention and compaction, then checkpoint the WAL.
+
+        Snapshots valid more than COMPACT_AFTER_DAYS ago keep only their
+        latest issue (the best forecast of that hour); those older than
+        SNAPSHOT_RETENTION_DAYS are deleted. Returns the rows removed."""
+        now = datetime.fromtimestamp(now if now is not None else time.time())
+        compact_before = (now - timedelta(days=COMPACT_AFTER_DAYS)).isoformat(timespec="minutes")
+        drop_before = (now - timedelta(days=SNAPSHOT_RETENTION_DAYS)).isoformat(timespec="minutes")
+        with self.db:
+            dropped = self.db.execute(
+                "DELETE FROM forecast_snapshots WHERE valid_time < ?", (drop_before,)
+            ).rowcount
+            compacted = self.db.execute(
+                """
+                DELETE FROM forecast_snapshots
+                WHERE valid_time < ? AND (source, point, valid_time, issued) NOT IN (
+                    SELECT source, point, valid_time, max(issued) FROM forecast_snapshots
+                    WHERE valid_time < ? GROUP BY source, point, valid_time
+                )
+                """,
+                (compact_before, compact_before),
+            ).rowcount
+        self.set_meta("last_compaction", str(int(now.timestamp())))
+        self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return {"dropped": dropped, "compacted": compacted}
+
+    def maybe_compact(self, now: float | None = None) -> None:
+        """Compact if the last compaction is more than MAINTENANCE_INTERVAL old."""
+        now = now if now is not None else time.time()
+        last = self.get_meta("last_compaction")
+        if last is None or now - int(last) >= MAINTENANCE_INTERVAL:
+            self.compact(now)
+
+
+# Series kind from fetch_spots -> table its readings are stored in
+SERIES_TABLES = {"wind_series": "observations", "water_level_series": "water_levels"}
+
+
+def _observation_record(obs: dict) -> dict:
+    return {
+        "time": obs["time"].replace(" ", "T"),
+        "wind_kts": obs["speed_kts"],
+        "wind_dir": obs.get("direction_deg"),
+        "gust_kts": obs["gust_kts"],
+    }
+
+
+def series_since(store: HistoryStore, spots: list[dict]) -> dict[tuple[str, str], datetime | None]:
+    """Last stored reading per (series kind, station), for fetch_spots' since."""
+    return {
+        (kind, spot["tide_station"]): store.last_time(table, spot["tide_station"])
+        for spot in spots if spot["tide_station"]
+        for kind, table in SERIES_TABLES.items()
+    }
+
+
+def record_run(store: HistoryStore, spots: list[dict], data: dict[str, dict], fetched: float | None = None) -> None:
+    """Record what a run fetched (fetch_spots' result): forecast snapshots per
+    grid point, and the new observation series (or latest readings) per station."""
+    fetched = fetched if fetched is not None else time.time()
+    issued = int(fetched) // ISSUE_BUCKET * ISSUE_BUCKET
+    for spot in spots:
+        spot_data = data[spot["id"]]
+        for role in ("coastal", "inland"):
+            store.put_snapshot("open-meteo", grid_cell(spot[role]), issued, spot_data["forecasts"][role])
+        station = spot["tide_station"]
+        if not station:
+            continue
+        store.put_observations(station, spot_data.get("wind_series", []))
+        store.put_water_levels(station, spot_data.get("water_level_series", []))
+        obs = spot_data["observed_wind"]
+        if obs and obs.get("time"):
+            store.put_observations(station, [_observation_record(obs)])
+        tide = spot_data["tide_data"]
+        if tide and tide.get("time"):
+            store.put_water_levels(station, [{"time": tide["time"].replace(" ", "T"), "water_level_ft": tide["water_level_ft"]}])
+    store.maybe_compact(fetched)
+
+
+def _fit(series: list[tuple[str, float | None]], now: datetime, min_span: float) -> tuple[float, float] | None:
+    """Least-squares slope (per hour) through (time, value) readings, and the
+    hours they span; None with fewer than two readings min_span hours apart."""
+    points = [((datetime.fromisoformat(t) - now).total_seconds() / 3600, v) for t, v in series if v is not None]
+    if len(points) < 2 or points[-1][0] - points[0][0] < min_span:
+        return None
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / sum((x - mean_x) ** 2 for x, _ in points)
+    return slope, points[-1][0] - points[0][0]
+
+
+def _start(now: datetime, hours: float) -> str:
+    return (now - timedelta(hours=hours)).isoformat(timespec="minutes")
+
+
+def wind_trend(store: HistoryStore, station: str, now: datetime | None = None, hours: float = TREND_HOURS) -> dict | None:
+    """How observed wind has changed over the last `hours`, from recorded readings.
+
+    Fits a least-squares line through the readings and reports its change
+    over the span they cover, as "building", "easing" or "steady". None
+    with fewer than two readings at least half an hour apart."""
+    now = now or datetime.now()
+    rows = store.observations_since(station, _start(now, hours))
+    fit = _fit([(t, kts) for t, kts, _, _ in rows], now, 0.5)
+    if fit is None:
+        return None
+    slope, span = fit
+    change = round(slope * span, 1)
+    if change >= TREND_KTS:
+        trend = "building"
+    elif change <= -TREND_KTS:
+        trend = "easing"
+    else:
+        trend = "steady"
+    return {"trend": trend, "change_kts": change, "hours": round(span, 1)}
+
+
+def tide_rate(store: HistoryStore, station: str, now: datetime | None = None, hours: float = TIDE_RATE_HOURS) -> float | None:
+    """Observed rate of change of the water level (ft/hour) over the last
+    `hours`; None without at least half an hour of readings."""
+    now = now or datetime.now()
+    fit = _fit(store.water_levels_since(station, _start(now, hours)), now, 0.5)
+    return round(fit[0], 2) if fit else None
+
+
+def attach_observations(store: HistoryStore, spots: list[dict], data: dict[str, dict], now: datetime | None = None) -> None:
+    """Complete fetch_spots' result from the store, after record_run.
+
+    Fills observed_wind and tide_data from the newest stored readings
+    (within OBSERVATION_MAX_AGE) where the fetch left them empty, as
+    incremental polling does, and sets "observed_trend" (see wind_trend)
+    and "tide_rate" (see tide_rate) per spot."""
+    now = now or datetime.now()
+    recent = _start(now, OBSERVATION_MAX_AGE / 3600)
+    for spot in spots:
+        station = spot["tide_station"]
+        if not station:
+            continue
+        spot_data = data[spot["id"]]
+        if spot_data.get("observed_wind") is None:
+            rows = store.observations_since(station, recent)
+            if rows:
+                t, kts, deg, gust = rows[-1]
+                spot_data["observed_wind"] = {
+                    "speed_kts": kts,
+                    "gust_kts": gust,
+                    "direction": direction_name(deg) if deg is not None else "",
+                    "direction_deg": deg,
+                    "time": t.replace("T", " "),
+                }
+        if spot_data.get("tide_data") is None:
+            levels = [(t, v) for t, v in store.water_levels_since(station, recent) if v is not None]
+            if levels:
+                t, level = levels[-1]
+                spot_data["tide_data"] = {"water_level_ft": level, "time": t.replace("T", " ")}
+        spot_data["observed_trend"] = wind_trend(store, station, now)
+        spot_data["tide_rate"] = tide_rate(store, station, now)
+
+
+def load_snapshot(
+    store: HistoryStore,
+    spots: list[dict],
+    max_age: float,
+    now: float | None = None,
+    stale: bool = False,
+) -> dict[str, dict] | None:
+    """Rebuild fetch_spots' result from the store, for a warm start.
+
+    Uses the latest forecast snapshots issued within max_age seconds and
+    the latest recorded observations; tide predictions and marine data are
+    not stored and take their defaults. None unless every spot's forecasts
+    are there. With stale, each spot's "stale" says when the oldest
+    snapshot used was issued, as fetch_spots reports expired responses;
+    that is its issue time, rounded down to the hour (ISSUE_BUCKET), so it
+    can be up to an hour before the forecast was actually fetched."""
+    now = now if now is not None else time.time()
+    # Issue times are bucketed, so the bucket max_age reaches into counts
+    since = int(now - max_age) // ISSUE_BUCKET * ISSUE_BUCKET
+    by_spot = {}
+    oldest = now
+    for spot in spots:
+        forecasts = {}
+        for role in ("coastal", "inland"):
+            latest = store.latest_snapshot("open-meteo", grid_cell(spot[role]), since)
+            if latest is None:
+                return None
+            oldest = min(oldest, latest[0])
+            forecasts[role] = latest[1]
+        by_spot[spot["id"]] = {"forecasts": forecasts, **OPTIONAL_DEFAULTS, "stale": None}
+    if stale:
+        info = {"as_of": datetime.fromtimestamp(oldest).isoformat(timespec="minutes"), "sources": ["Open-Meteo"]}
+        for data in by_spot.values():
+            data["stale"] = info
+    attach_observations(store, spots, by_spot, datetime.fromtimestamp(now))
+    return by_spot
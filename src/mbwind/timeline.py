@@ -0,0 +1,121 @@
+"""Hour-by-hour scoring of a forecast day and best-window search."""
+from collections import deque
+from datetime import date
+
+from .batch import score_batch_sports, to_list
+from .sources.forecast import Forecast
+from .sources.nws import period_at
+from .sources.thermal import compute_thermal_gradient, marine_layer_suppression
+
+# Hours a session can be planned in: windows start at 9am and end by 6pm
+SESSION_START, SESSION_END = 9, 18
+WINDOW_HOURS = 3
+# Hours worth showing in a day's timeline
+DAYLIGHT = range(6, 21)
+
+
+def score_timeline(
+    coastal: Forecast,
+    inland: Forecast,
+    day: date,
+    sport: str = "laser",
+    direction_sectors=None,
+) -> list[dict]:
+    """Score every forecast hour of a day with the full confidence model.
+
+    The thermal gradient is computed per hour against the inland forecast
+    for the same hour. Returns one row per hour, in time order."""
+    return score_timeline_sports(coastal, inland, day, (sport,), direction_sectors)[sport]
+
+
+def score_timeline_sports(
+    coastal: Forecast,
+    inland: Forecast,
+    day: date,
+    sports=("laser",),
+    direction_sectors=None,
+    marine: dict | None = None,
+) -> dict[str, list[dict]]:
+    """score_timeline for several sports: the hours are prepared once and
+    scored for every sport in one batch call. Returns {sport: rows}.
+
+    marine is the parsed NWS zone forecast, if any; each row gets the
+    advisory of the period covering its hour, and is scored with it."""
+    indices = list(coastal.day_range(day))
+    rows = []
+    for i in indices:
+        rec = coastal.hour(i)
+        j = inland.index(day, rec["hour"])
+        inland_temp = inland.value("temp_f", j) if j is not None else None
+        if rec["temp_f"] is not None and inland_temp is not None:
+            delta = compute_thermal_gradient(rec["temp_f"], inland_temp)["delta_f"]
+        else:
+            delta = None
+        if rec["temp_f"] is not None and rec["dewpoint_f"] is not None:
+            ml = marine_layer_suppression(rec["temp_f"], rec["dewpoint_f"])
+        else:
+            ml = 0.0
+        rec["thermal_delta_f"] = delta
+        rec["marine_layer"] = ml
+        period = period_at(marine, coastal.times[i]) if marine else None
+        rec["advisory"] = period["advisory"] if period else None
+        rows.append(rec)
+
+    scored = score_batch_sports(
+        [r["wind_kts"] for r in rows],
+        [r["wind_dir"] for r in rows],
+        [r["gusts_kts"] for r in rows],
+        [r["thermal_delta_f"] for r in rows],
+        [r["marine_layer"] for r in rows],
+        [r["hour"] for r in rows],
+        sports=tuple(sports),
+        direction_sectors=direction_sectors,
+        advisory=[r["advisory"] for r in rows] if marine else None,
+    )
+    return {
+        sport: [
+            {**row, "score": score, "recommendation": rec}
+            for row, score, rec in zip(rows, to_list(scored[sport]["score"]), to_list(scored[sport]["recommendation"]))
+        ]
+        for sport in sports
+    }
+
+
+def best_window(
+    timeline: list[dict],
+    hours: int = WINDOW_HOURS,
+    start: int = SESSION_START,
+    end: int = SESSION_END,
+) -> dict | None:
+    """Best run of `hours` consecutive hours between start and end (exclusive).
+
+    Uses a sliding-window sum, so the search is linear in the number of hours.
+    Returns the window's start/end hour and mean score, or None if the
+    timeline has no run of that length inside the session."""
+    best = None
+    window = deque()  # scores of the consecutive in-session hours ending now
+    total = 0
+    prev = None
+    for row in timeline:
+        h = row["hour"]
+        in_session = start <= h < end
+        if not in_session or (prev is not None and h != prev + 1):
+            window.clear()
+            total = 0
+        prev = h if in_session else None
+        if not in_session:
+            continue
+        window.append(row["score"])
+        total += row["score"]
+        if len(window) > hours:
+            total -= window.popleft()
+        if len(window) == hours and (best is None or total > best[0]):
+            best = (total, h - hours + 1)
+    if best is None:
+        return None
+    total, first = best
+    return {
+        "start_hour": first,
+        "end_hour": first + hours,
+        "mean_score": round(total / hours),
+    }
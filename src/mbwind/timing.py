@@ -0,0 +1,119 @@
+"""Timing spans and counters for --profile.
+
+Instrumented code calls span() and count() unconditionally; until start()
+installs a Profile they return a shared no-op, so an unprofiled run pays
+one global lookup per call. Spans carry a name (the phase: a fetch stage,
+"score", "render", ...) and a source label, and are summed per pair.
+Nothing here imports beyond the standard library.
+"""
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+_NULL = nullcontext()
+_active = None
+
+
+class Profile:
+    """Spans and counters recorded during one run."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: list[dict] = []
+        self.counters: dict[tuple[str, str], int] = {}
+
+    def add(self, name: str, seconds: float, source: str = "", start: float | None = None) -> None:
+        start = start if start is not None else time.perf_counter() - seconds
+        self.spans.append({"name": name, "source": source, "start": start - self.started, "seconds": seconds})
+
+    @contextmanager
+    def span(self, name: str, source: str = ""):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, source, start)
+
+    def count(self, name: str, source: str = "", n: int = 1) -> None:
+        self.counters[(name, source)] = self.counters.get((name, source), 0) + n
+
+    def summary(self) -> list[dict]:
+        """Spans summed per (name, source), in order of first occurrence."""
+        rows: dict[tuple[str, str], dict] = {}
+        for s in self.spans:
+            row = rows.setdefault((s["name"], s["source"]), {
+                "name": s["name"], "source": s["source"], "count": 0, "seconds": 0.0, "max_seconds": 0.0,
+            })
+            row["count"] += 1
+            row["seconds"] += s["seconds"]
+            row["max_seconds"] = max(row["max_seconds"], s["seconds"])
+        return list(rows.values())
+
+    def to_json(self) -> dict:
+        return {
+            "wall_seconds": time.perf_counter() - self.started,
+            "phases": self.summary(),
+            "counters": [{"name": n, "source": s, "value": v} for (n, s), v in self.counters.items()],
+            "spans": self.spans,
+        }
+
+    def to_openmetrics(self) -> str:
+        """The summary and counters in OpenMetrics text format."""
+        lines = [
+            "# TYPE mbwind_phase_seconds counter",
+            "# UNIT mbwind_phase_seconds seconds",
+            "# HELP mbwind_phase_seconds Time spent per phase and source.",
+        ]
+        summary = self.summary()
+        for row in summary:
+            lines.append(f"mbwind_phase_seconds_total{_labels(row)} {row['seconds']:.6f}")
+        lines += ["# TYPE mbwind_phase_calls counter", "# HELP mbwind_phase_calls Spans recorded per phase and source."]
+        for row in summary:
+            lines.append(f"mbwind_phase_calls_total{_labels(row)} {row['count']}")
+        lines += ["# TYPE mbwind_events counter", "# HELP mbwind_events Counted events (cache hits, misses, ...)."]
+        for (name, source), value in self.counters.items():
+            lines.append(f"mbwind_events_total{_labels({'name': name, 'source': source})} {value}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(row: dict) -> str:
+    def escape(v: str) -> str:
+        return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'{{name="{escape(row["name"])}",source="{escape(row["source"])}"}}'
+
+
+def start() -> Profile:
+    """Start recording; spans and counts go to the returned Profile."""
+    global _active
+    _active = Profile()
+    return _active
+
+
+def stop() -> Profile | None:
+    global _active
+    profile, _active = _active, None
+    return profile
+
+
+def active() -> Profile | None:
+    return _active
+
+
+def span(name: str, source: str = ""):
+    """Context manager timing a phase, when profiling."""
+    return _NULL if _active is None else _active.span(name, source)
+
+
+def count(name: str, source: str = "", n: int = 1) -> None:
+    if _active is not None:
+        _active.count(name, source, n)
+
+
+def dump(profile: Profile, path: str) -> None:
+    """Write JSON for a .json path, OpenMetrics text otherwise."""
+    with open(path, "w") as f:
+        if path.endswith(".json"):
+            json.dump(profile.to_json(), f, indent=2)
+        else:
+            f.write(profile.to_openmetrics())
@@ -0,0 +1,292 @@
+"""Watch mode: keep reports current as upstream data changes.
+
+Each source is polled by its own asyncio task at the cadence it updates
+upstream (CADENCES): NOAA observations every 6 minutes, the NWS marine
+zone forecast every 30 minutes, Open-Meteo hourly, tide predictions daily.
+These are the response cache lifetimes, so each poll is a conditional
+request that is usually answered 304. A poll whose result matches what is
+held changes nothing; otherwise only the spots that use that forecast
+cell, station or zone are rescored, and the caller redraws. Between polls
+every task is asleep.
+"""
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Callable
+
+from .fetch import grid_cell, series_begin, OPTIONAL_DEFAULTS, REQUEST_TIMEOUT
+from .nowcast import nowcast_spots
+from .report import build_report
+from .sources.forecast import Forecast
+from .sources.noaa import (
+    fetch_tide_data, fetch_tide_predictions, fetch_wind_observation, fetch_marine_forecast,
+    fetch_wind_series, fetch_water_level_series, OBSERVATION_TTL, PREDICTIONS_TTL, MARINE_TTL,
+)
+from .sources.open_meteo import fetch_forecasts, FORECAST_TTL
+from .store import HistoryStore, record_run, attach_observations, SERIES_TABLES
+from .timeline import WINDOW_HOURS
+
+if TYPE_CHECKING:
+    from .sources.http import HttpClient
+
+# Seconds between polls of each feed
+CADENCES = {
+    "forecasts": FORECAST_TTL,
+    "observations": OBSERVATION_TTL,
+    "marine_forecast": MARINE_TTL,
+    "tide_predictions": PREDICTIONS_TTL,
+}
+# A failed poll is retried after this long (or its cadence, if shorter)
+RETRY_AFTER = 60
+# Polls finishing this close together are scored and drawn once
+SETTLE = 0.5
+
+
+def same(a, b) -> bool:
+    """Whether two fetched values are equal, comparing Forecasts by content
+    (NaN included) rather than identity."""
+    if isinstance(a, Forecast) and isinstance(b, Forecast):
+        return (
+            a.times == b.times
+            and a.columns.keys() == b.columns.keys()
+            and all(a.columns[k].tobytes() == b.columns[k].tobytes() for k in a.columns)
+        )
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(same(a[k], b[k]) for k in a)
+    return a == b
+
+
+class Watcher:
+    """Latest data and reports for some spots, updated feed by feed.
+
+    on_update(reports, watcher) is called with the reports (by spot id, in
+    spot order) after each change. hour=None follows the clock, and every
+    report is rescored when the hour (or day) turns. With a history store,
+    observations are polled as series and recorded, and the forecasts are
+    nowcast-corrected as in a one-shot run."""
+
+    def __init__(
+        self,
+        spots: list[dict],
+        on_update: Callable[[dict[str, dict], Watcher], None],
+        sport: str = "laser",
+        hour: int | None = None,
+        tomorrow: bool = False,
+        window: int = WINDOW_HOURS,
+        store: HistoryStore | None = None,
+        nowcast: bool = True,
+    ):
+        self.spots = {spot["id"]: spot for spot in spots}
+        self.on_update = on_update
+        self.sport = sport
+        self.hour = hour
+        self.tomorrow = tomorrow
+        self.window = window
+        self.store = store
+        self.nowcast = nowcast
+        self.raw: dict[str, dict] = {sid: dict(OPTIONAL_DEFAULTS) for sid in self.spots}
+        self.reports: dict[str, dict] = {}
+        self.polled: dict[str, datetime] = {}
+        self.errors: dict[str, str] = {}
+        # The local date the clock last saw, so a new day can be noticed
+        self.day: date = datetime.now().date()
+        self._dirty: set[str] = set()
+        self._changed = asyncio.Event()
+
+    def target(self, now: datetime | None = None) -> tuple[int, datetime]:
+        """The (hour, date) reports are scored for, as the one-shot CLI picks them."""
+        now = now or datetime.now().astimezone()
+        day = now + timedelta(days=1) if self.tomorrow else now
+        if self.hour is not None:
+            return self.hour, day
+        return (13 if self.tomorrow else now.hour), day
+
+    # Feeds: each fetches one kind of data for every spot and returns
+    # {spot id: {key: value}} for apply()
+
+    async def _forecasts(self, client: HttpClient) -> dict[str, dict]:
+        points = {}
+        for spot in self.spots.values():
+            for point in (spot["coastal"], spot["inland"]):
+                points.setdefault(grid_cell(point), point)
+        forecasts = await fetch_forecasts(client, points)
+        return {
+            sid: {"forecasts": {
+                "coastal": forecasts[grid_cell(spot["coastal"])],
+                "inland": forecasts[grid_cell(spot["inland"])],
+            }}
+            for sid, spot in self.spots.items()
+        }
+
+    async def _per_key(self, client: HttpClient, field: str, fetchers: dict[str, Callable]) -> dict[str, dict]:
+        """Run each fetcher (data key -> coroutine function of the client and
+        a station or zone) once per distinct value of the spots' field. A
+        failed fetch keeps the value already held; raises only if all fail."""
+        values = sorted({spot[field] for spot in self.spots.values() if spot[field]})
+        jobs = {(kind, v): fn(client, v) for v in values for kind, fn in fetchers.items()}
+        results = dict(zip(jobs, await asyncio.gather(*jobs.values(), return_exceptions=True)))
+        failed = [r for r in results.values() if isinstance(r, BaseException)]
+        if failed and len(failed) == len(results):
+            raise failed[0]
+        updates = {}
+        for sid, spot in self.spots.items():
+            for kind in fetchers:
+                key = (kind, spot[field])
+                if key in results and not isinstance(results[key], BaseException):
+                    updates.setdefault(sid, {})[kind] = results[key]
+        return updates
+
+    async def _observations(self, client: HttpClient) -> dict[str, dict]:
+        if self.store is None:
+            updates = await self._per_key(client, "tide_station", {
+                "observed_wind": fetch_wind_observation,
+                "tide_data": fetch_tide_data,
+            })
+            # fetch_wind_observation answers None on failure: keep the last reading
+            return {sid: {k: v for k, v in u.items() if v is not None} for sid, u in updates.items()}
+        last = self.store.last_time
+        updates = await self._per_key(client, "tide_station", {
+            "wind_series": lambda c, s: fetch_wind_series(c, s, series_begin(last(SERIES_TABLES["wind_series"], s))),
+            "water_level_series": lambda c, s: fetch_water_level_series(
+                c, s, series_begin(last(SERIES_TABLES["water_level_series"], s))
+            ),
+        })
+        # Only new readings count as a change; an empty poll leaves the spot alone
+        return {
+            sid: {kind: rows for kind, rows in u.items() if rows}
+            for sid, u in updates.items() if any(u.values())
+        }
+
+    async def _tide_predictions(self, client: HttpClient) -> dict[str, dict]:
+        return await self._per_key(client, "tide_station", {"tide_predictions": fetch_tide_predictions})
+
+    async def _marine_forecast(self, client: HttpClient) -> dict[str, dict]:
+        return await self._per_key(client, "marine_zone", {"marine_forecast": fetch_marine_forecast})
+
+    def apply(self, updates: dict[str, dict]) -> set[str]:
+        """Merge a feed's result; returns (and marks dirty) the spots it changed."""
+        changed = set()
+        for sid, values in updates.items():
+            held = self.raw[sid]
+            for key, value in values.items():
+                if key not in held or not same(held[key], value):
+                    held[key] = value
+                    changed.add(sid)
+        if changed:
+            self._dirty |= changed
+            self._changed.set()
+        return changed
+
+    def touch(self, spot_ids=None) -> None:
+        """Mark spots (default: all) for rescoring, e.g. when the hour turns."""
+        self._dirty |= set(spot_ids if spot_ids is not None else self.spots)
+        self._changed.set()
+
+    def rebuild(self, now: datetime | None = None) -> set[str]:
+        """Rescore the dirty spots that have a forecast; returns their ids."""
+        ready = [sid for sid in self._dirty if "forecasts" in self.raw[sid]]
+        self._dirty -= set(ready)
+        if not ready:
+            return set()
+        spots = [self.spots[sid] for sid in ready]
+        data = {sid: {**self.raw[sid], "forecasts": dict(self.raw[sid]["forecasts"])} for sid in ready}
+        if self.store is not None:
+            try:
+                record_run(self.store, spots, data)
+                attach_observations(self.store, spots, data)
+                if self.nowcast:
+                    nowcast_spots(self.store, spots, data)
+            except (OSError, sqlite3.Error) as e:
+                self.errors["history"] = str(e)
+            for sid in ready:
+                # Recorded; the next poll only brings newer readings
+                self.raw[sid]["wind_series"] = []
+                self.raw[sid]["water_level_series"] = []
+        hour, day = self.target(now)
+        for sid in ready:
+            self.reports[sid] = build_report(data[sid], self.spots[sid], hour, day, self.sport, self.window)
+        self.reports = {sid: self.reports[sid] for sid in self.spots if sid in self.reports}
+        return set(ready)
+
+    async def poll(self, client: HttpClient, feed: str) -> set[str]:
+        """Run one feed now; returns the spots whose inputs changed."""
+        try:
+            updates = await getattr(self, f"_{feed}")(client)
+        except Exception as e:  # any failure just keeps the data already held
+            self.errors[feed] = str(e) or type(e).__name__
+            self._changed.set()  # so the failure is shown
+            return set()
+        self.errors.pop(feed, None)
+        self.polled[feed] = datetime.now()
+        return self.apply(updates)
+
+    async def _feed(self, client: HttpClient, feed: str, cadence: float) -> None:
+        while True:
+            await self.poll(client, feed)
+            await asyncio.sleep(min(RETRY_AFTER, cadence) if feed in self.errors else cadence)
+
+    async def tick(self, client: HttpClient, now: datetime | None = None) -> None:
+        """As the hour turns: rescore when following the clock, and on a new
+        day refetch the tide predictions, which cover one date only."""
+        now = now or datetime.now()
+        new_day = now.date() != self.day
+        self.day = now.date()
+        if new_day:
+            await self.poll(client, "tide_predictions")
+        if self.hour is None or new_day:
+            self.touch()
+
+    async def _clock(self, client: HttpClient) -> None:
+        while True:
+            now = datetime.now()
+            await asyncio.sleep((now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1) - now).total_seconds())
+            await self.tick(client)
+
+    async def run(self, client: HttpClient, cadences: dict[str, float] = CADENCES) -> None:
+        """Poll every feed on its cadence and call on_update after each
+        change, until cancelled."""
+        tasks = [asyncio.create_task(self._feed(client, feed, cadence)) for feed, cadence in cadences.items()]
+        tasks.append(asyncio.create_task(self._clock(client)))
+        shown_errors = {}
+        try:
+            while True:
+                await self._changed.wait()
+                await asyncio.sleep(SETTLE)
+                self._changed.clear()
+                if self.rebuild() or self.errors != shown_errors:
+                    shown_errors = dict(self.errors)
+                    self.on_update(self.reports, self)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def watch(spots: list[dict], on_update, history: bool = True, nowcast: bool = True, **options) -> None:
+    """Blocking watch loop for the CLI, until interrupted. options are
+    Watcher's (sport, hour, tomorrow, window) and the HttpClient's."""
+    from .sources.http import HttpClient
+
+    watcher_options = {k: options.pop(k) for k in ("sport", "hour", "tomorrow", "window") if k in options}
+
+    async def run():
+        store = None
+        if history:
+            try:
+                store = HistoryStore()
+            except (OSError, sqlite3.Error):
+                pass
+        watcher = Watcher(spots, on_update, store=store, nowcast=nowcast, **watcher_options)
+        try:
+            async with HttpClient(timeout=REQUEST_TIMEOUT, **options) as client:
+                await watcher.run(client)
+        finally:
+            if store is not None:
+                store.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,97 @@
+import asyncio
+import json
+from datetime import date
+from pathlib import Path
+
+import httpx
+
+from mbwind.backtest import chunks, ingest, load_history, evaluate, metrics, observed_class, run_backtest
+from mbwind.sources.http import HttpClient
+from mbwind.spots import get_spot
+from mbwind.store import HistoryStore
+
+FIXTURES = Path(__file__).parent / "fixtures"
+START, END = date(2024, 6, 1), date(2024, 6, 3)
+
+
+def _recorded(calls):
+    archive = json.loads((FIXTURES / "open_meteo_archive.json").read_text())
+    coops = json.loads((FIXTURES / "coops_wind_hourly.json").read_text())
+
+    def handler(request):
+        calls.append(request)
+        if request.url.host == "historical-forecast-api.open-meteo.com":
+            return httpx.Response(200, json=archive)
+        if request.url.params.get("product") == "wind":
+            return httpx.Response(200, json=coops)
+        return httpx.Response(404)
+    return handler
+
+
+def _ingest(store, calls):
+    async def go():
+        async with HttpClient(transport=httpx.MockTransport(_recorded(calls)), retries=0) as client:
+            return await ingest(client, store, get_spot("mission_bay"), START, END)
+    return asyncio.run(go())
+
+
+def test_chunks_align_to_half_years():
+    assert chunks(date(2023, 5, 2), date(2024, 1, 10)) == [
+        (date(2023, 5, 2), date(2023, 6, 30)),
+        (date(2023, 7, 1), date(2023, 12, 31)),
+        (date(2024, 1, 1), date(2024, 1, 10)),
+    ]
+
+
+def test_observed_class():
+    assert [observed_class(k) for k in (5.9, 6, 8, 19.9, 20, 25)] == ["NO-GO", "MAYBE", "GO", "GO", "MAYBE", "NO-GO"]
+    assert observed_class(12, "wingfoil") == "GO"
+
+
+def test_ingest_from_recorded_fixtures_and_skip_on_rerun():
+    store = HistoryStore(":memory:")
+    calls = []
+    result = _ingest(store, calls)
+    assert result == {"downloaded": 2, "skipped": 0, "failed": []}
+    assert {c.url.params["start_date"] for c in calls if "start_date" in c.url.params} == {"2024-06-01"}
+
+    calls.clear()
+    assert _ingest(store, calls)["skipped"] == 2
+    assert calls == []
+
+
+def test_backtest_scores_joined_history():
+    store = HistoryStore(":memory:")
+    _ingest(store, [])
+    spot = get_spot("mission_bay")
+    history = load_history(store, spot, START, END)
+    # Session hours 9-17 on three days, less the hour the station missed
+    assert len(history["time"]) == 3 * 9 - 1
+    assert history["wind_kts"][history["time"].index("2024-06-02T10:00")] is None
+
+    results = evaluate(history, direction_sectors=spot["directions"])
+    for sport, result in results.items():
+        assert result["hours"] == 26
+        assert sum(sum(row.values()) for row in result["confusion"].values()) == 26
+        assert sum(b["hours"] for b in result["calibration"]) == 26
+
+
+def test_metrics():
+    result = metrics([80, 70, 50, 10], ["GO", "GO", "MAYBE", "NO-GO"], ["GO", "NO-GO", "MAYBE", "NO-GO"])
+    assert result["hit_rate"] == 0.75
+    assert result["go_precision"] == 0.5
+    assert result["go_recall"] == 1.0
+    assert result["confusion"]["GO"] == {"GO": 1, "MAYBE": 0, "NO-GO": 1}
+    assert [b["bin"] for b in result["calibration"]] == ["10-19", "50-59", "70-79", "80-89"]
+    assert result["calibration"][-1]["observed_go_rate"] == 1.0
+
+
+def test_offline_backtest_uses_store_only(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    with HistoryStore(path) as store:
+        _ingest(store, [])
+    with HistoryStore(path) as store:
+        report = run_backtest(get_spot("mission_bay"), START, END, sports=("laser",), store=store, offline=True)
+    assert report["ingest"] is None
+    assert report["hours"] == 26
+    assert set(report["sports"]) == {"laser"}
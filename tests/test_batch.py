@@ -0,0 +1,72 @@
+import itertools
+import math
+
+import pytest
+
+from mbwind.batch import score_batch, score_batch_sports
+from mbwind.score import compute_confidence, SPORTS
+
+# Values on and around every threshold in score.py
+WIND = [None, 0, 0.5, 1, 2.9, 3, 5.9, 6, 8, 11.99, 12, 15, 16, 20, 22, 25, 28, 34.9, 35, 40]
+DIRECTION = [None, -10, 0, 30, 30.0001, 90, 179.9, 180, 219.9, 220, 240, 275, 310, 310.5, 330, 331, 360]
+GUST_RATIO = [None, 0, 1.0, 1.29, 1.3, 1.4, 1.5, 1.7, 1.8, 2.0, 2.2, 2.5, 3.0]
+THERMAL = [-5, 0, 3, 5.9, 6, 12, 18, 24.9, 25, 40]
+MARINE = [0.0, 0.1, 0.3, 0.7, 1 / 3]
+HOURS = list(range(-1, 25))
+
+
+def _inputs():
+    rows = []
+    for i, (w, d, r) in enumerate(itertools.product(WIND, DIRECTION, GUST_RATIO)):
+        g = None if r is None or w is None else w * r
+        rows.append((w, d, g, THERMAL[i % len(THERMAL)], MARINE[i % len(MARINE)], HOURS[i % len(HOURS)]))
+    return [list(col) for col in zip(*rows)]
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+@pytest.mark.parametrize("sport", SPORTS)
+def test_matches_scalar(backend, sport):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    cols = _inputs()
+    result = score_batch(*cols, sport=sport, backend=backend)
+    for i, row in enumerate(zip(*cols)):
+        expected = compute_confidence(*row, sport=sport)
+        assert result["score"][i] == expected["score"], row
+        assert result["recommendation"][i] == expected["recommendation"], row
+        for name, value in expected["breakdown"].items():
+            assert result["breakdown"][name][i] == value, (name, row)
+
+
+def test_nan_is_missing():
+    result = score_batch([math.nan], [math.nan], [math.nan], [20], [0.0], [13], backend="python")
+    expected = compute_confidence(None, None, None, 20, 0.0, 13)
+    assert result["score"][0] == expected["score"]
+
+
+def test_all_sports_in_one_pass():
+    results = score_batch_sports([10, 18], [270, 270], [12, 21], [20, 20], [0.0, 0.0], [13, 13])
+    assert set(results) == set(SPORTS)
+    assert list(results["laser"]["score"]) != list(results["wingfoil"]["score"])
+
+
+def test_unknown_sport():
+    with pytest.raises(ValueError):
+        score_batch([10], [270], [12], [20], [0.0], [13], sport="kayak")
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_advisory_penalty_matches_scalar(backend):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    cols = _inputs()
+    advisories = [None, "Small Craft Advisory", "GALE WARNING", "Special Marine Warning"]
+    advisory = [advisories[i % len(advisories)] for i in range(len(cols[0]))]
+    result = score_batch(*cols, backend=backend, advisory=advisory)
+    for i, row in enumerate(zip(*cols)):
+        expected = compute_confidence(*row, advisory=advisory[i])
+        assert result["score"][i] == expected["score"], row
+        assert result["breakdown"]["advisory_penalty"][i] == expected["breakdown"]["advisory_penalty"]
+    assert compute_confidence(15, 270, 16, 12, 0.0, 13, advisory="Small Craft Advisory")["score"] == (
+        compute_confidence(15, 270, 16, 12, 0.0, 13)["score"] - 15
+    )
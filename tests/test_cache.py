@@ -0,0 +1,110 @@
+import asyncio
+
+import httpx
+import pytest
+
+from mbwind.sources.cache import ResponseCache, cache_key
+from mbwind.sources.http import HttpClient
+
+URL = "https://api.example.test/forecast"
+
+
+def _get_json(cache, handler, ttl=60, refresh=False, params=None):
+    async def go():
+        transport = httpx.MockTransport(handler)
+        async with HttpClient(transport=transport, cache=cache, refresh=refresh, retries=0) as client:
+            return await client.get_json(URL, params=params, ttl=ttl)
+    return asyncio.run(go())
+
+
+def test_fresh_entry_skips_network(tmp_path):
+    cache = ResponseCache(tmp_path)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"n": len(calls)})
+
+    assert _get_json(cache, handler) == {"n": 1}
+    assert _get_json(cache, handler) == {"n": 1}
+    assert len(calls) == 1
+
+
+def test_stale_entry_revalidates_with_etag(tmp_path):
+    cache = ResponseCache(tmp_path)
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"v": 1}, headers={"ETag": '"v1"'})
+
+    assert _get_json(cache, handler, ttl=0) == {"v": 1}
+    assert _get_json(cache, handler, ttl=0) == {"v": 1}
+    assert seen == [None, '"v1"']
+
+
+def test_refresh_bypasses_fresh_entry(tmp_path):
+    cache = ResponseCache(tmp_path)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"n": len(calls)})
+
+    _get_json(cache, handler)
+    assert _get_json(cache, handler, refresh=True) == {"n": 2}
+
+
+def test_params_are_part_of_key():
+    assert cache_key(URL, {"a": 1, "b": 2}) == cache_key(URL, {"b": 2, "a": 1})
+    assert cache_key(URL, {"a": 1}) != cache_key(URL, {"a": 2})
+
+
+def test_eviction_bounds_size(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=2000)
+    for i in range(20):
+        cache.put(f"k{i}", {"pad": "x" * 200})
+    total = sum(p.stat().st_size for p in tmp_path.glob("*.json"))
+    assert total <= 2000
+    assert any(tmp_path.glob("*.json"))
+
+
+def test_expired_entry_stands_in_when_upstream_fails(tmp_path):
+    cache = ResponseCache(tmp_path)
+
+    def down(request):
+        raise httpx.ConnectError("no route to host")
+
+    async def go(handler, **options):
+        async with HttpClient(transport=httpx.MockTransport(handler), cache=cache, retries=0, **options) as client:
+            body = await client.get_json("https://api.open-meteo.com/v1/forecast", ttl=0)
+            return body, client.take_stale(), client.take_stale()
+
+    cache.put(cache_key("https://api.open-meteo.com/v1/forecast"), {"v": 1})
+    body, stale, again = asyncio.run(go(down))
+    assert body == {"v": 1} and stale["sources"] == ["Open-Meteo"] and again is None
+    assert asyncio.run(go(lambda request: httpx.Response(503)))[0] == {"v": 1}
+    # A client error is an answer, not an outage
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(go(lambda request: httpx.Response(404)))
+
+    # Offline: no request at all, saved responses however old, else an error
+    body, stale, _ = asyncio.run(go(down, offline=True))
+    assert body == {"v": 1} and stale is not None
+    cache.clear()
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(go(down, offline=True))
+
+
+def test_raw_bodies_are_kept_apart_from_decoded_ones(tmp_path):
+    cache = ResponseCache(tmp_path)
+    # A decoded body cached for the same URL, as older versions stored Open-Meteo responses
+    cache.put(cache_key(URL), {"hourly": {}}, None, None)
+
+    async def go():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, text='{"v": 1}'))
+        async with HttpClient(transport=transport, cache=cache, retries=0) as client:
+            return await client.get_json(URL, ttl=60, raw=True)
+    assert asyncio.run(go()) == '{"v": 1}'
@@ -0,0 +1,85 @@
+import asyncio
+import random
+from datetime import date, datetime, timedelta
+
+import httpx
+import pytest
+
+from mbwind.ensemble import score_ensemble, fetch_spot_ensemble
+from mbwind.sources.forecast import Forecast, split_members
+from mbwind.sources.http import HttpClient
+from mbwind.spots import get_spot
+
+DAY = date(2025, 6, 1)
+TIMES = [datetime(2025, 6, 1) + timedelta(hours=h) for h in range(24)]
+
+
+def _member(wind: float, temp: float = 65.0, direction: float = 270.0) -> Forecast:
+    return Forecast.from_columns(TIMES, {
+        "temp_f": [temp] * 24,
+        "wind_kts": [wind] * 24,
+        "wind_dir": [direction] * 24,
+        "gusts_kts": [wind * 1.2] * 24,
+        "dewpoint_f": [50.0] * 24,
+    })
+
+
+def _payload(members: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    hourly = {"time": [t.isoformat(timespec="minutes") for t in TIMES]}
+    for suffix in [""] + [f"_member{m:02d}" for m in range(1, members)]:
+        hourly["temperature_2m" + suffix] = [rng.gauss(66, 3) for _ in TIMES]
+        hourly["wind_speed_10m" + suffix] = [rng.uniform(0, 25) for _ in TIMES]
+        hourly["wind_direction_10m" + suffix] = [rng.uniform(180, 330) for _ in TIMES]
+        hourly["wind_gusts_10m" + suffix] = [rng.uniform(5, 35) for _ in TIMES]
+        hourly["dewpoint_2m" + suffix] = [rng.gauss(55, 3) for _ in TIMES]
+    return {"hourly": hourly}
+
+
+def test_split_members():
+    payload = _payload(3)
+    payload["hourly"]["wind_speed_10m_member02"][5] = None
+    members = split_members(payload)
+    assert sorted(members) == ["control", "member01", "member02"]
+    assert members["member02"].value("wind_kts", 5) is None
+    assert len(members["control"]) == 24
+
+
+def test_p_go_counts_members():
+    # Three of four members are in the laser sweet spot, one is a light easterly
+    coastal = {"a": _member(14), "b": _member(14), "c": _member(14), "d": _member(3, direction=90)}
+    inland = {"control": _member(0, temp=85.0)}
+    rows = score_ensemble(coastal, inland, DAY, "laser", backend="python")
+    noon = next(row for row in rows if row["hour"] == 12)
+    assert noon["members"] == 4
+    assert noon["p_go"] == 0.75
+    assert noon["p10"] < noon["median"] == noon["p90"] == noon["score"]
+    assert noon["recommendation"] == "GO"
+
+
+def test_backends_agree():
+    pytest.importorskip("numpy")
+    coastal = split_members(_payload(30))
+    inland = split_members(_payload(30, seed=1))
+    coastal["member05"].columns["wind_kts"][3] = float("nan")
+    python = score_ensemble(coastal, inland, DAY, backend="python")
+    assert python == score_ensemble(coastal, inland, DAY, backend="numpy")
+    assert python[3]["members"] == 29
+
+
+def test_fetch_in_one_request():
+    spot = get_spot("mission_bay")
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=[_payload(4), _payload(4, seed=1)])
+
+    async def go():
+        async with HttpClient(transport=httpx.MockTransport(handler), retries=0) as client:
+            return await fetch_spot_ensemble(client, spot, ("gfs025",))
+    members = asyncio.run(go())
+    assert len(calls) == 1
+    assert calls[0].url.params["models"] == "gfs025"
+    assert set(members) == {"coastal", "inland"}
+    assert len(members["coastal"]) == 4
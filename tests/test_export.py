@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+from click.testing import CliRunner
+
+from mbwind.cli import main
+from mbwind.export import COLUMNS, scored_batches, write_csv, write_ndjson, write_parquet
+from mbwind.fetch import grid_cell
+from mbwind.sources.forecast import Forecast
+from mbwind.spots import get_spot
+from mbwind.store import HistoryStore
+
+SPOT = get_spot("mission_bay")
+START = datetime(2025, 6, 1)
+HOURS = 72
+
+
+def _fill(store: HistoryStore) -> None:
+    times = [START + timedelta(hours=h) for h in range(HOURS)]
+    wind = [float(h % 20) for h in range(HOURS)]
+    wind[5] = None
+    store.put_forecast(grid_cell(SPOT["coastal"]), Forecast.from_columns(times, {
+        "temp_f": [66.0] * HOURS, "wind_kts": wind, "wind_dir": [270.0] * HOURS,
+        "gusts_kts": [None] * HOURS, "dewpoint_f": [57.0] * HOURS,
+    }))
+    store.put_forecast(grid_cell(SPOT["inland"]), Forecast.from_columns(times[:48], {"temp_f": [80.0] * 48}))
+    store.put_observations(SPOT["tide_station"], [
+        {"time": times[12].isoformat(timespec="minutes"), "wind_kts": 11.0, "wind_dir": 260.0, "gust_kts": None},
+    ])
+
+
+def test_streams_in_batches(tmp_path):
+    with HistoryStore(tmp_path / "h.sqlite3") as store:
+        _fill(store)
+        batches = list(scored_batches(store, [SPOT], date(2025, 6, 1), date(2025, 6, 2), ("laser", "wingfoil"), batch=10))
+        # 48 hours in range, 10 at a time, two sports per batch
+        assert [len(b) for b in batches] == [10] * 8 + [8] * 2
+        records = [r for b in batches for r in b]
+        assert {r["sport"] for r in records} == {"laser", "wingfoil"}
+        laser = [r for r in records if r["sport"] == "laser"]
+        assert [r["time"] for r in laser] == [(START + timedelta(hours=h)).isoformat(timespec="minutes") for h in range(48)]
+        assert laser[5]["wind_kts"] is None and laser[6]["wind_kts"] == 6.0
+        assert laser[12]["observed_kts"] == 11.0 and laser[13]["observed_kts"] is None
+        assert laser[0]["thermal_delta_f"] == 14.0
+
+        out = io.StringIO()
+        assert write_ndjson(scored_batches(store, [SPOT], date(2025, 6, 1), date(2025, 6, 3), batch=16), out) == HOURS * 2
+        lines = out.getvalue().splitlines()
+        assert list(json.loads(lines[0])) == list(COLUMNS)
+        assert json.loads(lines[-1])["thermal_delta_f"] is None
+
+        out = io.StringIO()
+        assert write_csv(iter(batches), out) == 96
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        assert len(rows) == 96 and rows[0]["spot"] == "mission_bay"
+
+
+def test_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    with HistoryStore(tmp_path / "h.sqlite3") as store:
+        _fill(store)
+        path = tmp_path / "out.parquet"
+        n = write_parquet(scored_batches(store, [SPOT], date(2025, 6, 1), date(2025, 6, 3), batch=24), str(path))
+    table = pq.read_table(path)
+    assert table.num_rows == n == HOURS * 2
+    assert table.column_names == list(COLUMNS)
+
+
+def test_cli_csv_offline(tmp_path):
+    with HistoryStore(tmp_path / "h.sqlite3") as store:
+        _fill(store)
+    result = CliRunner().invoke(main, [
+        "export", "--spot", "mission_bay", "--start", "2025-06-01", "--end", "2025-06-01",
+        "--sport", "wingfoil", "--format", "csv", "--store", str(tmp_path / "h.sqlite3"), "--offline",
+    ])
+    assert result.exit_code == 0, result.output
+    rows = list(csv.DictReader(io.StringIO(result.stdout)))
+    assert len(rows) == 24 and {r["sport"] for r in rows} == {"wingfoil"}
+
+    result = CliRunner().invoke(main, ["export", "--offline", "--store", str(tmp_path / "h.sqlite3"), "--format", "parquet"])
+    assert result.exit_code != 0 and "--output" in result.output
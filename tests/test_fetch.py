@@ -0,0 +1,126 @@
+import asyncio
+
+import httpx
+import pytest
+
+from mbwind.fetch import fetch_all, FetchError
+from mbwind.sources.http import HttpClient
+
+FORECAST = {
+    "hourly": {
+        "time": ["2025-06-01T13:00"],
+        "temperature_2m": [70.0],
+        "wind_speed_10m": [10.0],
+        "wind_direction_10m": [270.0],
+        "wind_gusts_10m": [13.0],
+        "dewpoint_2m": [55.0],
+    }
+}
+
+
+def _open_meteo(request):
+    """Answer like Open-Meteo: one forecast per requested coordinate."""
+    n = len(request.url.params["latitude"].split(","))
+    return httpx.Response(200, json=FORECAST if n == 1 else [FORECAST] * n)
+
+
+def _run(handler, **kwargs):
+    async def go():
+        async with HttpClient(transport=httpx.MockTransport(handler), retries=0) as client:
+            return await fetch_all(client, **kwargs)
+    return asyncio.run(go())
+
+
+def test_optional_sources_degrade():
+    def handler(request):
+        if request.url.host == "api.open-meteo.com":
+            return _open_meteo(request)
+        return httpx.Response(503)
+
+    data = _run(handler)
+    assert set(data["forecasts"]) == {"coastal", "inland"}
+    assert data["forecasts"]["coastal"].value("wind_kts", 0) == 10.0
+    assert data["tide_data"] is None
+    assert data["tide_predictions"] == []
+    assert data["observed_wind"] is None
+    assert data["marine_forecast"] is None
+
+
+def test_critical_failure_raises():
+    def handler(request):
+        return httpx.Response(500)
+
+    with pytest.raises(FetchError) as exc:
+        _run(handler)
+    assert exc.value.source == "forecasts"
+
+
+def test_forecasts_fetched_in_one_request():
+    calls = []
+
+    def handler(request):
+        if request.url.host == "api.open-meteo.com":
+            calls.append(request)
+            return _open_meteo(request)
+        return httpx.Response(404)
+
+    data = _run(handler)
+    assert len(calls) == 1
+    assert set(data["forecasts"]) == {"coastal", "inland"}
+
+
+def test_slow_optional_source_is_dropped():
+    async def handler(request):
+        if request.url.host == "api.open-meteo.com":
+            return _open_meteo(request)
+        await asyncio.sleep(5)
+        return httpx.Response(200, json={})
+
+    async def go():
+        transport = httpx.MockTransport(handler)
+        async with HttpClient(transport=transport, retries=0) as client:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            data = await fetch_all(client, optional_grace=0.1)
+            return data, loop.time() - start
+
+    data, elapsed = asyncio.run(go())
+    assert elapsed < 1
+    assert len(data["forecasts"]["coastal"]) == 1
+    assert data["tide_data"] is None
+
+
+def test_incremental_station_polling():
+    from datetime import datetime, timedelta
+
+    from mbwind.fetch import fetch_spots
+    from mbwind.spots import get_spot
+
+    requests = []
+
+    def handler(request):
+        if request.url.host == "api.open-meteo.com":
+            return _open_meteo(request)
+        requests.append(request.url.params)
+        if "begin_date" in request.url.params and request.url.params["product"] == "wind":
+            return httpx.Response(200, json={"data": [{"t": "2025-06-01 12:06", "s": "9.5", "d": "270", "g": "12.0"}]})
+        return httpx.Response(200, json={"error": {"message": "No data was found."}})
+
+    spot = get_spot("mission_bay")
+    last = datetime.now() - timedelta(minutes=20)
+    since = {("wind_series", spot["tide_station"]): last, ("water_level_series", spot["tide_station"]): None}
+
+    async def go():
+        async with HttpClient(transport=httpx.MockTransport(handler), retries=0) as client:
+            return await fetch_spots(client, [spot], since=since)
+    data = asyncio.run(go())[spot["id"]]
+
+    coops = {p["product"]: p for p in requests if "product" in p}
+    assert "date" not in coops["wind"] and "date" not in coops["water_level"]
+    assert coops["wind"]["begin_date"] == (last + timedelta(minutes=1)).strftime("%Y%m%d %H:%M")
+    # Nothing stored yet: reach back a whole window
+    begin = datetime.strptime(coops["water_level"]["begin_date"], "%Y%m%d %H:%M")
+    assert timedelta(hours=5, minutes=59) < datetime.now() - begin < timedelta(hours=6, minutes=1)
+    assert data["wind_series"] == [{"time": "2025-06-01T12:06", "wind_kts": 9.5, "wind_dir": 270.0, "gust_kts": 12.0}]
+    assert data["water_level_series"] == []
+    assert data["observed_wind"] is None
@@ -0,0 +1,96 @@
+import json
+from datetime import date, datetime
+
+import pytest
+
+from mbwind.sources import forecast
+from mbwind.sources.forecast import Forecast, decode_payloads
+from mbwind.sources.open_meteo import get_hourly_at, find_best_window
+
+
+def _payload(days=("2025-06-01", "2025-06-02")):
+    times, speeds = [], []
+    for d in days:
+        for h in range(24):
+            times.append(f"{d}T{h:02d}:00")
+            speeds.append(float(h % 15))
+    n = len(times)
+    return {
+        "latitude": 32.77,
+        "hourly": {
+            "time": times,
+            "temperature_2m": [65.0] * n,
+            "wind_speed_10m": speeds,
+            "wind_direction_10m": [270.0] * (n - 1) + [None],
+            "wind_gusts_10m": [s + 3 for s in speeds],
+            "dewpoint_2m": [55.0] * n,
+        },
+    }
+
+
+def test_index_lookup():
+    f = Forecast.from_payload(_payload())
+    assert len(f) == 48
+    assert f.index(date(2025, 6, 2), 13) == 37
+    assert f.index(date(2025, 6, 3), 13) is None
+    assert f.day_range(date(2025, 6, 2)) == range(24, 48)
+    assert f.meta["latitude"] == 32.77
+
+
+def test_missing_values_are_none():
+    f = Forecast.from_payload(_payload())
+    assert f.value("wind_dir", 47) is None
+    assert f.hour(47)["wind_dir"] is None
+
+
+def test_get_hourly_at_matches_payload():
+    payload = _payload()
+    rec = get_hourly_at(payload, 13, datetime(2025, 6, 1))
+    assert rec == {
+        "time": "2025-06-01T13:00",
+        "hour": 13,
+        "temp_f": 65.0,
+        "wind_kts": 13.0,
+        "wind_dir": 270.0,
+        "gusts_kts": 16.0,
+        "dewpoint_f": 55.0,
+    }
+    # Unknown dates fall back to the last hour
+    assert get_hourly_at(payload, 13, datetime(2030, 1, 1))["time"] == "2025-06-02T23:00"
+
+
+def test_find_best_window():
+    f = Forecast.from_payload(_payload())
+    best = find_best_window(f, datetime(2025, 6, 2))
+    assert best["hour"] == 14
+    assert best["wind_kts"] == 14.0
+
+
+def _same(a: Forecast, b: Forecast) -> bool:
+    return a.times == b.times and a.meta == b.meta and {
+        k: c.tobytes() for k, c in a.columns.items()
+    } == {k: c.tobytes() for k, c in b.columns.items()}
+
+
+@pytest.mark.parametrize("chunk", [forecast.CHUNK, 7])
+def test_decode_payloads_matches_json(monkeypatch, chunk):
+    monkeypatch.setattr(forecast, "CHUNK", chunk)
+    payload = {**_payload(), "hourly_units": {"time": "iso8601"}, "elevation": 3.0}
+    payload["hourly"]["wind_speed_10m"][5] = None
+    payload["hourly"]["cloud_cover"] = [0] * 48
+
+    single = decode_payloads(json.dumps(payload))
+    assert _same(Forecast.from_payload(single[0]), Forecast.from_payload(payload))
+    assert list(single[0]["hourly"]["cloud_cover"]) == [0.0] * 48
+
+    text = json.dumps([payload, {**payload, "latitude": 32.79}], indent=1)
+    decoded = decode_payloads(text)
+    assert [p["latitude"] for p in decoded] == [32.77, 32.79]
+    assert _same(Forecast.from_payload(decoded[1]), Forecast.from_payload({**payload, "latitude": 32.79}))
+
+
+def test_decode_payloads_rejects_malformed():
+    with pytest.raises(ValueError):
+        decode_payloads('{"hourly": {"time": ["2025-06-01T00:00"]}')
+    with pytest.raises(ValueError):
+        decode_payloads('{"latitude": 1} x')
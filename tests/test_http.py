@@ -0,0 +1,72 @@
+import asyncio
+
+import httpx
+import pytest
+
+from mbwind.sources.http import HttpClient
+
+
+def _get(handler, **kwargs):
+    async def go():
+        async with HttpClient(transport=httpx.MockTransport(handler), backoff=0, **kwargs) as client:
+            return await client.get_json("https://api.example.test/data")
+    return asyncio.run(go())
+
+
+def test_retries_transient_status():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"ok": True})
+
+    assert _get(handler, retries=2) == {"ok": True}
+    assert len(calls) == 3
+
+
+def test_gives_up_after_retries():
+    def handler(request):
+        return httpx.Response(502)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _get(handler, retries=1)
+
+
+def test_client_errors_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(404)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _get(handler, retries=3)
+    assert len(calls) == 1
+
+
+def test_sends_user_agent():
+    def handler(request):
+        return httpx.Response(200, json={"ua": request.headers["User-Agent"]})
+
+    assert _get(handler)["ua"].startswith("mbwind/")
+
+
+def test_upstream_override(monkeypatch):
+    monkeypatch.setenv("MBWIND_COOPS_URL", "http://127.0.0.1:8000/")
+    seen = []
+
+    def handler(request):
+        seen.append(str(request.url))
+        return httpx.Response(200, json={})
+
+    async def go():
+        async with HttpClient(transport=httpx.MockTransport(handler), retries=0) as client:
+            await client.get_json("https://api.tidesandcurrents.noaa.gov/api/prod/datagetter", params={"product": "wind"})
+            await client.get_json("https://api.open-meteo.com/v1/forecast")
+    asyncio.run(go())
+    assert seen == [
+        "http://127.0.0.1:8000/api/prod/datagetter?product=wind",
+        "https://api.open-meteo.com/v1/forecast",
+    ]
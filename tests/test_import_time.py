@@ -0,0 +1,74 @@
+"""Cold-start checks for the CLI entry point.
+
+Each test runs a fresh interpreter so nothing is already imported.
+"""
+import json
+import subprocess
+import sys
+
+# Generous budget for `import mbwind.cli` alone; it sits around 10 ms here.
+IMPORT_BUDGET_US = 250_000
+
+HEAVY = ("rich", "httpx", "numpy", "http.server")
+
+
+def _python(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+
+
+def _self_time(stderr: str, module: str) -> int:
+    """Cumulative import time (µs) of a module from -X importtime output."""
+    for line in stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise AssertionError(f"{module} not in importtime output")
+
+
+def test_cli_import_is_light():
+    result = _python(f"import sys, mbwind.cli; print([m for m in {HEAVY!r} if m in sys.modules])")
+    assert result.stdout.strip() == "[]"
+    cost = _self_time(result.stderr, "mbwind.cli")
+    print(f"import mbwind.cli: {cost / 1000:.1f} ms")
+    assert cost < IMPORT_BUDGET_US
+
+
+def test_help_skips_heavy_modules():
+    code = (
+        "import sys\n"
+        "from mbwind.cli import main\n"
+        "try:\n"
+        "    main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print([m for m in {HEAVY!r} if m in sys.modules], file=sys.stderr)\n"
+    )
+    result = _python(code)
+    assert "Usage:" in result.stdout
+    assert result.stderr.strip().splitlines()[-1] == "[]"
+
+
+def test_json_output_never_imports_rich():
+    # Stand in for the network so only the rendering path is exercised
+    code = (
+        "import sys\n"
+        "import mbwind.fetch\n"
+        "from mbwind.sources.forecast import Forecast\n"
+        "from datetime import datetime\n"
+        "day = datetime.now().strftime('%Y-%m-%d')\n"
+        "f = Forecast.from_payload({'hourly': {'time': [f'{day}T{h:02d}:00' for h in range(24)],"
+        " 'temperature_2m': [70.0] * 24, 'wind_speed_10m': [10.0] * 24, 'wind_direction_10m': [270.0] * 24,"
+        " 'wind_gusts_10m': [12.0] * 24, 'dewpoint_2m': [55.0] * 24}})\n"
+        "data = {'forecasts': {'coastal': f, 'inland': f}, 'tide_data': None, 'tide_predictions': [],"
+        " 'observed_wind': None, 'marine_forecast': None}\n"
+        "mbwind.fetch.fetch_all_sync = lambda spots, **kw: {s['id']: data for s in spots}\n"
+        "from mbwind.cli import main\n"
+        "try:\n"
+        "    main(['--json', '--hour', '13', '--no-cache', '--no-store'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('rich' in sys.modules, file=sys.stderr)\n"
+    )
+    result = _python(code)
+    assert json.loads(result.stdout)["hour"] == 13
+    assert result.stderr.strip().splitlines()[-1] == "False"
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from mbwind.nowcast import BiasEstimate, forecast_at, nowcast_spot, CORRECTION_HALF_LIFE_HOURS
+from mbwind.sources.forecast import Forecast
+from mbwind.spots import get_spot
+from mbwind.store import HistoryStore
+
+NOW = datetime(2025, 6, 1, 12, 30)
+
+
+def _forecast(wind: float = 6.0) -> Forecast:
+    start = NOW.replace(hour=0, minute=0)
+    times = [start + timedelta(hours=h) for h in range(24)]
+    return Forecast.from_columns(times, {
+        "wind_kts": [wind] * 24,
+        "gusts_kts": [wind + 2] * 24,
+        "temp_f": [68.0] * 24,
+    })
+
+
+def _observe(store: HistoryStore, station: str, minutes_ago, kts: float) -> None:
+    store.put_observations(station, [
+        {"time": (NOW - timedelta(minutes=m)).isoformat(timespec="minutes"), "wind_kts": kts, "wind_dir": None, "gust_kts": None}
+        for m in minutes_ago
+    ])
+
+
+def test_bias_estimate_is_a_time_weighted_mean():
+    est = BiasEstimate()
+    est.update(NOW, 10, 6)
+    assert est.bias == 4
+    est.update(NOW + timedelta(hours=1), 6, 6)
+    # The first reading has half the weight of the new one after one half-life
+    assert est.weight == pytest.approx(1.5)
+    assert est.bias == pytest.approx(4 * 0.5 / 1.5)
+    assert BiasEstimate.from_json(est.to_json()).__dict__ == est.__dict__
+    assert est.correction(CORRECTION_HALF_LIFE_HOURS) == pytest.approx(est.bias / 2)
+    assert est.correction(7) == 0
+
+
+def test_forecast_at_interpolates_between_hours():
+    times = [NOW.replace(minute=0), NOW.replace(minute=0) + timedelta(hours=1)]
+    f = Forecast.from_columns(times, {"wind_kts": [10.0, 16.0]})
+    assert forecast_at(f, NOW) == 13.0
+    assert forecast_at(f, times[1]) == 16.0
+    assert forecast_at(f, NOW - timedelta(hours=3)) is None
+
+
+def test_nowcast_corrects_next_hours_incrementally():
+    store = HistoryStore(":memory:")
+    spot = get_spot("mission_bay")
+    station = spot["tide_station"]
+    _observe(store, station, range(60, -1, -6), 10.0)
+    data = {"forecasts": {"coastal": _forecast(), "inland": _forecast()}}
+
+    summary = nowcast_spot(store, spot, data, NOW)
+    assert summary["bias_kts"] == 4.0
+    corrected = data["forecasts"]["coastal"]
+    i = corrected.index(NOW.date(), 13)
+    # 30 minutes after the last reading, the correction has barely faded
+    assert corrected.value("wind_kts", i) == pytest.approx(6 + 4 * 0.5 ** (0.5 / CORRECTION_HALF_LIFE_HOURS))
+    assert corrected.value("gusts_kts", i) > 8
+    assert corrected.value("wind_kts", corrected.index(NOW.date(), 10)) == 6.0  # past hours untouched
+    assert corrected.value("wind_kts", corrected.index(NOW.date(), 20)) == 6.0  # beyond the horizon
+    assert data["forecasts"]["inland"].value("wind_kts", i) == 6.0
+
+    # A rerun with no new readings leaves the state alone; a new one is applied once
+    weight = summary["readings"]
+    data = {"forecasts": {"coastal": _forecast(), "inland": _forecast()}}
+    assert nowcast_spot(store, spot, data, NOW)["readings"] == weight
+    store.put_observations(station, [{"time": "2025-06-01T12:36", "wind_kts": 6.0, "wind_dir": None, "gust_kts": None}])
+    later = nowcast_spot(store, spot, data, NOW + timedelta(minutes=6))
+    assert later["bias_kts"] < 4.0
+    assert later["as_of"] == "2025-06-01T12:36"
+
+
+def test_no_correction_without_fresh_readings():
+    store = HistoryStore(":memory:")
+    spot = get_spot("mission_bay")
+    _observe(store, spot["tide_station"], [300, 294], 10.0)
+    data = {"forecasts": {"coastal": _forecast(), "inland": _forecast()}}
+    coastal = data["forecasts"]["coastal"]
+    assert nowcast_spot(store, spot, data, NOW) is None
+    assert data["forecasts"]["coastal"] is coastal
+    assert "nowcast" not in data
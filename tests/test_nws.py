@@ -0,0 +1,68 @@
+import asyncio
+from datetime import datetime
+
+import httpx
+
+from mbwind import fake_upstream
+from mbwind.sources.cache import ResponseCache
+from mbwind.sources.http import HttpClient
+from mbwind.sources.noaa import fetch_marine_forecast
+from mbwind.sources.nws import parse_period, parse_zone_forecast, period_at
+
+
+def test_parse_period():
+    period = parse_period(
+        "W wind 5 to 10 kt, becoming 10 to 15 kt in the afternoon. Wind waves 1 to 2 ft. "
+        "W swell 3 ft at 9 seconds. Patchy fog in the morning."
+    )
+    assert period == {
+        "wind_dir": "W", "wind_min_kts": 5, "wind_max_kts": 15, "gust_kts": None, "seas_ft": 2,
+        "swell": [{"direction": "W", "height_ft": 3, "period_s": 9}], "advisory": None,
+    }
+
+
+def test_parse_period_advisory():
+    period = parse_period(
+        "...SMALL CRAFT ADVISORY IN EFFECT THROUGH LATE TONIGHT... NW WIND 15 TO 20 KT WITH GUSTS "
+        "UP TO 25 KT. SEAS 5 TO 7 FT. MIXED SWELL W 4 TO 6 FT AT 11 SECONDS AND S 2 FT AT 15 SECONDS."
+    )
+    assert period["advisory"] == "Small Craft Advisory"
+    assert (period["wind_dir"], period["wind_min_kts"], period["wind_max_kts"]) == ("NW", 15, 20)
+    assert period["gust_kts"] == 25 and period["seas_ft"] == 7
+    assert [s["direction"] for s in period["swell"]] == ["W", "S"]
+
+    light = parse_period("Variable wind less than 5 kt. Gale Warning and Small Craft Advisory.")
+    assert (light["wind_dir"], light["wind_min_kts"], light["wind_max_kts"]) == (None, 0, 5)
+    assert light["advisory"] == "Gale Warning"
+
+
+def test_zone_forecast_periods():
+    forecast = parse_zone_forecast(fake_upstream.load("nws_zone_forecast"))
+    assert forecast["zone"] == "PZZ775" and forecast["updated"]
+    first = forecast["periods"][0]
+    assert first["text"].startswith("W wind") and first["wind_max_kts"] == 15
+    assert period_at(forecast, datetime(2025, 6, 1, 14)) is first
+    assert period_at(forecast, datetime(2025, 6, 1, 8)) is None
+    assert period_at(None, datetime(2025, 6, 1, 14)) is None
+
+
+def test_parsed_once_and_cached(tmp_path, monkeypatch):
+    calls, parsed = [], []
+    zone = fake_upstream.load("nws_zone_forecast")
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json=zone)
+
+    def parse(data):
+        parsed.append(data)
+        return parse_zone_forecast(data)
+    monkeypatch.setattr("mbwind.sources.noaa.parse_zone_forecast", parse)
+
+    async def go():
+        async with HttpClient(transport=httpx.MockTransport(handler), cache=ResponseCache(tmp_path), retries=0) as client:
+            return await fetch_marine_forecast(client, "PZZ775")
+    first, second = asyncio.run(go()), asyncio.run(go())
+    assert first == second and first["periods"][0]["advisory"] is None
+    assert calls == ["/zones/forecast/PZZ775/forecast"]
+    assert len(parsed) == 1
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from mbwind import fake_upstream
+from mbwind.cli import main
+
+
+@pytest.fixture
+def upstream(tmp_path, monkeypatch):
+    """The fake upstream, with the cache and history store under tmp_path."""
+    server = fake_upstream.serve()
+    monkeypatch.setenv("MBWIND_CACHE_DIR", str(tmp_path))
+    for var, url in fake_upstream.environ(server).items():
+        monkeypatch.setenv(var, url)
+    yield server
+    server.shutdown()
+
+
+def _report(*args):
+    result = CliRunner().invoke(main, ["--json", "--hour", "13", *args])
+    assert result.exit_code == 0, result.output
+    return json.loads(result.stdout)
+
+
+def test_falls_back_to_saved_data(upstream):
+    live = _report()
+    assert live["stale"] is None
+    upstream.shutdown()
+    upstream.server_close()
+
+    # Upstream gone: the run still reports, from the cache
+    result = CliRunner().invoke(main, ["--json", "--hour", "13", "--refresh", "--deadline", "0.3"])
+    assert result.exit_code == 0, result.output
+    assert "falling back to saved data" in result.stderr
+    assert json.loads(result.stdout)["score"] == live["score"]
+
+    # Without the cache, from the forecast the first run stored
+    stored = _report("--offline", "--no-cache")
+    assert stored["stale"]["sources"] == ["Open-Meteo"]
+    assert (stored["score"], stored["wind_kts"]) == (live["score"], live["wind_kts"])
+
+
+def test_offline_with_nothing_saved(upstream):
+    result = CliRunner().invoke(main, ["--plain", "--offline", "--no-store"])
+    assert result.exit_code == 1
+    assert "no saved response" in result.stderr
+
+
+def test_store_closed_when_nothing_saved(upstream, monkeypatch):
+    from mbwind import cli
+    from mbwind.store import HistoryStore
+
+    opened = []
+
+    def open_history():
+        opened.append(HistoryStore())
+        return opened[-1]
+    monkeypatch.setattr(cli, "_open_history", open_history)
+    result = CliRunner().invoke(main, ["--plain", "--offline"])
+    assert result.exit_code == 1
+    with pytest.raises(Exception, match="closed"):
+        opened[0].db.execute("select 1")
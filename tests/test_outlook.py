@@ -0,0 +1,60 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+import httpx
+
+from mbwind.outlook import fetch_outlook, score_outlook
+from mbwind.score import SPORTS
+from mbwind.sources.forecast import Forecast
+from mbwind.sources.http import HttpClient
+from mbwind.spots import get_spot
+from mbwind.timeline import DAYLIGHT, best_window, score_timeline
+
+TIMES = [datetime(2025, 6, 1) + timedelta(hours=h) for h in range(16 * 24)]
+
+
+def _forecast(temp: float, seed: int) -> Forecast:
+    rng = random.Random(seed)
+    wind = [rng.uniform(0, 25) for _ in TIMES]
+    wind[30] = None
+    return Forecast.from_columns(TIMES, {
+        "temp_f": [rng.gauss(temp, 4) for _ in TIMES],
+        "wind_kts": wind,
+        "wind_dir": [rng.uniform(0, 360) for _ in TIMES],
+        "gusts_kts": [w * 1.3 if w is not None else None for w in wind],
+        "dewpoint_f": [rng.gauss(56, 3) for _ in TIMES],
+    })
+
+
+def test_matches_timeline_per_day():
+    coastal, inland = _forecast(65, 0), _forecast(78, 1)
+    days = coastal.days()
+    outlook = score_outlook(coastal, inland, days, SPORTS)
+    for sport in SPORTS:
+        assert [d["date"] for d in outlook[sport]] == [day.isoformat() for day in days]
+        for day, scored in zip(days, outlook[sport]):
+            expected = [
+                row for row in score_timeline(coastal, inland, day, sport)
+                if row["hour"] in DAYLIGHT and row["wind_kts"] is not None
+            ]
+            assert [(r["hour"], r["score"], r["recommendation"]) for r in scored["hours"]] == [
+                (r["hour"], r["score"], r["recommendation"]) for r in expected
+            ]
+            assert scored["best_window"] == best_window(expected)
+
+
+def test_fetch_asks_for_the_horizon():
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.params["forecast_days"])
+        hourly = {"time": [t.isoformat(timespec="minutes") for t in TIMES[:48]], "wind_speed_10m": [10.0] * 48}
+        return httpx.Response(200, json=[{"hourly": hourly}] * 2)
+
+    async def go():
+        async with HttpClient(transport=httpx.MockTransport(handler), retries=0) as client:
+            return await fetch_outlook(client, get_spot("mission_bay"), 10)
+    forecasts = asyncio.run(go())
+    assert seen == ["10"]
+    assert set(forecasts) == {"coastal", "inland"}
@@ -0,0 +1,109 @@
+import json
+import math
+import os
+import subprocess
+import sys
+
+import pytest
+
+from mbwind.profiles import load_profiles
+from mbwind.score import SPORTS, score_wind_speed, score_thermal, score_gust_factor, score_time_of_day, sport_tip
+from mbwind.sources.thermal import compute_thermal_gradient, marine_layer_suppression
+
+
+# The if/elif ladders the bundled profiles replaced, kept to pin parity
+def _ladder(x, edges, points):
+    for edge, point in zip(edges, points):
+        if x < edge:
+            return point
+    return points[-1]
+
+
+LEGACY_WIND = {
+    "laser": ([3, 6, 8, 12, 16, 20, 25], [0, 10, 18, 30, 25, 18, 10, 5]),
+    "wingfoil": ([3, 8, 12, 15, 22, 28, 35], [0, 5, 12, 22, 30, 22, 12, 3]),
+}
+LEGACY_GUST = {
+    "laser": ([1.3, 1.5, 1.8, 2.2], [15, 12, 8, 4, 1]),
+    "wingfoil": ([1.4, 1.7, 2.0, 2.5], [15, 12, 8, 4, 1]),
+}
+
+
+def _legacy_time(hour):
+    if 11 <= hour <= 15:
+        return 15
+    elif 10 <= hour <= 16:
+        return 12
+    elif 9 <= hour <= 17:
+        return 8
+    return 3
+
+
+def _values(lo, hi, step=0.05):
+    return [round(lo + i * step, 4) for i in range(int((hi - lo) / step) + 1)]
+
+
+@pytest.mark.parametrize("sport", SPORTS)
+def test_wind_and_gust_match_legacy(sport):
+    for kts in _values(-1, 45):
+        assert score_wind_speed(kts, sport) == _ladder(kts, *LEGACY_WIND[sport]), kts
+    for gust in _values(0, 35, 0.1):
+        assert score_gust_factor(10, gust, sport) == _ladder(gust / 10, *LEGACY_GUST[sport]), gust
+
+
+def test_shared_factors_match_legacy():
+    for inland in _values(50, 100):
+        delta = inland - 60
+        assert score_thermal(delta) == _ladder(delta, [3, 6, 12, 18, 25], [0, 4, 8, 13, 17, 20]), delta
+        assert compute_thermal_gradient(60, inland)["strength"] == _ladder(
+            delta, [6, 12, 18, 25], ["None", "Weak", "Moderate", "Strong", "Very Strong"]
+        ), delta
+    for spread in _values(-2, 15):
+        assert marine_layer_suppression(60 + spread, 60) == _ladder(spread, [3, 6, 10], [0.7, 0.3, 0.1, 0.0]), spread
+    for hour in range(-1, 26):
+        assert score_time_of_day(hour) == _legacy_time(hour)
+
+
+def test_unknown_sport():
+    with pytest.raises(ValueError):
+        score_wind_speed(10, "kite")
+
+
+def test_bad_profile(tmp_path):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({"sports": {"kite": {
+        "wind_speed": {"edges": [10, 5], "points": [0, 10, 20]},
+        "gust_factor": {"edges": [1.5], "points": [15, 5]},
+        "observed": {"go": [14, 30], "maybe": [10, 35]},
+    }}}))
+    with pytest.raises(ValueError, match="kite.wind_speed"):
+        load_profiles(path)
+
+
+def test_sport_from_config(tmp_path):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({"sports": {"kite": {
+        "wind_speed": {"edges": [10, 14, 25, 32], "points": [0, 15, 30, 20, 5]},
+        "gust_factor": {"edges": [1.5, 2.0], "points": [15, 8, 2]},
+        "observed": {"go": [14, 30], "maybe": [10, 35]},
+    }}}))
+    code = (
+        "from mbwind.score import SPORTS, compute_confidence\n"
+        "from mbwind.batch import score_batch\n"
+        "from mbwind.backtest import observed_class\n"
+        "print(SPORTS, compute_confidence(18, 270, 20, 20, 0, 13, 'kite')['score'],\n"
+        "      score_batch([18], [270], [20], [20], [0], [13], 'kite')['score'], observed_class(12, 'kite'))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        env={**os.environ, "MBWIND_PROFILES": str(path)},
+    )
+    assert result.stdout.split() == ["('laser',", "'wingfoil',", "'kite')", "97", "[97]", "MAYBE"]
+
+
+def test_tips_for_missing_wind():
+    # As the original if/elif ladders: None is calm, NaN falls through to the last tip
+    assert sport_tip(None, None).startswith("Light air")
+    assert sport_tip(math.nan, None).startswith("Heavy air")
+    assert sport_tip(None, None, "wingfoil").startswith("Too light")
+    assert sport_tip(math.nan, math.nan, "wingfoil").startswith("Nuking")
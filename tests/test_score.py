@@ -1,4 +1,6 @@
+from mbwind.profiles import PROFILES, tip_table
 from mbwind.score import (
+    GENERIC_TIP,
     score_wind_speed,
     score_direction,
     score_thermal,
@@ -105,3 +107,12 @@ def test_laser_tip():
 def test_wingfoil_tip():
     assert "light" in sport_tip(5, 6, "wingfoil").lower()
     assert "sweet spot" in sport_tip(18, 22, "wingfoil").lower()
+
+
+def test_tip_from_profile(monkeypatch):
+    kite = {**PROFILES["sports"]["laser"], "tips": tip_table([{"below": 12, "tip": "Big kite"}, {"tip": "Small kite"}], "kite")}
+    monkeypatch.setitem(PROFILES["sports"], "kite", kite)
+    assert sport_tip(8, 10, "kite") == "Big kite"
+    assert sport_tip(20, 25, "kite") == "Small kite"
+    monkeypatch.setitem(PROFILES["sports"], "kite", {**kite, "tips": ()})
+    assert sport_tip(20, 25, "kite") == GENERIC_TIP
@@ -0,0 +1,112 @@
+import threading
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from mbwind.server import ForecastState, make_handler
+from mbwind.sources.forecast import Forecast
+from mbwind.spots import load_spots
+from http.server import ThreadingHTTPServer
+
+
+def _forecast():
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    times = [(start + timedelta(hours=h)).strftime("%Y-%m-%dT%H:%M") for h in range(48)]
+    return Forecast.from_payload({"hourly": {
+        "time": times,
+        "temperature_2m": [68.0] * 48,
+        "wind_speed_10m": [10.0] * 48,
+        "wind_direction_10m": [270.0] * 48,
+        "wind_gusts_10m": [12.0] * 48,
+        "dewpoint_2m": [55.0] * 48,
+    }})
+
+
+@pytest.fixture(scope="module")
+def server():
+    spots = load_spots()
+    state = ForecastState(spots)
+    f = _forecast()
+    state.data = {
+        spot_id: {
+            "forecasts": {"coastal": f, "inland": f},
+            "tide_data": None,
+            "tide_predictions": [],
+            "observed_wind": None,
+            "marine_forecast": None,
+        }
+        for spot_id in spots
+    }
+    state.fetched_at = 0.0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state, "mission_bay"))
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_score_from_memory(server):
+    resp = httpx.get(f"{server}/score", params={"sport": "wingfoil", "hour": 13, "spot": "oceanside"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["spot"] == "oceanside"
+    assert body["sport"] == "wingfoil"
+    assert body["hour"] == 13
+    assert "timeline" not in body
+
+
+def test_timeline(server):
+    body = httpx.get(f"{server}/timeline", params={"hour": 13}).json()
+    assert len(body["timeline"]) == 24
+
+
+def test_bad_requests(server):
+    assert httpx.get(f"{server}/score", params={"sport": "kayak"}).status_code == 400
+    assert httpx.get(f"{server}/score", params={"hour": 25}).status_code == 400
+    assert httpx.get(f"{server}/score", params={"spot": "nowhere"}).status_code == 404
+    assert httpx.get(f"{server}/nope").status_code == 404
+
+
+def test_health(server):
+    body = httpx.get(f"{server}/health").json()
+    assert body["ready"] is True
+    assert "mission_bay" in body["spots"]
+
+
+def test_refresh_survives_a_broken_store(tmp_path, monkeypatch):
+    import asyncio
+
+    from mbwind import server as server_module
+    from mbwind.store import HistoryStore
+
+    spots = load_spots()
+    f = _forecast()
+    data = {spot_id: {"forecasts": {"coastal": f, "inland": f}} for spot_id in spots}
+
+    async def fetch_spots(client, spot_list, deadline, since=None):
+        return data
+    monkeypatch.setattr(server_module, "fetch_spots", fetch_spots)
+    store = HistoryStore(tmp_path / "h.sqlite3")
+    store.close()  # every call now raises sqlite3.ProgrammingError
+    state = ForecastState(spots)
+    assert state.warm_start(store) is False
+    asyncio.run(state.refresh(None, store))
+    assert state.data is data
+    assert state.last_error.startswith("history store:")
+
+
+def test_unexpected_error_is_a_json_500():
+    spots = load_spots()
+    state = ForecastState(spots)
+    state.data = {spot_id: {"forecasts": {}} for spot_id in spots}  # nothing build_report can use
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state, "mission_bay"))
+    threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    try:
+        resp = httpx.get(f"http://127.0.0.1:{httpd.server_address[1]}/score", params={"hour": 13})
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    assert resp.status_code == 500
+    assert "error" in resp.json()
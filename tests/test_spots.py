@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+import httpx
+
+from mbwind.batch import score_batch
+from mbwind.fetch import fetch_spots
+from mbwind.score import DIRECTION_SECTORS, score_direction, compute_confidence
+from mbwind.sources.http import HttpClient
+from mbwind.spots import load_spots, get_spot
+
+from .test_fetch import _open_meteo
+
+
+def test_bundled_registry():
+    spots = load_spots()
+    assert "mission_bay" in spots
+    assert get_spot()["directions"] == DIRECTION_SECTORS
+    assert spots["lake_murray"]["tide_station"] is None
+
+
+def test_custom_registry(tmp_path):
+    path = tmp_path / "spots.json"
+    path.write_text(json.dumps({"spots": [
+        {"id": "glorietta", "lat": 32.68, "lon": -117.17, "inland": [32.8, -116.9], "tide_station": "9410170"},
+    ]}))
+    spot = load_spots(path)["glorietta"]
+    assert spot["inland"] == (32.8, -116.9)
+    assert spot["directions"] == DIRECTION_SECTORS
+    assert spot["marine_zone"] is None
+
+
+def test_spot_sectors_match_batch():
+    headings = [None] + [d / 2 for d in range(-20, 760)]
+    for spot in load_spots().values():
+        n = len(headings)
+        batch = score_batch([10] * n, headings, [12] * n, [10] * n, [0.0] * n, [13] * n,
+                            direction_sectors=spot["directions"], backend="python")
+        for heading, score in zip(headings, batch["breakdown"]["direction"]):
+            assert score == score_direction(heading, spot["directions"])
+
+
+def test_sectors_change_score():
+    oceanside = get_spot("oceanside")["directions"]
+    assert score_direction(235, oceanside) == 20
+    assert score_direction(235) == 15
+    assert compute_confidence(10, 235, 12, 10, 0.0, 13, direction_sectors=oceanside)["breakdown"]["direction"] == 20
+
+
+def test_fetch_spots_shares_requests():
+    calls = []
+
+    def handler(request):
+        calls.append((request.url.host, request.url.params.get("product"), request.url.params.get("station")))
+        if request.url.host == "api.open-meteo.com":
+            return _open_meteo(request)
+        return httpx.Response(503)
+
+    spots = list(load_spots().values())
+
+    async def go():
+        async with HttpClient(transport=httpx.MockTransport(handler), retries=0) as client:
+            return await fetch_spots(client, spots)
+
+    data = asyncio.run(go())
+    assert set(data) == {s["id"] for s in spots}
+    assert sum(1 for host, _, _ in calls if host == "api.open-meteo.com") == 1
+    stations = {s["tide_station"] for s in spots if s["tide_station"]}
+    wind_calls = [c for c in calls if c[1] == "wind"]
+    assert len(wind_calls) == len(stations)
+    assert data["lake_murray"]["tide_data"] is None
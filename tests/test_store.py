@@ -0,0 +1,148 @@
+import time
+from datetime import datetime, timedelta
+
+from mbwind.server import ForecastState
+from mbwind.sources.forecast import Forecast
+from mbwind.spots import get_spot, load_spots
+from mbwind.store import HistoryStore, record_run, wind_trend, load_snapshot, attach_observations
+
+NOW = datetime(2025, 6, 1, 13, 0)
+
+
+def _forecast(start: datetime, hours: int = 24, wind: float = 10.0) -> Forecast:
+    times = [start + timedelta(hours=h) for h in range(hours)]
+    return Forecast.from_columns(times, {
+        "temp_f": [68.0] * hours,
+        "wind_kts": [wind] * hours,
+        "wind_dir": [270.0] * hours,
+        "gusts_kts": [None] * hours,
+        "dewpoint_f": [55.0] * hours,
+    })
+
+
+def _run_data(spot: dict, wind: float = 10.0, obs_time: str | None = None) -> dict:
+    # Dated today: record_run compacts, and older snapshots would be dropped
+    f = _forecast(datetime.now().replace(hour=0, minute=0, second=0, microsecond=0), wind=wind)
+    obs = {"speed_kts": 9.0, "gust_kts": 11.0, "direction": "W", "direction_deg": 270.0, "time": obs_time} if obs_time else None
+    return {spot["id"]: {
+        "forecasts": {"coastal": f, "inland": f},
+        "tide_data": None,
+        "tide_predictions": [],
+        "observed_wind": obs,
+        "marine_forecast": None,
+    }}
+
+
+def test_uses_wal(tmp_path):
+    with HistoryStore(tmp_path / "h.sqlite3") as store:
+        assert store.db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_snapshots_are_appended_per_issue():
+    store = HistoryStore(":memory:")
+    store.put_snapshot("open-meteo", "p", 1000, _forecast(NOW, wind=8))
+    # A refetch in the same issue bucket does not duplicate or overwrite
+    assert store.put_snapshot("open-meteo", "p", 1000, _forecast(NOW, wind=9)) == 0
+    store.put_snapshot("open-meteo", "p", 2000, _forecast(NOW, wind=12))
+
+    issued, latest = store.latest_snapshot("open-meteo", "p")
+    assert issued == 2000
+    assert latest.value("wind_kts", 0) == 12
+    assert latest.value("gusts_kts", 0) is None
+    assert store.latest_snapshot("open-meteo", "p", since=3000) is None
+    assert store.db.execute("SELECT count(*) FROM forecast_snapshots").fetchone()[0] == 48
+
+
+def test_compact_keeps_latest_issue_and_applies_retention():
+    store = HistoryStore(":memory:")
+    now = NOW.timestamp()
+    old, ancient = NOW - timedelta(days=30), NOW - timedelta(days=400)
+    for issued in (1000, 2000):
+        store.put_snapshot("open-meteo", "p", issued, _forecast(old, hours=2))
+        store.put_snapshot("open-meteo", "p", issued, _forecast(NOW, hours=2))
+    store.put_snapshot("open-meteo", "p", 1000, _forecast(ancient, hours=2))
+
+    assert store.compact(now) == {"dropped": 2, "compacted": 2}
+    rows = store.db.execute("SELECT valid_time, issued FROM forecast_snapshots ORDER BY valid_time, issued").fetchall()
+    # Recent hours keep both issues; the month-old ones only the latest
+    assert [issued for _, issued in rows] == [2000, 2000, 1000, 2000, 1000, 2000]
+
+
+def test_wind_trend():
+    store = HistoryStore(":memory:")
+    assert wind_trend(store, "s", NOW) is None
+    readings = [(NOW - timedelta(minutes=m), 14 - m / 20) for m in (110, 60, 30, 0)]
+    store.put_observations("s", [
+        {"time": t.isoformat(timespec="minutes"), "wind_kts": kts, "wind_dir": None, "gust_kts": None}
+        for t, kts in readings
+    ])
+    trend = wind_trend(store, "s", NOW)
+    assert trend["trend"] == "building"
+    assert trend["change_kts"] == 5.5
+    assert trend["hours"] == 1.8
+    assert wind_trend(store, "s", NOW, hours=0.25) is None
+
+
+def test_record_run_and_warm_start():
+    store = HistoryStore(":memory:")
+    spot = get_spot("mission_bay")
+    fetched = time.time()
+    data = _run_data(spot, obs_time=datetime.now().strftime("%Y-%m-%d %H:%M"))
+    record_run(store, [spot], data, fetched)
+    attach_observations(store, [spot], data)
+    assert data[spot["id"]]["observed_trend"] is None  # one reading is not a trend
+
+    warm = load_snapshot(store, [spot], max_age=3600, now=fetched)
+    assert warm[spot["id"]]["forecasts"]["coastal"].value("wind_kts", 13) == 10.0
+    assert warm[spot["id"]]["observed_wind"]["speed_kts"] == 9.0
+    assert warm[spot["id"]]["tide_predictions"] == []
+    assert load_snapshot(store, [spot], max_age=3600, now=fetched + 7200) is None
+
+
+def test_server_warm_starts_from_store(tmp_path):
+    path = tmp_path / "h.sqlite3"
+    spots = load_spots()
+    data = {}
+    for spot in spots.values():
+        data.update(_run_data(spot))
+    with HistoryStore(path) as store:
+        record_run(store, list(spots.values()), data)
+
+    state = ForecastState(spots, history=path)
+    with HistoryStore(path) as store:
+        assert state.warm_start(store)
+    assert state.wait_ready(0)
+    assert state.health()["ready"]
+    assert state.report("oceanside", "laser", datetime.now(), 13)["wind_kts"] == 10.0
+
+
+def test_incremental_series_fill_observations_and_tide_rate():
+    from mbwind.sources.noaa import classify_tide
+    from mbwind.store import series_since, tide_rate
+
+    store = HistoryStore(":memory:")
+    spot = get_spot("mission_bay")
+    station = spot["tide_station"]
+    assert series_since(store, [spot]) == {("wind_series", station): None, ("water_level_series", station): None}
+
+    times = [NOW - timedelta(minutes=m) for m in range(60, -1, -6)]
+    data = _run_data(spot)
+    data[spot["id"]]["wind_series"] = [
+        {"time": t.isoformat(timespec="minutes"), "wind_kts": 10.0, "wind_dir": 250.0, "gust_kts": 13.0} for t in times
+    ]
+    data[spot["id"]]["water_level_series"] = [
+        {"time": t.isoformat(timespec="minutes"), "water_level_ft": 3.0 - (NOW - t).total_seconds() / 3600 * 0.6}
+        for t in times
+    ]
+    record_run(store, [spot], data)
+    assert series_since(store, [spot])[("wind_series", station)] == NOW
+
+    attach_observations(store, [spot], data, NOW)
+    filled = data[spot["id"]]
+    assert filled["observed_wind"]["direction"] == "WSW"
+    assert filled["observed_wind"]["time"] == "2025-06-01 13:00"
+    assert filled["tide_data"]["water_level_ft"] == 3.0
+    assert filled["observed_trend"]["trend"] == "steady"
+    assert filled["tide_rate"] == tide_rate(store, station, NOW) == 0.6
+    assert classify_tide(3.0, [], filled["tide_rate"]) == "Mid, incoming (+0.6 ft/h)"
+    assert classify_tide(0.5, [], -0.05) == "Low, slack"
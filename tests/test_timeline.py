@@ -0,0 +1,106 @@
+from datetime import date, datetime
+
+from mbwind.report import build_report, build_reports
+from mbwind.score import SPORTS, compute_confidence
+from mbwind.sources.forecast import Forecast
+from mbwind.sources.nws import parse_period
+from mbwind.sources.thermal import compute_thermal_gradient, marine_layer_suppression
+from mbwind.spots import get_spot
+from mbwind.timeline import score_timeline, score_timeline_sports, best_window
+
+DAY = date(2025, 6, 1)
+
+
+def _forecast(wind, temp, dewpoint=50.0):
+    times = [f"2025-06-01T{h:02d}:00" for h in range(24)]
+    return Forecast.from_payload({
+        "hourly": {
+            "time": times,
+            "temperature_2m": temp if isinstance(temp, list) else [temp] * 24,
+            "wind_speed_10m": wind,
+            "wind_direction_10m": [270.0] * 24,
+            "wind_gusts_10m": [w * 1.2 for w in wind],
+            "dewpoint_2m": [dewpoint] * 24,
+        }
+    })
+
+
+def test_timeline_matches_scalar_model():
+    wind = [float(h % 14) for h in range(24)]
+    coastal = _forecast(wind, 66.0, dewpoint=62.0)
+    inland = _forecast([0.0] * 24, [60.0 + h for h in range(24)])
+    timeline = score_timeline(coastal, inland, DAY, "laser")
+    assert len(timeline) == 24
+    for row in timeline:
+        thermal = compute_thermal_gradient(66.0, 60.0 + row["hour"])
+        expected = compute_confidence(
+            row["wind_kts"], 270.0, row["wind_kts"] * 1.2, thermal["delta_f"],
+            marine_layer_suppression(66.0, 62.0), row["hour"],
+        )
+        assert row["score"] == expected["score"]
+        assert row["recommendation"] == expected["recommendation"]
+
+
+def test_sports_share_one_pass():
+    wind = [float(h % 20) for h in range(24)]
+    coastal = _forecast(wind, 66.0, dewpoint=62.0)
+    inland = _forecast([0.0] * 24, [60.0 + h for h in range(24)])
+    timelines = score_timeline_sports(coastal, inland, DAY, SPORTS)
+    for sport in SPORTS:
+        assert timelines[sport] == score_timeline(coastal, inland, DAY, sport)
+
+    data = {
+        "forecasts": {"coastal": coastal, "inland": inland},
+        "tide_data": None, "tide_predictions": [], "observed_wind": None, "marine_forecast": None,
+    }
+    spot = get_spot("mission_bay")
+    target = datetime(2025, 6, 1, 14)
+    reports = build_reports(data, spot, 14, target, SPORTS)
+    assert [r["sport"] for r in reports] == list(SPORTS)
+    for report in reports:
+        assert report == build_report(data, spot, 14, target, report["sport"])
+    assert reports[0]["tip"] != reports[1]["tip"]
+
+
+def _rows(scores, first_hour=0):
+    return [{"hour": first_hour + i, "score": s} for i, s in enumerate(scores)]
+
+
+def test_best_window_sliding_sum():
+    scores = [0] * 9 + [10, 50, 60, 70, 20, 80, 10, 0, 0] + [90] * 6
+    best = best_window(_rows(scores), hours=3)
+    assert best == {"start_hour": 10, "end_hour": 13, "mean_score": 60}
+
+
+def test_best_window_stays_in_session():
+    scores = [100] * 9 + [0] * 9 + [100] * 6
+    best = best_window(_rows(scores), hours=2)
+    assert 9 <= best["start_hour"] and best["end_hour"] <= 18
+
+
+def test_best_window_needs_consecutive_hours():
+    rows = [{"hour": 10, "score": 90}, {"hour": 12, "score": 90}]
+    assert best_window(rows, hours=2) is None
+
+
+def test_advisory_lowers_scores_while_in_effect():
+    wind = [12.0] * 24
+    coastal = _forecast(wind, 66.0)
+    inland = _forecast([0.0] * 24, 80.0)
+    marine = {"periods": [{
+        "name": "This Afternoon", "start": "2025-06-01T12:00:00-07:00", "end": "2025-06-01T18:00:00-07:00",
+        "text": "Small Craft Advisory in effect.", **parse_period("W wind 15 to 20 kt. Small Craft Advisory in effect."),
+    }]}
+    plain = score_timeline_sports(coastal, inland, DAY)["laser"]
+    warned = score_timeline_sports(coastal, inland, DAY, marine=marine)["laser"]
+    assert [a["score"] - b["score"] for a, b in zip(plain, warned)] == [0] * 12 + [15] * 6 + [0] * 6
+    assert warned[13]["advisory"] == "Small Craft Advisory" and warned[11]["advisory"] is None
+
+    data = {
+        "forecasts": {"coastal": coastal, "inland": inland},
+        "tide_data": None, "tide_predictions": [], "observed_wind": None, "marine_forecast": marine,
+    }
+    report = build_report(data, get_spot("mission_bay"), 14, datetime(2025, 6, 1, 14))
+    assert report["marine_forecast"]["name"] == "This Afternoon"
+    assert report["breakdown"]["advisory_penalty"] == 15
+    assert report["score"] == plain[14]["score"] - 15
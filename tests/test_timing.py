@@ -0,0 +1,98 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from mbwind import timing
+from mbwind.sources.cache import ResponseCache
+from mbwind.sources.http import HttpClient
+
+
+@pytest.fixture
+def profile():
+    yield timing.start()
+    timing.stop()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"ok": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_inactive_is_a_noop():
+    assert timing.active() is None
+    with timing.span("score"):
+        pass
+    timing.count("cache_hit")
+    assert timing.span("a") is timing.span("b")
+
+
+def test_http_phases_over_a_real_connection(profile):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/forecast"
+
+    async def go():
+        async with HttpClient(retries=0) as client:
+            return await client.get_json(url, params={"product": "wind"})
+    try:
+        assert asyncio.run(go()) == {"ok": True}
+    finally:
+        server.shutdown()
+
+    phases = {row["name"] for row in profile.summary()}
+    assert {"request", "connect", "send", "wait", "transfer", "parse"} <= phases
+    sources = {row["source"] for row in profile.summary()}
+    assert sources == {f"127.0.0.1:{server.server_address[1]}/v1/forecast wind"}
+    # One request: every phase once, send spanning headers and body
+    assert all(row["count"] == 1 for row in profile.summary()), profile.summary()
+
+
+def test_overridden_upstream_keeps_its_label(profile, tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    upstreams = {"https://api.example.com": f"http://127.0.0.1:{server.server_address[1]}"}
+
+    async def go():
+        async with HttpClient(retries=0, cache=ResponseCache(tmp_path), upstreams=upstreams) as client:
+            return await client.get_json("https://api.example.com/v1/forecast", params={"product": "wind"}, ttl=60)
+    try:
+        assert asyncio.run(go()) == {"ok": True}
+    finally:
+        server.shutdown()
+
+    # Network phases are filed with the request, under the upstream it stands in for
+    assert {row["source"] for row in profile.summary()} == {"api.example.com/v1/forecast wind"}
+    assert {"request", "cache_read", "connect", "wait", "parse"} <= {row["name"] for row in profile.summary()}
+
+
+def test_cache_counters_and_dumps(profile, tmp_path):
+    def handler(request):
+        return httpx.Response(200, json={"n": 1}, headers={"ETag": '"a"'})
+
+    async def go():
+        async with HttpClient(transport=httpx.MockTransport(handler), retries=0, cache=ResponseCache(tmp_path)) as client:
+            for _ in range(2):
+                await client.get_json("https://api.example.com/data", ttl=60)
+    asyncio.run(go())
+
+    assert profile.counters == {("cache_miss", "api.example.com/data"): 1, ("cache_hit", "api.example.com/data"): 1}
+    text = profile.to_openmetrics()
+    assert 'mbwind_events_total{name="cache_hit",source="api.example.com/data"} 1' in text
+    assert text.endswith("# EOF\n")
+
+    path = tmp_path / "profile.json"
+    timing.dump(profile, str(path))
+    dumped = json.loads(path.read_text())
+    assert {row["name"] for row in dumped["phases"]} >= {"request", "cache_read", "parse"}
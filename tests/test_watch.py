@@ -0,0 +1,109 @@
+import asyncio
+from datetime import date, datetime
+
+import httpx
+
+from mbwind.spots import load_spots
+from mbwind.sources.http import HttpClient
+from mbwind.watch import Watcher
+
+from .test_fetch import _open_meteo
+
+NOW = datetime(2025, 6, 1, 13, 0).astimezone()
+
+
+def _observation(kts: float) -> dict:
+    return {"data": [{"t": "2025-06-01 12:54", "s": str(kts), "d": "270", "dr": "W", "g": str(kts + 3)}]}
+
+
+def _watcher(upstream: dict):
+    """A Watcher over every registry spot, and a poll(feed) running one feed
+    against handlers that answer from upstream, which tests change."""
+    updates = []
+    watcher = Watcher(list(load_spots().values()), lambda reports, w: updates.append(reports), store=None)
+
+    def handler(request):
+        if request.url.host == "api.open-meteo.com":
+            return _open_meteo(request) if upstream.get("forecast", True) else httpx.Response(503)
+        if request.url.params.get("product") == "wind":
+            return httpx.Response(200, json=_observation(upstream[request.url.params["station"]]))
+        return httpx.Response(404)
+
+    def poll(feed):
+        async def go():
+            async with HttpClient(transport=httpx.MockTransport(handler), retries=0) as client:
+                return await watcher.poll(client, feed)
+        return asyncio.run(go())
+    return watcher, poll
+
+
+def test_only_spots_with_changed_inputs_are_rescored():
+    upstream = {"9410170": 10.0, "9410230": 10.0}
+    watcher, poll = _watcher(upstream)
+    assert poll("forecasts") == set(watcher.spots)
+    assert watcher.rebuild(NOW) == set(watcher.spots)
+
+    # Refetching identical forecasts changes nothing
+    assert poll("forecasts") == set()
+    assert poll("observations") == {"mission_bay", "san_diego_bay", "oceanside"}
+    watcher.rebuild(NOW)
+    before = dict(watcher.reports)
+
+    upstream["9410230"] = 14.0
+    assert poll("observations") == {"oceanside"}
+    assert watcher.rebuild(NOW) == {"oceanside"}
+    assert watcher.reports["oceanside"]["observed_wind"]["speed_kts"] == 14.0
+    assert watcher.reports["mission_bay"] is before["mission_bay"]
+
+
+def test_failed_poll_keeps_data():
+    upstream = {"9410170": 10.0, "9410230": 10.0}
+    watcher, poll = _watcher(upstream)
+    poll("forecasts")
+    forecasts = watcher.raw["mission_bay"]["forecasts"]
+    upstream["forecast"] = False
+    assert poll("forecasts") == set()
+    assert "forecasts" in watcher.errors
+    assert watcher.raw["mission_bay"]["forecasts"] is forecasts
+
+    upstream["forecast"] = True
+    poll("forecasts")
+    assert "forecasts" not in watcher.errors
+
+
+def test_hour_follows_clock_unless_given():
+    watcher, _ = _watcher({})
+    assert watcher.target(NOW)[0] == 13
+    watcher.hour = 9
+    assert watcher.target(NOW)[0] == 9
+
+
+def test_new_day_refetches_tide_predictions(monkeypatch):
+    from mbwind.sources import noaa
+
+    today = date(2025, 6, 1)
+    requested = []
+
+    class _Date(date):
+        @classmethod
+        def today(cls):
+            return today
+    monkeypatch.setattr(noaa, "date", _Date)
+
+    def handler(request):
+        requested.append(request.url.params["begin_date"])
+        return httpx.Response(200, json={"predictions": []})
+
+    watcher = Watcher(list(load_spots().values()), lambda reports, w: None, hour=13)
+    watcher.day = today
+
+    async def tick(now):
+        async with HttpClient(transport=httpx.MockTransport(handler), retries=0) as client:
+            await watcher.tick(client, now)
+    asyncio.run(tick(datetime(2025, 6, 1, 23, 0)))
+    assert requested == [] and not watcher._dirty
+
+    today = date(2025, 6, 2)
+    asyncio.run(tick(datetime(2025, 6, 2, 0, 0)))
+    assert set(requested) == {"20250602"}
+    assert "tide_predictions" in watcher.polled and watcher._dirty == set(watcher.spots)